@@ -0,0 +1,217 @@
+'''
+Async twins of the page objects
+
+What it does:
+
+Builds AsyncLoginPage, AsyncProductsPage and AsyncCartPage (and AsyncBasePage)
+from the source of the sync page objects, so there is one definition to maintain
+Every method becomes "async def"; calls to Playwright coroutines (click, fill,
+goto, evaluate_all, ...) and to other page-object methods get an "await"
+A call is a Playwright call only on a Playwright object: self.page, a locator
+attribute set in __init__, a name bound to one (including parameters that are
+passed one) or a chain built from those, so dict.clear() or str.count() stay as they are
+Use them with playwright.async_api pages, e.g. from utils/virtual_users.py:
+
+async def journey(page, user):
+    login_page = AsyncLoginPage(page)
+    await login_page.navigate()
+    await login_page.login(user, "secret_sauce")
+'''
+
+import ast
+import inspect
+import sys
+import textwrap
+
+from playwright.async_api import BrowserContext, Frame, FrameLocator, Keyboard, Locator, Mouse, Page, Touchscreen
+
+from pages.base_page import BasePage
+from pages.cart_page import CartPage
+from pages.login_page import LoginPage
+from pages.products_page import ProductsPage
+
+# Playwright objects a page object works with
+HANDLE_TYPES = (Page, Frame, Locator, FrameLocator, BrowserContext, Keyboard, Mouse, Touchscreen)
+
+# Method names that are coroutines in the async API
+AWAITED_CALLS = frozenset(
+    name
+    for owner in HANDLE_TYPES
+    for name in dir(owner)
+    if not name.startswith("_") and inspect.iscoroutinefunction(getattr(owner, name))
+)
+
+# Properties that return another Playwright object (locator.first, page.keyboard, ...)
+HANDLE_PROPERTIES = frozenset(
+    name
+    for owner in HANDLE_TYPES
+    for name, value in vars(owner).items()
+    if isinstance(value, property)
+    and getattr(value.fget.__annotations__.get("return"), "__name__", value.fget.__annotations__.get("return"))
+    in {handle.__name__ for handle in HANDLE_TYPES}
+)
+
+
+def is_handle(node, attributes, names):
+    """Whether the expression is a Playwright object: self.page, a locator attribute, a bound name or a chain of them"""
+    if isinstance(node, ast.Name):
+        return node.id in names
+    if isinstance(node, ast.Attribute):
+        if isinstance(node.value, ast.Name) and node.value.id == "self":
+            return node.attr in attributes
+        return node.attr in HANDLE_PROPERTIES and is_handle(node.value, attributes, names)
+    if isinstance(node, ast.Call):
+        # locator(), filter(), nth(), get_by_role() ... return handles; coroutines return data
+        function = node.func
+        return (
+            isinstance(function, ast.Attribute) and function.attr not in AWAITED_CALLS
+            and is_handle(function.value, attributes, names)
+        )
+    return False
+
+
+def _class_tree(cls):
+    source = textwrap.dedent(inspect.getsource(cls))
+    return ast.parse(source)
+
+
+def _functions(tree):
+    return [node for node in tree.body[0].body if isinstance(node, ast.FunctionDef)]
+
+
+def _bound_names(function, attributes, parameters):
+    """Parameters known to receive handles plus local names assigned one, in statement order"""
+    names = set(parameters.get(function.name, ()))
+    for node in ast.walk(function):
+        if isinstance(node, ast.Assign) and is_handle(node.value, attributes, names):
+            names.update(target.id for target in node.targets if isinstance(target, ast.Name))
+    return names
+
+
+class _Handles:
+    """Where the page objects hold Playwright objects: attributes per class, parameters per method"""
+
+    def __init__(self, classes):
+        self.attributes = {}
+        for cls in classes:
+            attributes = {"page"}
+            for klass in reversed(cls.__mro__[:-1]):
+                init = vars(klass).get("__init__")
+                if init is None:
+                    continue
+                function = ast.parse(textwrap.dedent(inspect.getsource(init))).body[0]
+                # __init__(self, page): page and everything built from it
+                for node in ast.walk(function):
+                    if isinstance(node, ast.Assign) and is_handle(node.value, attributes, {"page"}):
+                        attributes.update(
+                            target.attr for target in node.targets
+                            if isinstance(target, ast.Attribute)
+                            and isinstance(target.value, ast.Name) and target.value.id == "self"
+                        )
+            self.attributes[cls] = attributes
+
+        trees = {cls: _class_tree(cls) for cls in classes}
+        signatures = {
+            function.name: [argument.arg for argument in function.args.args]
+            for tree in trees.values() for function in _functions(tree)
+        }
+        # A parameter holds a handle when some call passes one; repeat until nothing new is found
+        self.parameters = {}
+        changed = True
+        while changed:
+            changed = False
+            for cls, tree in trees.items():
+                for function in _functions(tree):
+                    names = _bound_names(function, self.attributes[cls], self.parameters)
+                    for call in ast.walk(function):
+                        target = call.func if isinstance(call, ast.Call) else None
+                        if not (isinstance(target, ast.Attribute) and isinstance(target.value, ast.Name)
+                                and target.value.id == "self" and target.attr in signatures):
+                            continue
+                        parameters = signatures[target.attr][1:]
+                        passed = list(zip(parameters, call.args))
+                        passed += [(keyword.arg, keyword.value) for keyword in call.keywords if keyword.arg]
+                        for parameter, value in passed:
+                            known = self.parameters.setdefault(target.attr, set())
+                            if parameter not in known and is_handle(value, self.attributes[cls], names):
+                                known.add(parameter)
+                                changed = True
+
+
+class _Asyncify(ast.NodeTransformer):
+    """Turns the methods of one sync page-object class into coroutines"""
+
+    def __init__(self, method_names, attributes, parameters):
+        self.method_names = method_names
+        self.attributes = attributes
+        self.parameters = parameters
+        self.names = set()
+
+    def visit_FunctionDef(self, node):
+        self.names = _bound_names(node, self.attributes, self.parameters)
+        self.generic_visit(node)
+        if node.name == "__init__":
+            return node
+        return ast.copy_location(
+            ast.AsyncFunctionDef(
+                name=node.name, args=node.args, body=node.body, decorator_list=node.decorator_list,
+                returns=node.returns, type_comment=node.type_comment, type_params=getattr(node, "type_params", []),
+            ),
+            node,
+        )
+
+    def visit_Call(self, node):
+        self.generic_visit(node)
+        function = node.func
+        if not isinstance(function, ast.Attribute):
+            return node
+        is_own_method = (
+            isinstance(function.value, ast.Name) and function.value.id == "self"
+            and function.attr in self.method_names
+        )
+        is_playwright_call = (
+            function.attr in AWAITED_CALLS and is_handle(function.value, self.attributes, self.names)
+        )
+        if is_own_method or is_playwright_call:
+            return ast.copy_location(ast.Await(value=node), node)
+        return node
+
+
+def _method_names(cls):
+    return {
+        name
+        for klass in cls.__mro__ if klass is not object
+        for name, value in vars(klass).items()
+        if inspect.isfunction(getattr(value, "__span_original__", value)) and name != "__init__"
+    }
+
+
+def asyncify(cls, base=None, handles=None):
+    """Return the async twin of a sync page-object class (base: async twin of its parent)
+
+    handles: _Handles of every page-object class, so parameters passed a locator by a subclass are known
+    """
+    handles = handles or _Handles([cls])
+    tree = _class_tree(cls)
+    # Keep tracebacks pointing at the real lines of the sync source
+    ast.increment_lineno(tree, inspect.getsourcelines(cls)[1] - 1)
+    class_node = tree.body[0]
+    class_node.name = f"Async{cls.__name__}"
+    class_node.bases = [ast.Name(id="_AsyncBase", ctx=ast.Load())] if base else []
+    transformer = _Asyncify(_method_names(cls), handles.attributes[cls], handles.parameters)
+    tree = ast.fix_missing_locations(transformer.visit(tree))
+
+    namespace = dict(vars(sys.modules[cls.__module__]))
+    namespace["_AsyncBase"] = base
+    exec(compile(tree, inspect.getsourcefile(cls), "exec"), namespace)
+    async_cls = namespace[class_node.name]
+    async_cls.__module__ = __name__
+    return async_cls
+
+
+_HANDLES = _Handles([BasePage, LoginPage, ProductsPage, CartPage])
+
+AsyncBasePage = asyncify(BasePage, handles=_HANDLES)
+AsyncLoginPage = asyncify(LoginPage, AsyncBasePage, _HANDLES)
+AsyncProductsPage = asyncify(ProductsPage, AsyncBasePage, _HANDLES)
+AsyncCartPage = asyncify(CartPage, AsyncBasePage, _HANDLES)
@@ -0,0 +1,87 @@
+'''
+Base class for the page objects
+
+Every page knows its path; navigate() opens it relative to the context's
+base_url (PlaywrightConfig.BASE_URL through the context fixture), so the
+same page objects work against saucedemo.com, a staging host or the local stand-in.
+
+Listings (inventory items, cart items) are read with read_items(): one
+evaluate_all round trip returns every item as a dict, however many there are.
+item_slug() keeps a name -> data-test slug index built from that read, so acting
+on an item by name is one direct [data-test=...] click instead of a text search.
+The index is dropped on navigate(), when the URL changes, and after a sort.
+PERFORMANCE_BUDGET holds the Web Vitals limits of the page (see utils/web_vitals.py).
+VISUAL_MASKS lists selectors of content that changes between runs; visual checks
+cover it (see utils/visual_diff.py).
+'''
+
+# Prefixes of the cart buttons, e.g. add-to-cart-sauce-labs-backpack / remove-sauce-labs-backpack
+BUTTON_PREFIXES = ("add-to-cart-", "remove-")
+
+# Runs in the page on every matched item element
+ITEMS_SCRIPT = """
+items => items.map(item => {
+    const text = selector => {
+        const element = item.querySelector(selector);
+        return element ? element.textContent.trim() : null;
+    };
+    const price = text(".inventory_item_price");
+    const button = item.querySelector("button");
+    const dataTest = button ? button.getAttribute("data-test") : null;
+    return {
+        name: text(".inventory_item_name"),
+        price: price === null ? null : parseFloat(price.replace(/[^0-9.]/g, "")),
+        button_text: button ? button.textContent.trim() : null,
+        in_cart: dataTest !== null && dataTest.startsWith("remove"),
+        data_test: dataTest,
+    };
+})
+"""
+
+class BasePage:
+    PATH = "/"
+    # Limits checked by utils.web_vitals.assert_within_budget (ms, cls is a score)
+    PERFORMANCE_BUDGET = {"fcp": 1800, "lcp": 2500, "cls": 0.1, "total_blocking_time": 300, "load": 3000}
+    # Selectors covered in screenshots by utils.visual_diff.VisualCheck
+    VISUAL_MASKS = ()
+    
+    def __init__(self, page):
+        self.page = page
+        self._item_index = None
+        self._item_index_url = None
+        
+    def navigate(self):
+        self.invalidate_items()
+        self.page.goto(self.PATH)
+        
+    def read_items(self, items):
+        """name, price (float), button_text, in_cart and data_test of every item in one round trip"""
+        return items.evaluate_all(ITEMS_SCRIPT)
+        
+    def invalidate_items(self):
+        self._item_index = None
+        
+    def item_slug(self, name, items, container):
+        """data-test slug of the item called name (index built on first use)
+
+        container is the element the list renders into, waited for before reading the items
+        """
+        if self._item_index is None or self._item_index_url != self.page.url:
+            self._index_items(items, container)
+        if name not in self._item_index:
+            # The list may have been re-rendered since the index was built
+            self._index_items(items, container)
+        if name not in self._item_index:
+            raise ValueError(f"No item named {name!r} on {self.page.url}")
+        return self._item_index[name]
+        
+    def _index_items(self, items, container):
+        # evaluate_all does not wait: right after a navigation the list may not be rendered yet.
+        # The container renders with its items, and an empty list still has one
+        container.wait_for(state="attached")
+        self._item_index = {}
+        for item in self.read_items(items):
+            for prefix in BUTTON_PREFIXES:
+                if item["data_test"] and item["data_test"].startswith(prefix):
+                    self._item_index[item["name"]] = item["data_test"][len(prefix):]
+        self._item_index_url = self.page.url
@@ -1,11 +1,47 @@
 '''
 Example 95: Cart Page Object & Tests
 
+seed() puts products in the cart without clicking: the app keeps the cart in
+localStorage["cart-contents"] as a JSON list of catalog ids, so one init script
+writes it before the app's own scripts run on the next navigation.
 '''
 
-class CartPage:
+import json
+
+from pages.base_page import BasePage
+from utils.local_app.catalog import PRODUCTS
+
+CART_STORAGE_KEY = "cart-contents"
+PRODUCT_IDS = {product["name"]: product["id"] for product in PRODUCTS}
+
+# Runs before the app's scripts in every document of the page; only the first
+# document of the tab writes the cart, so later clicks are not overwritten
+SEED_SCRIPT = """
+(() => {
+    if (!location.protocol.startsWith("http")) return;
+    const ids = %s;
+    try {
+        if (sessionStorage.getItem("__cartSeeded") === JSON.stringify(ids)) return;
+        sessionStorage.setItem("__cartSeeded", JSON.stringify(ids));
+        if (ids.length) {
+            localStorage.setItem(%s, JSON.stringify(ids));
+        } else {
+            localStorage.removeItem(%s);
+        }
+    } catch (error) {
+        // Storage is not available in this document (opaque origin)
+    }
+})();
+"""
+
+class CartPage(BasePage):
+    PATH = "/cart.html"
+    # The copyright line carries the current year
+    VISUAL_MASKS = (".footer_copy",)
+    
     def __init__(self, page):
-        self.page = page
+        super().__init__(page)
+        self.cart_list = page.locator(".cart_list")
         self.cart_items = page.locator(".cart_item")
         self.checkout_button = page.locator("[data-test='checkout']")
         self.continue_shopping_button = page.locator("[data-test='continue-shopping']")
@@ -13,19 +49,31 @@ class CartPage:
         self.cart_item_names = page.locator(".inventory_item_name")
         self.cart_item_prices = page.locator(".inventory_item_price")
         
-    def navigate(self):
-        self.page.goto("https://www.saucedemo.com/cart.html")
+    def seed(self, items):
+        """Start the next navigation with exactly these products (names or catalog ids) in the cart"""
+        ids = []
+        for item in items:
+            if item not in PRODUCT_IDS and item not in PRODUCT_IDS.values():
+                raise ValueError(f"Unknown product {item!r}")
+            ids.append(PRODUCT_IDS.get(item, item))
+        key = json.dumps(CART_STORAGE_KEY)
+        self.page.add_init_script(SEED_SCRIPT % (json.dumps(ids), key, key))
+        return self
         
     def get_cart_item_count(self):
         return self.cart_items.count()
         
+    def get_cart_items(self):
+        """Every cart item as a dict (name, price, button_text, in_cart, data_test), one round trip"""
+        return self.read_items(self.cart_items)
+        
     def get_cart_item_names(self):
-        return self.cart_item_names.all_inner_texts()
+        return [item["name"] for item in self.get_cart_items()]
         
     def remove_item(self, item_name):
         """Remove specific item from cart"""
-        item_element = self.page.locator(f"text={item_name}").locator("..").locator("..")
-        item_element.locator("button").click()
+        slug = self.item_slug(item_name, self.cart_items, self.cart_list)
+        self.page.locator(f'[data-test="remove-{slug}"]').click()
         
     def remove_first_item(self):
         """Remove first item from cart"""
@@ -1,14 +1,16 @@
-class LoginPage:
+from pages.base_page import BasePage
+
+class LoginPage(BasePage):
+    PATH = "/"
+    PERFORMANCE_BUDGET = {**BasePage.PERFORMANCE_BUDGET, "load": 3000}
+    
     def __init__(self, page):
-        self.page = page
+        super().__init__(page)
         self.username_input = page.locator("#user-name")
         self.password_input = page.locator("#password")
         self.login_button = page.locator("#login-button")
         self.error_message = page.locator("[data-test='error']")
         
-    def navigate(self):
-        self.page.goto("https://www.saucedemo.com/")
-        
     def login(self, username, password):
         self.username_input.fill(username)
         self.password_input.fill(password)
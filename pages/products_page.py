@@ -6,9 +6,17 @@ Represents the products/inventory page
 Methods for adding to cart, sorting, getting product info
 Reusable across multiple tests
 '''
-class ProductsPage:
+from pages.base_page import BasePage
+
+class ProductsPage(BasePage):
+    PATH = "/inventory.html"
+    PERFORMANCE_BUDGET = {**BasePage.PERFORMANCE_BUDGET, "lcp": 2000, "load": 2000}
+    # The copyright line carries the current year
+    VISUAL_MASKS = (".footer_copy",)
+    
     def __init__(self, page):
-        self.page = page
+        super().__init__(page)
+        self.product_list = page.locator(".inventory_list")
         self.product_items = page.locator(".inventory_item")
         self.add_to_cart_buttons = page.locator("button[data-test^='add-to-cart']")
         self.remove_buttons = page.locator("button[data-test^='remove']")
@@ -23,7 +31,8 @@ class ProductsPage:
         
     def add_product_to_cart(self, product_name):
         """Add specific product to cart by name"""
-        self.page.locator(f"text={product_name}").locator("..").locator("..").locator("button").click()
+        slug = self.item_slug(product_name, self.product_items, self.product_list)
+        self.page.locator(f'[data-test="add-to-cart-{slug}"]').click()
         
     def add_first_product_to_cart(self):
         """Add the first product to cart"""
@@ -41,11 +50,14 @@ class ProductsPage:
     def sort_products(self, option):
         """Sort products by option: 'az', 'za', 'lohi', 'hilo'"""
         self.sort_dropdown.select_option(option)
+        self.invalidate_items()
+        
+    def get_products(self):
+        """Every product as a dict (name, price, button_text, in_cart, data_test), one round trip"""
+        return self.read_items(self.product_items)
         
     def get_all_product_names(self):
-        return self.product_names.all_inner_texts()
+        return [product["name"] for product in self.get_products()]
         
     def get_all_product_prices(self):
-        prices_text = self.product_prices.all_inner_texts()
-        # Convert "$29.99" to 29.99
-        return [float(price.replace("$", "")) for price in prices_text]
\ No newline at end of file
+        return [product["price"] for product in self.get_products()]
\ No newline at end of file
@@ -1,30 +1,28 @@
 """
 Playwright configuration for Python
-Note: This is for documentation purposes.
-Python Playwright doesn't use config files like TypeScript,
-but you can create helper functions with these settings.
+Python Playwright doesn't use config files like TypeScript, so this class
+is the config layer: tests/conftest.py calls PlaywrightConfig.load() once
+and the browser, context and page fixtures read their settings from it.
 
-Use it in conftest.py:
-pythonimport pytest
-from playwright.sync_api import Browser
-from playwright_config import PlaywrightConfig
+Where settings come from (later wins):
+1. The defaults below
+2. A profile: local (default), ci (default when $CI is set) or load
+3. playwright.ini - a [playwright] section, then a [profile:<name>] section
+4. Environment variables: PW_<SETTING>, e.g. PW_BASE_URL, PW_TIMEOUT, PW_HEADLESS
+5. Command line: --pw-profile, --pw-config, --pw-set SETTING=VALUE, --base-url, --local-app, --asset-cache
 
-@pytest.fixture
-def context(browser: Browser):
-    '''Create context with custom config'''
-    context = browser.new_context(**PlaywrightConfig.get_browser_context_options())
-    yield context
-    context.close()
+Examples:
+pytest tests/ --pw-profile ci
+PW_BASE_URL=https://staging.example.com pytest tests/
+pytest tests/ --pw-set TIMEOUT=10000 --pw-set VIEWPORT=1920x1080
 
-@pytest.fixture
-def page(context):
-    '''Create page from context'''
-    page = context.new_page()
-    page.set_default_timeout(PlaywrightConfig.TIMEOUT)
-    yield page
-    page.close()
+Use it anywhere:
+from utils.config import PlaywrightConfig
 """
 
+import configparser
+import os
+
 class PlaywrightConfig:
     """Centralized configuration"""
     
@@ -35,8 +33,8 @@ class PlaywrightConfig:
     TIMEOUT = 30000
     NAVIGATION_TIMEOUT = 30000
     
-    # Browser settings
-    HEADLESS = False
+    # Browser settings (headless like pytest-playwright; --headed or HEADLESS=false shows the window)
+    HEADLESS = True
     SLOW_MO = 0  # Slow down by X ms
     
     # Screenshot settings
@@ -46,14 +44,136 @@ class PlaywrightConfig:
     # Viewport
     VIEWPORT = {"width": 1280, "height": 720}
     
+    # Device matrix of the mobile tests (names from playwright.devices); no engines = each device's default browser
+    DEVICES = "iPhone 12,iPad Pro,Pixel 5"
+    DEVICE_ENGINES = ""
+    
     # User credentials
     VALID_USERNAME = "standard_user"
     VALID_PASSWORD = "secret_sauce"
     
+    # API under test in tests/test_api.py
+    API_BASE_URL = "https://jsonplaceholder.typicode.com"
+    
+    # Serve the bundled saucedemo and jsonplaceholder stand-ins and point BASE_URL / API_BASE_URL at them
+    LOCAL_APP = False
+    
+    # Serve static assets from the shared .asset-cache/ directory
+    ASSET_CACHE = False
+    
+    # Requests the test pages never load: image, font, media, analytics, third-party (off by default: routing bypasses the HTTP cache)
+    BLOCK_RESOURCES = ""
+    
+    # Active profile and where the ini file lives
+    PROFILE = "local"
+    CONFIG_FILE = "playwright.ini"
+    
+    # Settings each profile changes
+    PROFILES = {
+        "local": {},
+        "ci": {
+            "HEADLESS": True,
+            "TIMEOUT": 15000,
+            "NAVIGATION_TIMEOUT": 20000,
+            "VIDEO_ON_FAILURE": False,
+            "BLOCK_RESOURCES": "image,font,media,analytics",
+        },
+        "load": {
+            "HEADLESS": True,
+            "TIMEOUT": 10000,
+            "NAVIGATION_TIMEOUT": 15000,
+            "SCREENSHOT_ON_FAILURE": False,
+            "VIDEO_ON_FAILURE": False,
+            "LOCAL_APP": True,
+            "BLOCK_RESOURCES": "image,font,media,analytics",
+        },
+    }
+    
+    ENV_PREFIX = "PW_"
+    _defaults = None
+    
+    @classmethod
+    def settings(cls):
+        """Names of all settings (upper-case attributes that hold plain values)"""
+        return [
+            name for name, value in vars(cls).items()
+            if name.isupper() and name not in ("PROFILES", "ENV_PREFIX")
+            and not isinstance(value, classmethod)
+        ]
+    
+    @classmethod
+    def load(cls, profile=None, config_file=None, overrides=None, environ=None):
+        """Apply profile, ini file, environment and command line overrides (in that order)"""
+        environ = os.environ if environ is None else environ
+        if cls._defaults is None:
+            cls._defaults = {name: getattr(cls, name) for name in cls.settings()}
+        for name, value in cls._defaults.items():
+            setattr(cls, name, value)
+        
+        profile = (
+            profile or environ.get(cls.ENV_PREFIX + "PROFILE")
+            or ("ci" if environ.get("CI") else cls.PROFILE)
+        )
+        if profile not in cls.PROFILES:
+            raise ValueError(f"Unknown profile {profile!r}, expected one of {sorted(cls.PROFILES)}")
+        cls.PROFILE = profile
+        cls._apply(cls.PROFILES[profile])
+        
+        config_file = config_file or environ.get(cls.ENV_PREFIX + "CONFIG_FILE") or cls.CONFIG_FILE
+        cls.CONFIG_FILE = config_file
+        parser = configparser.ConfigParser()
+        parser.read(config_file)
+        for section in ("playwright", f"profile:{profile}"):
+            if parser.has_section(section):
+                cls._apply({key.upper(): value for key, value in parser.items(section)})
+        
+        # Other tools use PW_* variables too, so only known settings are read
+        cls._apply({
+            name: environ[cls.ENV_PREFIX + name] for name in cls.settings()
+            if cls.ENV_PREFIX + name in environ and name not in ("PROFILE", "CONFIG_FILE")
+        })
+        cls._apply(overrides or {})
+        return cls
+    
+    @classmethod
+    def _apply(cls, values):
+        known = cls.settings()
+        for name, value in values.items():
+            if name not in known:
+                raise ValueError(f"Unknown Playwright setting {name!r}")
+            setattr(cls, name, _coerce(value, getattr(cls, name)))
+    
+    @classmethod
+    def get_browser_launch_options(cls):
+        """Get browser launch options"""
+        return {
+            "headless": cls.HEADLESS,
+            "slow_mo": cls.SLOW_MO,
+        }
+    
     @classmethod
     def get_browser_context_options(cls):
         """Get browser context options"""
         return {
             "viewport": cls.VIEWPORT,
             "base_url": cls.BASE_URL,
-        }
\ No newline at end of file
+        }
+
+
+def _coerce(value, current):
+    """Convert text from ini files, env vars and the CLI to the setting's type"""
+    if not isinstance(value, str) or isinstance(current, str):
+        return value
+    if isinstance(current, bool):
+        if value.strip().lower() in ("1", "true", "yes", "on"):
+            return True
+        if value.strip().lower() in ("0", "false", "no", "off"):
+            return False
+        raise ValueError(f"Expected a boolean, got {value!r}")
+    if isinstance(current, int):
+        return int(value)
+    if isinstance(current, dict):
+        # Viewport as 1280x720
+        width, height = value.lower().split("x")
+        return {"width": int(width), "height": int(height)}
+    return value
@@ -23,24 +23,32 @@ def test_skip_login(authenticated_page):
 
 from playwright.sync_api import sync_playwright
 
+def capture_authentication_state(browser, username="standard_user", password="secret_sauce", path=None,
+                                 base_url="https://www.saucedemo.com"):
+    """Log in on a fresh context of an already launched browser and return its storage state"""
+    context = browser.new_context()
+    page = context.new_page()
+    
+    # Login
+    page.goto(f"{base_url}/")
+    page.fill("#user-name", username)
+    page.fill("#password", password)
+    page.click("#login-button")
+    
+    # Wait for login
+    page.wait_for_url("**/inventory.html")
+    
+    # Save authentication state
+    state = context.storage_state(path=path)
+    context.close()
+    return state
+
 def save_authentication_state():
     """Save login state to file"""
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=False)
-        context = browser.new_context()
-        page = context.new_page()
-        
-        # Login
-        page.goto("https://www.saucedemo.com/")
-        page.fill("#user-name", "standard_user")
-        page.fill("#password", "secret_sauce")
-        page.click("#login-button")
-        
-        # Wait for login
-        page.wait_for_url("**/inventory.html")
         
-        # Save authentication state
-        context.storage_state(path="auth.json")
+        capture_authentication_state(browser, path="auth.json")
         print("✅ Authentication state saved to auth.json")
         
         browser.close()
@@ -18,18 +18,27 @@ Update portfolio_project/tests/conftest.py:
 import pytest
 
 @pytest.fixture(scope="function", autouse=True)
-def trace_on_failure(page, request):
-    """Record trace on test failure"""
-    # Start tracing
-    page.context.tracing.start(screenshots=True, snapshots=True, sources=True)
+def trace_on_failure(request, pytestconfig):
+    """Record trace (or a ring of recent actions) according to the trace policy"""
+    if "page" not in request.fixturenames:
+        yield
+        return
+    marker = request.node.get_closest_marker("trace_policy")
+    policy = marker.args[0] if marker else pytestconfig.getoption("trace_policy")
+    recorder = TraceRecorder(
+        request.getfixturevalue("page"), policy, request.node.name,
+        execution_count=getattr(request.node, "execution_count", 1),
+    )
+    recorder.start()
     
     yield
     
-    # Stop tracing and save if test failed
-    if request.node.rep_call.failed:
-        page.context.tracing.stop(path=f"test-results/trace-{request.node.name}.zip")
-    else:
-        page.context.tracing.stop()
+    # Keep artifacts only if the test failed
+    reports = [getattr(request.node, f"rep_{when}", None) for when in ("setup", "call")]
+    recorder.stop(failed=any(report is not None and report.failed for report in reports))
+    request.node.user_properties.append(("trace_seconds", round(recorder.elapsed, 4)))
+    session_stats.add(pytestconfig, "trace cost (s)", {policy: recorder.elapsed})
+    session_stats.add(pytestconfig, "trace tests", {policy: 1})
 
 @pytest.hookimpl(hookwrapper=True)
 def pytest_runtest_makereport(item, call):
@@ -55,10 +64,32 @@ What Traces Show:
 This is GOLD for debugging!
 '''
 
+import json
+
 import pytest
 from pages.login_page import LoginPage
 from pages.products_page import ProductsPage
 from pages.cart_page import CartPage
+from utils.auth_pool import AuthStatePool
+from utils.config import PlaywrightConfig
+from utils.context_pool import ContextPool
+from utils.nodeids import base_nodeid
+from utils.local_app import LocalApiServer, LocalAppServer
+from utils import session_stats, spans
+from utils.tracing import TRACE_POLICIES, DEFAULT_TRACE_POLICY, TraceRecorder
+from utils.virtual_users import VirtualUsers
+from utils.web_vitals import WebVitals
+from utils.perf_baselines import PerformanceBaseline
+from utils.throttling import THROTTLING_PROFILES, apply_throttling
+from utils.network_cache import HAR_DIR, NETWORK_MODES, NetworkCache
+from utils.resource_policy import OPT_OUT_MARKERS, ResourcePolicy, parse_categories
+from utils.asset_cache import AssetCache
+from utils.api_client import ApiClient
+from utils.device_matrix import DeviceBrowsers, device_matrix, matrix_id
+from utils.accessibility import RULES as A11Y_RULES, AccessibilityAuditor
+from utils.visual_diff import VisualCheck
+
+pytest_plugins = ["utils.duration_history", "utils.xdist_scheduling"]
 
 @pytest.fixture
 def login_page(page):
@@ -75,37 +106,336 @@ def cart_page(page):
     """Provides CartPage instance"""
     return CartPage(page)
 
+@pytest.fixture(scope="session", autouse=True)
+def local_app():
+    """Serves the bundled saucedemo stand-in and points BASE_URL at it (--local-app)"""
+    if not PlaywrightConfig.LOCAL_APP:
+        yield None
+        return
+    # One server per process, so every xdist worker gets its own instance
+    with LocalAppServer() as server:
+        PlaywrightConfig.BASE_URL = server.url
+        yield server
+
+@pytest.fixture(scope="session")
+def local_api():
+    """Serves the bundled jsonplaceholder stand-in and points API_BASE_URL at it (--local-app)"""
+    if not PlaywrightConfig.LOCAL_APP:
+        yield None
+        return
+    with LocalApiServer() as server:
+        PlaywrightConfig.API_BASE_URL = server.url
+        yield server
+
+@pytest.fixture(scope="session")
+def api_client(playwright, local_api, pytestconfig):
+    """One API request context for the whole session (open connections, timings, batches)"""
+    client = ApiClient(playwright, PlaywrightConfig.API_BASE_URL, timeout=PlaywrightConfig.TIMEOUT)
+    yield client
+    client.close()
+    summary = client.summary()
+    if summary:
+        session_stats.add(pytestconfig, "api requests", {
+            "count": sum(row["count"] for row in summary.values()),
+            "errors": sum(row["errors"] for row in summary.values()),
+        })
+
+@pytest.fixture(scope="session")
+def auth_pool(browser, pytestconfig):
+    """Logs in once per user type per worker and caches the storage state"""
+    pool = AuthStatePool(browser, PlaywrightConfig.BASE_URL, ttl=pytestconfig.getoption("auth_ttl"))
+    if pytestconfig.getoption("auth_refresh"):
+        pool.invalidate()
+    return pool
+
 @pytest.fixture
-def logged_in_user(page):
-    """Logs in a standard user and returns page"""
-    login = LoginPage(page)
-    login.navigate()
-    login.login("standard_user", "secret_sauce")
+def logged_in_user(page, request):
+    """Starts the page logged in from the cached state and returns page (the context fixture loads it)"""
+    cart_marker = request.node.get_closest_marker("cart_items")
+    if cart_marker:
+        CartPage(page).seed(cart_marker.args)
+    ProductsPage(page).navigate()
     return page
 
+def pytest_addoption(parser):
+    """Command line options for the shared fixtures"""
+    parser.addoption(
+        "--pw-profile", choices=sorted(PlaywrightConfig.PROFILES),
+        help="PlaywrightConfig profile (default: local, or ci when $CI is set)"
+    )
+    parser.addoption(
+        "--pw-config", metavar="PATH",
+        help="Ini file with PlaywrightConfig settings (default: playwright.ini)"
+    )
+    parser.addoption(
+        "--pw-set", action="append", default=[], metavar="SETTING=VALUE",
+        help="Override one PlaywrightConfig setting, e.g. --pw-set TIMEOUT=10000"
+    )
+    parser.addoption(
+        "--local-app", action="store_true",
+        help="Run against the bundled saucedemo and jsonplaceholder stand-ins instead of the real sites"
+    )
+    parser.addoption(
+        "--asset-cache", action="store_true",
+        help="Serve scripts, styles, images and fonts from the shared .asset-cache/ directory"
+    )
+    parser.addoption(
+        "--auth-ttl", type=int, default=300,
+        help="Seconds a cached login stays valid (saucedemo sessions last 10 minutes)"
+    )
+    parser.addoption(
+        "--auth-refresh", action="store_true",
+        help="Discard cached logins in .auth/ and log in again"
+    )
+    parser.addoption(
+        "--strict-isolation", action="store_true",
+        help="Create a new browser context for every test instead of reusing pooled ones"
+    )
+    parser.addoption(
+        "--trace-policy", choices=TRACE_POLICIES, default=DEFAULT_TRACE_POLICY,
+        help="What trace_on_failure records (full = Playwright trace on every test)"
+    )
+    parser.addoption(
+        "--spans", action="store_true",
+        help="Time every page-object action and write spans to test-results/spans/"
+    )
+    parser.addoption(
+        "--throttle", choices=sorted(THROTTLING_PROFILES),
+        help="Throttle every page with a CPU/network profile (Chromium only)"
+    )
+    parser.addoption(
+        "--network-mode", choices=NETWORK_MODES, default="live",
+        help="record: save each test's traffic as HAR; replay: serve it from network-cache/"
+    )
+    parser.addoption(
+        "--network-strict", action="store_true",
+        help="In replay mode, abort requests missing from the HAR instead of fetching them"
+    )
+    parser.addoption(
+        "--network-max-age", type=float, default=7 * 24,
+        help="Hours after which a recorded response is fetched again in replay mode"
+    )
+    parser.addoption(
+        "--perf-update-baselines", action="store_true",
+        help="Store the measured samples as the new performance baselines instead of comparing"
+    )
+    parser.addoption(
+        "--perf-runs", type=int, default=15,
+        help="Measured runs per performance baseline check (after the warmup runs)"
+    )
+    parser.addoption(
+        "--perf-warmup", type=int, default=2,
+        help="Unmeasured warmup runs per performance baseline check"
+    )
+    parser.addoption(
+        "--perf-alpha", type=float, default=0.01,
+        help="Significance level of the Mann-Whitney regression test"
+    )
+    parser.addoption(
+        "--perf-min-effect", type=float, default=0.05,
+        help="Smallest median slowdown (0.05 = 5%%) reported as a regression"
+    )
+    parser.addoption(
+        "--a11y-update", action="store_true",
+        help="Re-record the accepted violations in accessibility-baselines/ instead of failing"
+    )
+    parser.addoption(
+        "--a11y-rules", default=",".join(A11Y_RULES),
+        help="Comma-separated accessibility rules the a11y fixture runs (default: all)"
+    )
+    parser.addoption(
+        "--visual-update", action="store_true",
+        help="Re-record the visual baselines that are missing or differ instead of failing"
+    )
+
 def pytest_configure(config):
     """Configure pytest with custom settings"""
+    overrides = {}
+    for setting in config.getoption("pw_set"):
+        name, separator, value = setting.partition("=")
+        if not separator:
+            raise pytest.UsageError(f"--pw-set expects SETTING=VALUE, got {setting!r}")
+        overrides[name.strip().upper()] = value
+    if config.getoption("base_url"):
+        overrides["BASE_URL"] = config.getoption("base_url")
+    if config.getoption("local_app"):
+        overrides["LOCAL_APP"] = True
+    if config.getoption("asset_cache"):
+        overrides["ASSET_CACHE"] = True
+    try:
+        PlaywrightConfig.load(
+            profile=config.getoption("pw_profile"),
+            config_file=config.getoption("pw_config"),
+            overrides=overrides,
+        )
+        parse_categories(PlaywrightConfig.BLOCK_RESOURCES)
+    except ValueError as error:
+        raise pytest.UsageError(str(error))
+    if config.getoption("spans"):
+        spans.instrument()
+    
     config.addinivalue_line(
         "markers", "smoke: Quick smoke tests"
     )
     config.addinivalue_line(
         "markers", "e2e: End-to-end scenarios"
     )
+    config.addinivalue_line(
+        "markers", "performance: Page load and Web Vitals measurements"
+    )
+    config.addinivalue_line(
+        "markers", "mobile: Tests on emulated mobile devices"
+    )
+    config.addinivalue_line(
+        "markers", "devices(*names, engines=None): Device matrix of a test using device_page / device_context"
+    )
+    config.addinivalue_line(
+        "markers", "throttle(profile): CPU/network throttling profile for the test's pages (slow-3g, fast-4g, cpu-4x, ...)"
+    )
+    config.addinivalue_line(
+        "markers", "har(name): HAR file shared by the tests of one flow (network-cache/<name>.har)"
+    )
+    config.addinivalue_line(
+        "markers", "visual: Screenshot comparisons (resources are never blocked)"
+    )
+    config.addinivalue_line(
+        "markers", "accessibility: Accessibility checks (resources are never blocked)"
+    )
+    config.addinivalue_line(
+        "markers", "resource_policy(categories): Resource categories to block, e.g. \"image,font\" or \"none\""
+    )
+    config.addinivalue_line(
+        "markers", "login_as(username): User the logged_in_user fixture starts as"
+    )
+    config.addinivalue_line(
+        "markers", "cart_items(*products): Products already in the cart when logged_in_user starts (no clicks)"
+    )
+    config.addinivalue_line(
+        "markers", "strict_isolation: Always give this test a brand new browser context"
+    )
+    config.addinivalue_line(
+        "markers", "trace_policy(name): Trace policy for this test (off, on-first-retry, retain-on-failure, full)"
+    )
+
+def pytest_generate_tests(metafunc):
+    """Parametrize device tests over the device matrix (marker or PlaywrightConfig.DEVICES)"""
+    if "device_engine" not in metafunc.fixturenames:
+        return
+    marker = metafunc.definition.get_closest_marker("devices")
+    devices = list(marker.args) if marker and marker.args else PlaywrightConfig.DEVICES
+    engines = marker.kwargs.get("engines") if marker else None
+    try:
+        matrix = device_matrix(devices, engines if engines is not None else PlaywrightConfig.DEVICE_ENGINES)
+    except ValueError as error:
+        raise pytest.UsageError(str(error))
+    # Session scope groups the tests of one device, like browser_name does for browsers
+    metafunc.parametrize(
+        ("device", "device_engine"), matrix,
+        ids=[matrix_id(device, engine) for device, engine in matrix], scope="session",
+    )
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """Collect the counters an xdist worker reported"""
+    session_stats.merge_worker(node.config, node)
+
+def pytest_terminal_summary(terminalreporter, config):
+    """Print counters of the shared fixtures (context pool, ...)"""
+    stats = session_stats.get(config)
+    if not stats:
+        return
+    terminalreporter.section("session stats")
+    for section, counters in stats.items():
+        values = ", ".join(
+            f"{name}: {value:.3f}" if isinstance(value, float) else f"{name}: {value}"
+            for name, value in counters.items()
+        )
+        if counters.get("hits", 0) + counters.get("misses", 0):
+            values += f", hit rate: {counters['hits'] / (counters['hits'] + counters['misses']):.1%}"
+        terminalreporter.write_line(f"{section} - {values}")
     
 
 @pytest.fixture(scope="function", autouse=True)
-def trace_on_failure(page, request):
-    """Record trace on test failure"""
-    # Start tracing
-    page.context.tracing.start(screenshots=True, snapshots=True, sources=True)
+def trace_on_failure(request, pytestconfig):
+    """Record trace (or a ring of recent actions) according to the trace policy"""
+    if "page" not in request.fixturenames:
+        yield
+        return
+    marker = request.node.get_closest_marker("trace_policy")
+    policy = marker.args[0] if marker else pytestconfig.getoption("trace_policy")
+    recorder = TraceRecorder(
+        request.getfixturevalue("page"), policy, request.node.name,
+        execution_count=getattr(request.node, "execution_count", 1),
+    )
+    recorder.start()
     
     yield
     
-    # Stop tracing and save if test failed
-    if request.node.rep_call.failed:
-        page.context.tracing.stop(path=f"test-results/trace-{request.node.name}.zip")
+    # Keep artifacts only if the test failed
+    reports = [getattr(request.node, f"rep_{when}", None) for when in ("setup", "call")]
+    recorder.stop(failed=any(report is not None and report.failed for report in reports))
+    request.node.user_properties.append(("trace_seconds", round(recorder.elapsed, 4)))
+    session_stats.add(pytestconfig, "trace cost (s)", {policy: recorder.elapsed})
+    session_stats.add(pytestconfig, "trace tests", {policy: 1})
+
+@pytest.fixture(autouse=True)
+def network_cache(request, pytestconfig):
+    """Record the test's traffic to a HAR file or replay it from there (--network-mode)"""
+    mode = pytestconfig.getoption("network_mode")
+    if mode == "live" or "page" not in request.fixturenames:
+        yield None
+        return
+    marker = request.node.get_closest_marker("har")
+    cache = NetworkCache(
+        HAR_DIR / f"{marker.args[0] if marker else request.node.name}.har",
+        mode=mode,
+        strict=pytestconfig.getoption("network_strict"),
+        max_age=pytestconfig.getoption("network_max_age") * 3600,
+    ).attach(request.getfixturevalue("page"))
+    
+    yield cache
+    
+    cache.save()
+    if cache.misses:
+        request.node.user_properties.append(("network_misses", json.dumps(cache.misses)))
+    session_stats.add(pytestconfig, f"network {mode}", cache.stats())
+
+@pytest.fixture(autouse=True)
+def resource_policy(request, pytestconfig, network_cache):
+    """Block images, fonts, analytics, ... per PlaywrightConfig.BLOCK_RESOURCES or the marker"""
+    if "page" not in request.fixturenames:
+        yield None
+        return
+    marker = request.node.get_closest_marker("resource_policy")
+    if any(request.node.get_closest_marker(name) for name in OPT_OUT_MARKERS):
+        categories = ()
     else:
-        page.context.tracing.stop()
+        categories = marker.args[0] if marker else PlaywrightConfig.BLOCK_RESOURCES
+    # Registered after the HAR routes, so blocked requests never reach them
+    policy = ResourcePolicy(categories, PlaywrightConfig.BASE_URL).attach(request.getfixturevalue("page"))
+    
+    yield policy
+    
+    if policy.blocked_count:
+        request.node.user_properties.append(("blocked_requests", policy.blocked_count))
+        session_stats.add(pytestconfig, "blocked requests", policy.blocked)
+
+@pytest.fixture(autouse=True)
+def action_spans(request, pytestconfig):
+    """Record page-object timing spans for this test (--spans)"""
+    if not pytestconfig.getoption("spans"):
+        yield
+        return
+    # Page objects defined after pytest_configure get wrapped too
+    spans.instrument()
+    spans.start(request.node.name)
+    
+    yield
+    
+    recorder = spans.stop()
+    recorder.dump()
+    request.node.user_properties.append(("span_seconds", round(recorder.total(), 4)))
+    session_stats.add(pytestconfig, "page-object spans", {"tests": 1, "seconds": recorder.total()})
 
 @pytest.hookimpl(hookwrapper=True)
 def pytest_runtest_makereport(item, call):
@@ -117,20 +447,105 @@ def pytest_runtest_makereport(item, call):
 
 import pytest
 from playwright.sync_api import Browser
-# from playwright_config import PlaywrightConfig
+
+@pytest.fixture(scope="session")
+def browser_type_launch_args(browser_type_launch_args):
+    """Launch options from PlaywrightConfig (--headed and --slowmo still win)"""
+    return {**PlaywrightConfig.get_browser_launch_options(), **browser_type_launch_args}
+
+@pytest.fixture(scope="session")
+def context_pool(browser: Browser, pytestconfig):
+    """Reuses browser contexts between tests (reset instead of recreated)"""
+    pool = ContextPool(browser, strict_isolation=pytestconfig.getoption("strict_isolation"))
+    yield pool
+    pool.close()
+    session_stats.add(pytestconfig, "context pool", pool.stats())
+
+@pytest.fixture(scope="session")
+def asset_cache(pytestconfig):
+    """Static assets shared by all contexts and workers (--asset-cache)"""
+    if not PlaywrightConfig.ASSET_CACHE:
+        yield None
+        return
+    cache = AssetCache()
+    yield cache
+    cache.close()
+    session_stats.add(pytestconfig, "asset cache", cache.stats())
 
 @pytest.fixture
-def context(browser: Browser):
-    """Create context with custom config"""
-    context = browser.new_context(**PlaywrightConfig.get_browser_context_options())
+def context(context_pool, asset_cache, request):
+    """Create context with custom config (pooled)"""
+    fresh = request.node.get_closest_marker("strict_isolation") is not None
+    options = PlaywrightConfig.get_browser_context_options()
+    if "logged_in_user" in request.fixturenames:
+        # The login is a creation option, so it is part of the pool key and restored on reset
+        marker = request.node.get_closest_marker("login_as")
+        username = marker.args[0] if marker else "standard_user"
+        options["storage_state"] = request.getfixturevalue("auth_pool").get_state(username)
+    context = context_pool.acquire(fresh=fresh, **options)
+    if asset_cache is not None:
+        # Routes are removed when the pool resets the context
+        asset_cache.attach(context)
     yield context
-    context.close()
+    context_pool.release(context)
 
 @pytest.fixture
-def page(context):
-    """Create page from context"""
-    page = context.new_page()
+def throttle(request, pytestconfig):
+    """Applies the test's throttling profile (throttle marker or --throttle) to a page"""
+    marker = request.node.get_closest_marker("throttle")
+    profile = marker.args[0] if marker else pytestconfig.getoption("throttle")
+    
+    def apply(page):
+        if profile is None:
+            return None
+        if apply_throttling(page, profile) is None:
+            pytest.skip(f"Throttling profile {profile!r} needs Chromium (CDP)")
+        request.node.throttle_profile = profile
+        session_stats.add(pytestconfig, "throttled tests", {profile: 1})
+        return profile
+    
+    apply.profile = profile
+    return apply
+
+@pytest.fixture(scope="session")
+def device_browsers(playwright, browser_type_launch_args, pytestconfig):
+    """One browser per engine per worker, shared by every device of the matrix"""
+    browsers = DeviceBrowsers(playwright, browser_type_launch_args)
+    yield browsers
+    stats = browsers.stats()
+    browsers.close()
+    if stats["browser launches"]:
+        session_stats.add(pytestconfig, "device browsers", stats)
+
+@pytest.fixture
+def device_context(device, device_engine, device_browsers, request):
+    """Context emulating the matrix device on its engine's shared browser"""
+    context, engine = device_browsers.acquire(
+        device, device_engine, **PlaywrightConfig.get_browser_context_options()
+    )
+    # Reports and the throttle fixture see the engine actually used
+    request.node.device_engine = engine
+    yield context
+    device_browsers.release(context, engine)
+
+def apply_default_timeouts(page):
+    """PlaywrightConfig timeouts (per profile) on a new page"""
     page.set_default_timeout(PlaywrightConfig.TIMEOUT)
+    page.set_default_navigation_timeout(PlaywrightConfig.NAVIGATION_TIMEOUT)
+    return page
+
+@pytest.fixture
+def device_page(device_context):
+    """Page in the device context"""
+    page = apply_default_timeouts(device_context.new_page())
+    yield page
+    page.close()
+
+@pytest.fixture
+def page(context, throttle):
+    """Create page from context"""
+    page = apply_default_timeouts(context.new_page())
+    throttle(page)
     yield page
     page.close()
     
@@ -158,9 +573,66 @@ def page_with_video(context_with_video):
     print(f"\n🎥 Video saved: {video_path}")
     
 @pytest.fixture
-def authenticated_context(browser):
-    """Context with saved authentication"""
-    context = browser.new_context(storage_state='auth.json')
+def web_vitals(page, request):
+    """Collects navigation timing and Web Vitals; samples end up in the test report"""
+    collector = WebVitals(page, profile=getattr(request.node, "throttle_profile", None))
+    yield collector
+    if collector.samples:
+        request.node.user_properties.append(("web_vitals", collector.as_json()))
+
+@pytest.fixture
+def perf_baseline(web_vitals, browser_name, pytestconfig):
+    """Repeated measurements compared with performance-baselines/ (Mann-Whitney U)"""
+    return PerformanceBaseline(
+        web_vitals, browser_name,
+        runs=pytestconfig.getoption("perf_runs"),
+        warmup=pytestconfig.getoption("perf_warmup"),
+        alpha=pytestconfig.getoption("perf_alpha"),
+        min_effect=pytestconfig.getoption("perf_min_effect"),
+        update=pytestconfig.getoption("perf_update_baselines"),
+    )
+
+@pytest.fixture(scope="session")
+def a11y(pytestconfig):
+    """In-page accessibility auditor (one evaluate per audit, baselines per page object)"""
+    rules = [rule.strip() for rule in pytestconfig.getoption("a11y_rules").split(",") if rule.strip()]
+    try:
+        auditor = AccessibilityAuditor(rules, update=pytestconfig.getoption("a11y_update"))
+    except ValueError as error:
+        raise pytest.UsageError(str(error))
+    yield auditor
+    if auditor.audits:
+        session_stats.add(pytestconfig, "accessibility audits", auditor.stats())
+
+@pytest.fixture
+def visual_check(browser_name, pytestconfig, request):
+    """Screenshot comparison against visual-baselines/, keyed by browser, viewport and device"""
+    callspec = getattr(request.node, "callspec", None)
+    device = callspec.params.get("device") if callspec is not None else None
+    checker = VisualCheck(
+        browser_name,
+        update=pytestconfig.getoption("visual_update"),
+        device=device or pytestconfig.getoption("device", None),
+        # Without the scheduling suffix (@<shape>), so visual_baselines update can select it
+        nodeid=base_nodeid(request.node.nodeid),
+    )
+    yield checker
+    if checker.results:
+        session_stats.add(pytestconfig, "visual checks", checker.stats())
+
+@pytest.fixture
+def virtual_users(browser_name, browser_type_launch_args):
+    """Runs async page-object journeys for many users at once (own loop and browser)"""
+    return VirtualUsers(
+        browser_name=browser_name,
+        launch_options=browser_type_launch_args,
+        context_options=PlaywrightConfig.get_browser_context_options(),
+    )
+
+@pytest.fixture
+def authenticated_context(auth_pool):
+    """Context with cached authentication"""
+    context = auth_pool.new_context("standard_user", **PlaywrightConfig.get_browser_context_options())
     yield context
     context.close()
 
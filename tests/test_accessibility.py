@@ -1,46 +1,75 @@
 '''
 Example 104: Add Accessibility Testing
 
+What it does:
 
+Audits the page with the in-page rule set of utils/accessibility.py: one
+evaluate per audit returns the violations, the tab order and the heading outline
+check() compares a page object with its baseline in accessibility-baselines/,
+so only NEW violations fail the test
+
+Run it:
+pytest tests/test_accessibility.py -v
+pytest tests/test_accessibility.py -v --a11y-rules label,button-name,color-contrast
+pytest tests/test_accessibility.py -v --a11y-update      # accept the current violations
 '''
 
 import pytest
-from playwright.sync_api import expect
+from pages.login_page import LoginPage
 
+@pytest.mark.accessibility
 class TestAccessibility:
     """Accessibility testing examples"""
-    
-    def test_login_page_has_proper_labels(self, page):
+
+    def test_login_page_has_proper_labels(self, page, a11y):
         """Test that form inputs have proper labels"""
-        page.goto("https://www.saucedemo.com/")
-        
-        # Check input fields have labels
-        username_input = page.locator("#user-name")
-        password_input = page.locator("#password")
-        
-        assert username_input.get_attribute("placeholder") == "Username"
-        assert password_input.get_attribute("placeholder") == "Password"
+        page.goto("/")
+
+        result = a11y.audit(page, rules=["label", "button-name"])
+
+        assert not result.violations, "Unlabelled controls:\n" + result.format()
+        assert page.locator("#user-name").get_attribute("placeholder") == "Username"
+        assert page.locator("#password").get_attribute("placeholder") == "Password"
         print("✅ Form inputs have proper labels")
-        
-    def test_login_button_accessible(self, page):
-        """Test login button is keyboard accessible"""
-        page.goto("https://www.saucedemo.com/")
-        
+
+    def test_login_button_accessible(self, page, a11y):
+        """Test login button is keyboard accessible (tab order from the audit, one round trip)"""
+        page.goto("/")
+
+        result = a11y.audit(page, rules=["focus-order", "aria-hidden-focus"])
+
+        assert not result.violations, result.format()
+        assert result.focus_order[:3] == ["#user-name", "#password", "#login-button"]
+        print("✅ Login button is keyboard accessible")
+
+    def test_login_button_reached_with_real_tab_presses(self, page):
+        """Test three real Tab presses land on the login button (catches focus handling in scripts)"""
+        page.goto("/")
+
         # Tab to login button
         page.keyboard.press("Tab")  # Username
         page.keyboard.press("Tab")  # Password
         page.keyboard.press("Tab")  # Login button
-        
+
         # Check login button is focused
         focused_element = page.evaluate("document.activeElement.id")
         assert focused_element == "login-button"
-        print("✅ Login button is keyboard accessible")
-        
-    def test_page_has_proper_heading_structure(self, page):
+        print("✅ Login button reached with the real keyboard")
+
+    def test_page_has_proper_heading_structure(self, page, a11y):
         """Test page has proper heading hierarchy"""
-        page.goto("https://www.saucedemo.com/")
-        
-        # Check for main heading
-        headings = page.locator("h1, h2, h3, h4").all()
-        assert len(headings) > 0, "Page should have headings"
-        print(f"✅ Found {len(headings)} heading(s) on page")
\ No newline at end of file
+        page.goto("/")
+
+        result = a11y.audit(page, rules=["page-has-heading", "heading-order"])
+
+        assert result.headings, "Page should have headings"
+        assert not result.by_rule("heading-order"), result.format()
+        print(f"✅ Found {len(result.headings)} heading(s) on page")
+
+    def test_login_page_against_accessibility_baseline(self, page, a11y):
+        """Test the whole rule set finds nothing beyond the accepted violations"""
+        login_page = LoginPage(page)
+        login_page.navigate()
+
+        result = a11y.check(login_page)
+        print(f"✅ {len(result.rules)} rules in {result.elapsed_ms:.1f}ms, no new violations")
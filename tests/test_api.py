@@ -1,32 +1,62 @@
 '''
 Example 101: Add API Testing to Portfolio
 
+What it does:
+
+Tests the jsonplaceholder API through the session-wide api_client fixture:
+one request context for all tests, so connections stay open
+batch() sends many requests at once and checks every body against a schema
+
+Run it:
+pytest tests/test_api.py -v
+pytest tests/test_api.py -v --local-app      # against the bundled stand-in, offline
 '''
 
+import time
+
 import pytest
+from utils.mock_engine import MockEngine
+
+POST_SCHEMA = {
+    "type": "object",
+    "required": ["userId", "id", "title", "body"],
+    "properties": {
+        "userId": {"type": "integer", "minimum": 1},
+        "id": {"type": "integer", "minimum": 1},
+        "title": {"type": "string"},
+        "body": {"type": "string"},
+    },
+}
+
+USER_SCHEMA = {
+    "type": "object",
+    "required": ["id", "name", "username", "email"],
+    "properties": {
+        "id": {"type": "integer"},
+        "name": {"type": "string"},
+        "username": {"type": "string"},
+        "email": {"type": "string"},
+    },
+}
 
 class TestAPI:
     """API testing examples using Playwright's request context"""
-    
+
     @pytest.fixture(autouse=True)
-    def setup(self, playwright):
-        self.request_context = playwright.request.new_context(
-            base_url="https://jsonplaceholder.typicode.com"
-        )
-        yield
-        self.request_context.dispose()
-    
+    def setup(self, api_client):
+        self.api = api_client
+
     def test_get_user_api(self):
         """Test GET request to retrieve user"""
-        response = self.request_context.get("/users/1")
-        
+        response = self.api.get("/users/1", schema=USER_SCHEMA)
+
         assert response.status == 200
         data = response.json()
         assert data["id"] == 1
         assert "name" in data
         assert "email" in data
         print(f"Retrieved user: {data['name']}")
-        
+
     def test_create_post_api(self):
         """Test POST request to create post"""
         new_post = {
@@ -34,15 +64,15 @@ class TestAPI:
             "body": "Created via Playwright API testing",
             "userId": 1
         }
-        
-        response = self.request_context.post("/posts", data=new_post)
-        
+
+        response = self.api.post("/posts", data=new_post)
+
         assert response.status == 201
         data = response.json()
         assert data["title"] == new_post["title"]
         assert "id" in data
         print(f"Created post with ID: {data['id']}")
-        
+
     def test_update_post_api(self):
         """Test PUT request to update post"""
         updated_post = {
@@ -51,16 +81,59 @@ class TestAPI:
             "body": "Updated content",
             "userId": 1
         }
-        
-        response = self.request_context.put("/posts/1", data=updated_post)
-        
+
+        response = self.api.put("/posts/1", data=updated_post)
+
         assert response.status == 200
         data = response.json()
         assert data["title"] == "Updated Title"
-        
+
     def test_delete_post_api(self):
         """Test DELETE request"""
-        response = self.request_context.delete("/posts/1")
-        
+        response = self.api.delete("/posts/1")
+
         assert response.status == 200
-        print("Post deleted successfully")
\ No newline at end of file
+        print("Post deleted successfully")
+
+    def test_batch_get_posts_api(self):
+        """Test 50 GET requests sent concurrently, every body checked against the post schema"""
+        results = self.api.batch(
+            [("GET", f"/posts/{post_id}") for post_id in range(1, 51)],
+            concurrency=10,
+            schema=POST_SCHEMA,
+        )
+
+        failed = [result for result in results if not result.ok]
+        assert not failed, f"Failed requests: {failed[:5]}"
+        assert [result.body["id"] for result in results] == list(range(1, 51))
+        timings = self.api.summary()["GET /posts/{id}"]
+        print(f"✅ 50 posts in parallel, p95 {timings['p95_ms']}ms")
+
+    def test_mock_server_from_recorded_traffic(self, playwright):
+        """Record a few calls, then serve other ids from the learned contract with injected latency"""
+        self.api.record = True
+        try:
+            self.api.get("/posts/1")
+            self.api.post("/posts", data={"title": "Recorded", "body": "Recorded body", "userId": 1})
+        finally:
+            self.api.record = False
+        engine = MockEngine().learn_traffic(self.api.traffic)
+        engine.set_latency("GET /posts/{id}", 100)
+
+        with engine.serve() as server:
+            mock_api = playwright.request.new_context(base_url=server.url)
+            started = time.perf_counter()
+            post = mock_api.get("/posts/42").json()
+            elapsed = time.perf_counter() - started
+            created = mock_api.post("/posts", data={"title": "Mocked", "body": "Mocked body", "userId": 7})
+            created_status, created_post = created.status, created.json()
+            partial_post = mock_api.post("/posts", data={"title": "Title only"}).json()
+            mock_api.dispose()
+
+        assert post["id"] == 42
+        assert elapsed >= 0.1
+        assert created_status == 201
+        assert created_post["title"] == "Mocked"
+        # Fields the request does not carry keep their recorded values
+        assert partial_post["userId"] == 1 and partial_post["body"] == "Recorded body"
+        print(f"✅ Mock server answered from {len(engine.entries)} recorded pairs")
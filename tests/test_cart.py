@@ -6,7 +6,6 @@ pytest tests/test_cart.py -v -m e2e
 '''
 
 import pytest
-from pages.login_page import LoginPage
 from pages.products_page import ProductsPage
 from pages.cart_page import CartPage
 
@@ -14,13 +13,10 @@ class TestCart:
     """Test suite for shopping cart functionality"""
     
     @pytest.fixture(autouse=True)
-    def setup(self, page):
-        """Login and navigate before each test"""
-        login_page = LoginPage(page)
-        login_page.navigate()
-        login_page.login("standard_user", "secret_sauce")
-        self.products_page = ProductsPage(page)
-        self.cart_page = CartPage(page)
+    def setup(self, logged_in_user):
+        """Start each test logged in (cached login, no form)"""
+        self.products_page = ProductsPage(logged_in_user)
+        self.cart_page = CartPage(logged_in_user)
         
     @pytest.mark.smoke
     def test_view_empty_cart(self, page):
@@ -30,19 +26,18 @@ class TestCart:
         assert self.cart_page.is_cart_empty()
         assert "cart" in page.url
         
+    @pytest.mark.cart_items("Sauce Labs Backpack")
     def test_view_cart_with_items(self, page):
         """Test viewing cart with added items"""
-        self.products_page.add_product_to_cart("Sauce Labs Backpack")
         self.products_page.go_to_cart()
         
         assert self.cart_page.get_cart_item_count() == 1
         assert "Sauce Labs Backpack" in self.cart_page.get_cart_item_names()
         
+    @pytest.mark.cart_items("Sauce Labs Backpack", "Sauce Labs Bike Light")
     def test_remove_item_from_cart(self, page):
         """Test removing item from cart"""
-        # Add items
-        self.products_page.add_product_to_cart("Sauce Labs Backpack")
-        self.products_page.add_product_to_cart("Sauce Labs Bike Light")
+        # Items are seeded in localStorage by the cart_items marker
         self.products_page.go_to_cart()
         
         # Remove one item
@@ -53,11 +48,10 @@ class TestCart:
         assert "Sauce Labs Backpack" not in cart_items
         assert "Sauce Labs Bike Light" in cart_items
         
+    @pytest.mark.cart_items("Sauce Labs Backpack", "Sauce Labs Bike Light")
     def test_remove_all_items_from_cart(self, page):
         """Test removing all items from cart"""
-        # Add items
-        self.products_page.add_product_to_cart("Sauce Labs Backpack")
-        self.products_page.add_product_to_cart("Sauce Labs Bike Light")
+        # Items are seeded in localStorage by the cart_items marker
         self.products_page.go_to_cart()
         
         # Remove all
@@ -74,11 +68,10 @@ class TestCart:
         assert "inventory" in page.url
         
     @pytest.mark.e2e
+    @pytest.mark.cart_items("Sauce Labs Backpack", "Sauce Labs Bike Light")
     def test_full_shopping_flow(self, page):
         """End-to-end test: Browse → Add → View Cart → Remove → Checkout"""
-        # Add products
-        self.products_page.add_product_to_cart("Sauce Labs Backpack")
-        self.products_page.add_product_to_cart("Sauce Labs Bike Light")
+        # Two products are seeded, the third one is added through the UI
         self.products_page.add_product_to_cart("Sauce Labs Bolt T-Shirt")
         
         assert self.products_page.get_cart_count() == 3
@@ -3,24 +3,26 @@ Example 114: Browser Contexts (Isolation)
 '''
 
 import pytest
+from pages.async_pages import AsyncLoginPage
+from utils.config import PlaywrightConfig
 
 class TestContexts:
     """Browser context examples - test isolation"""
     
-    def test_multiple_users_same_time(self, browser):
+    def test_multiple_users_same_time(self, context_pool):
         """Simulate multiple users in parallel"""
         # User 1 context
-        context1 = browser.new_context()
+        context1 = context_pool.acquire(**PlaywrightConfig.get_browser_context_options())
         page1 = context1.new_page()
-        page1.goto("https://www.saucedemo.com/")
+        page1.goto("/")
         page1.fill("#user-name", "standard_user")
         page1.fill("#password", "secret_sauce")
         page1.click("#login-button")
         
         # User 2 context (completely isolated)
-        context2 = browser.new_context()
+        context2 = context_pool.acquire(**PlaywrightConfig.get_browser_context_options())
         page2 = context2.new_page()
-        page2.goto("https://www.saucedemo.com/")
+        page2.goto("/")
         page2.fill("#user-name", "problem_user")
         page2.fill("#password", "secret_sauce")
         page2.click("#login-button")
@@ -31,20 +33,36 @@ class TestContexts:
         
         print("✅ Two users logged in simultaneously")
         
-        context1.close()
-        context2.close()
+        context_pool.release(context1)
+        context_pool.release(context2)
         
-    def test_different_permissions(self, browser):
+    def test_different_permissions(self, context_pool):
         """Test with different browser permissions"""
         # Context with geolocation
-        context = browser.new_context(
+        context = context_pool.acquire(
+            **PlaywrightConfig.get_browser_context_options(),
             geolocation={"latitude": 41.85, "longitude": -87.65},
             permissions=["geolocation"]
         )
         page = context.new_page()
         
         # Test would work with location-based features
-        page.goto("https://www.saucedemo.com/")
+        page.goto("/")
         
         print("✅ Context created with geolocation permissions")
-        context.close()
\ No newline at end of file
+        context_pool.release(context)
+        
+    def test_many_users_concurrently(self, virtual_users):
+        """Log 10 users in at the same time on one event loop"""
+        usernames = ["standard_user", "problem_user"]
+        
+        async def login(page, index):
+            login_page = AsyncLoginPage(page)
+            await login_page.navigate()
+            await login_page.login(usernames[index % 2], "secret_sauce")
+            return await login_page.is_logged_in()
+        
+        results = virtual_users.run(login, users=10)
+        
+        assert all(result.ok and result.value for result in results), results
+        print(f"✅ {len(results)} users logged in concurrently")
@@ -0,0 +1,58 @@
+'''
+Latency statistics of the load runner
+
+What it does:
+
+Checks the nearest-rank percentiles and error counts of utils/load.py, no
+browser needed: they are the only output of the load CLI and ApiClient.summary()
+
+Run it:
+pytest tests/test_load_stats.py -v
+'''
+
+import pytest
+from utils.load import LatencyStats, percentile
+
+class TestLoadStats:
+    """Percentiles and error counting"""
+
+    def test_percentile_of_one_sample(self):
+        """Test every percentile of a single sample is that sample"""
+        assert [percentile([0.25], pct) for pct in (0, 50, 95, 99, 100)] == [0.25] * 5
+        print("✅ One sample is every percentile")
+
+    def test_nearest_rank_percentiles(self):
+        """Test nearest rank: p50 of 1..10 is 5, p95 and p100 are the maximum"""
+        values = list(range(10, 0, -1))
+
+        assert percentile(values, 50) == 5
+        assert percentile(values, 51) == 6
+        assert percentile(values, 95) == 10
+        assert percentile(values, 100) == 10
+        assert percentile(values, 0) == 1
+        print("✅ Nearest-rank percentiles")
+
+    def test_percentile_of_empty_series(self):
+        """Test an empty series is an error, not a made-up latency"""
+        with pytest.raises(ValueError):
+            percentile([], 95)
+        assert LatencyStats().summary() == {}
+        print("✅ Empty series rejected")
+
+    def test_summary_counts_errors(self):
+        """Test failed samples are counted as errors and still timed"""
+        stats = LatencyStats()
+        for seconds, ok in ((0.1, True), (0.2, False), (0.3, True), (0.4, False)):
+            stats.record("step", "login", seconds, ok)
+        stats.record("action", "LoginPage.login", 0.05)
+
+        summary = stats.summary()
+        login = summary["step"]["login"]
+        assert login["count"] == 4
+        assert login["errors"] == 2
+        assert login["p50_ms"] == 200.0
+        assert login["p99_ms"] == login["max_ms"] == 400.0
+        assert summary["action"]["LoginPage.login"] == {
+            "count": 1, "errors": 0, "p50_ms": 50.0, "p95_ms": 50.0, "p99_ms": 50.0, "max_ms": 50.0,
+        }
+        print("✅ Errors counted per step")
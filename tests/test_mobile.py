@@ -1,7 +1,16 @@
 '''
 Example 103: Add Mobile Testing
 
+What it does:
 
+Runs the login on every device of the device matrix (utils/device_matrix.py):
+the devices marker or PlaywrightConfig.DEVICES, each on its own default engine
+Devices of one engine share a single browser per worker
+
+Run it:
+pytest tests/test_mobile.py -v
+pytest tests/test_mobile.py -v -n 4 --pw-set DEVICES="iPhone 12,iPhone 13,Pixel 5,Galaxy S9+"
+pytest tests/test_mobile.py -v --pw-set DEVICE_ENGINES=chromium,webkit
 '''
 
 import pytest
@@ -9,51 +18,28 @@ from pages.login_page import LoginPage
 
 class TestMobile:
     """Mobile responsive testing"""
-    
-    @pytest.mark.mobile
-    def test_login_on_iphone(self, playwright, browser):
-        """Test login on iPhone 12"""
-        iphone = playwright.devices["iPhone 12"]
-        context = browser.new_context(**iphone)
-        page = context.new_page()
-        
-        login_page = LoginPage(page)
-        login_page.navigate()
-        login_page.login("standard_user", "secret_sauce")
-        
-        assert login_page.is_logged_in()
-        print("✅ Login successful on iPhone 12")
-        
-        context.close()
-        
+
     @pytest.mark.mobile
-    def test_login_on_ipad(self, playwright, browser):
-        """Test login on iPad"""
-        ipad = playwright.devices["iPad Pro"]
-        context = browser.new_context(**ipad)
-        page = context.new_page()
-        
-        login_page = LoginPage(page)
+    @pytest.mark.devices("iPhone 12", "iPad Pro", "Pixel 5")
+    def test_login_on_device(self, device_page, device, request):
+        """Test login on each device of the matrix"""
+        login_page = LoginPage(device_page)
         login_page.navigate()
         login_page.login("standard_user", "secret_sauce")
-        
+
         assert login_page.is_logged_in()
-        print("✅ Login successful on iPad Pro")
-        
-        context.close()
-        
+        print(f"✅ Login successful on {device} ({request.node.device_engine})")
+
     @pytest.mark.mobile
-    def test_login_on_android(self, playwright, browser):
-        """Test login on Android device"""
-        android = playwright.devices["Pixel 5"]
-        context = browser.new_context(**android)
-        page = context.new_page()
-        
-        login_page = LoginPage(page)
+    @pytest.mark.devices("Pixel 5")
+    @pytest.mark.throttle("mid-range-phone")
+    def test_login_on_throttled_android(self, device_page, throttle):
+        """Test login on Pixel 5 with a 4x slower CPU and a 4G network"""
+        throttle(device_page)
+
+        login_page = LoginPage(device_page)
         login_page.navigate()
         login_page.login("standard_user", "secret_sauce")
-        
+
         assert login_page.is_logged_in()
-        print("✅ Login successful on Pixel 5")
-        
-        context.close()
\ No newline at end of file
+        print(f"✅ Login successful on Pixel 5 ({throttle.profile})")
@@ -4,6 +4,8 @@ Example 113: Network Interception (Advanced)
 '''
 
 import pytest
+from utils.mock_engine import MockEngine
+from utils.network_cache import NetworkCache
 
 class TestNetwork:
     """Network interception and mocking"""
@@ -15,7 +17,7 @@ class TestNetwork:
         # Listen to all requests
         page.on("request", lambda request: api_calls.append(request.url))
         
-        page.goto("https://www.saucedemo.com/")
+        page.goto("/")
         page.fill("#user-name", "standard_user")
         page.fill("#password", "secret_sauce")
         page.click("#login-button")
@@ -35,18 +37,50 @@ class TestNetwork:
             )
         
         page.route("**/api/*", handle_route)
-        page.goto("https://www.saucedemo.com/")
+        page.goto("/")
         
         print("✅ API responses mocked")
         
-    def test_block_images(self, page):
-        """Block image loading for faster tests"""
-        # Block all image requests
-        page.route("**/*.{png,jpg,jpeg,gif,svg}", lambda route: route.abort())
+    def test_mock_engine_on_page_route(self, page):
+        """Serve a learned API contract to the page, templated per request and with injected latency"""
+        engine = MockEngine(latency=50)
+        engine.learn("GET", "/api/products/4", body={"id": 4, "name": "Sauce Labs Backpack", "stock": 3})
+        engine.attach(page, "**/api/**")
+        page.goto("/")
+        
+        product = page.evaluate("fetch('/api/products/5').then(response => response.json())")
         
-        page.goto("https://www.saucedemo.com/")
+        assert product["id"] == 5
+        assert product["stock"] == 3
+        assert engine.stats() == {"hits": 1, "misses": 0}
+        print("✅ API answered from the mock engine")
+        
+    @pytest.mark.resource_policy("image")
+    def test_block_images(self, page, resource_policy):
+        """Block image loading for faster tests"""
+        # The marker makes the resource_policy fixture abort all image requests
+        page.goto("/")
         page.fill("#user-name", "standard_user")
         page.fill("#password", "secret_sauce")
         page.click("#login-button")
+        page.wait_for_selector(".inventory_item")
+        
+        assert resource_policy.blocked.get("image", 0) > 0
+        print(f"✅ Test ran without loading {resource_policy.blocked['image']} images (faster)")
+        
+    def test_replay_recorded_traffic_offline(self, page, tmp_path):
+        """Record the login page to a HAR, then serve it from there with the network off"""
+        har_path = tmp_path / "login.har"
+        recorder = NetworkCache(har_path, mode="record").attach(page)
+        page.goto("/")
+        recorder.save()
+        page.unroute_all()
+        
+        page.context.set_offline(True)
+        replay = NetworkCache(har_path, mode="replay", strict=True).attach(page)
+        page.reload()
         
-        print("✅ Test ran without loading images (faster)")
\ No newline at end of file
+        assert page.locator("#login-button").is_visible()
+        assert replay.hits > 0
+        assert replay.misses == []
+        print(f"✅ Replayed {replay.hits} responses offline")
@@ -0,0 +1,64 @@
+'''
+Statistics behind the performance baselines
+
+What it does:
+
+Checks the one-sided Mann-Whitney U test and compare() of utils/perf_baselines.py
+on fixed samples, no browser needed: the perf_baseline fixture skips without a
+recorded baseline, so a broken p-value would otherwise go unnoticed
+
+Run it:
+pytest tests/test_perf_baselines.py -v
+'''
+
+from utils.perf_baselines import compare, mann_whitney_greater
+
+BASELINE = [100, 102, 98, 101, 99, 103, 97, 100, 101, 99]
+
+class TestPerfBaselines:
+    """Regression decision of perf_baseline"""
+
+    def test_clearly_slower_samples_are_flagged(self):
+        """Test samples 30% slower give a tiny p-value and a regression"""
+        slower = [value * 1.3 for value in BASELINE]
+
+        assert mann_whitney_greater(slower, BASELINE) < 0.001
+        result = compare({"load": slower}, {"load": BASELINE})["load"]
+        assert result["regression"]
+        assert result["change"] > 0.25
+        print(f"✅ 30% slower flagged (p={result['p_value']})")
+
+    def test_identical_samples_are_not_flagged(self):
+        """Test the same samples are no regression"""
+        assert mann_whitney_greater(BASELINE, BASELINE) > 0.4
+        assert mann_whitney_greater([100] * 10, [100] * 10) == 1.0
+
+        result = compare({"load": list(BASELINE)}, {"load": BASELINE})["load"]
+        assert not result["regression"]
+        assert result["change"] == 0
+        print("✅ Identical samples pass")
+
+    def test_faster_samples_are_not_flagged(self):
+        """Test the one-sided test ignores improvements"""
+        faster = [value * 0.7 for value in BASELINE]
+
+        assert mann_whitney_greater(faster, BASELINE) > 0.99
+        assert not compare({"load": faster}, {"load": BASELINE})["load"]["regression"]
+        print("✅ Faster samples pass")
+
+    def test_slowdown_below_min_effect_is_ignored(self):
+        """Test a significant but small slowdown stays under min_effect"""
+        slightly_slower = [value + 10 for value in BASELINE]
+
+        result = compare({"load": slightly_slower}, {"load": BASELINE}, min_effect=0.15)["load"]
+        assert result["p_value"] < 0.01
+        assert not result["regression"]
+        assert compare({"load": slightly_slower}, {"load": BASELINE}, min_effect=0.05)["load"]["regression"]
+        print(f"✅ {result['change']:.0%} slowdown ignored with min_effect 15%")
+
+    def test_metrics_without_baseline_are_skipped(self):
+        """Test metrics missing on either side are not compared"""
+        result = compare({"load": BASELINE, "lcp": BASELINE, "fcp": []}, {"load": BASELINE, "fcp": BASELINE})
+
+        assert list(result) == ["load"]
+        print("✅ Only metrics with samples on both sides are compared")
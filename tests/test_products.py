@@ -13,19 +13,15 @@ pytest tests/test_products.py -v
 '''
 
 import pytest
-from pages.login_page import LoginPage
 from pages.products_page import ProductsPage
 
 class TestProducts:
     """Test suite for products page functionality"""
     
     @pytest.fixture(autouse=True)
-    def setup(self, page):
-        """Login before each test"""
-        login_page = LoginPage(page)
-        login_page.navigate()
-        login_page.login("standard_user", "secret_sauce")
-        self.products_page = ProductsPage(page)
+    def setup(self, logged_in_user):
+        """Start each test logged in (cached login, no form)"""
+        self.products_page = ProductsPage(logged_in_user)
         
     @pytest.mark.smoke
     def test_products_page_loads(self, page):
@@ -72,4 +68,13 @@ class TestProducts:
         self.products_page.sort_products("hilo")
         
         prices = self.products_page.get_all_product_prices()
-        assert prices == sorted(prices, reverse=True)
\ No newline at end of file
+        assert prices == sorted(prices, reverse=True)
+        
+    def test_product_listing_data(self, page):
+        """Test every product has a name, a price and an add button (one round trip)"""
+        products = self.products_page.get_products()
+        
+        assert len(products) == 6
+        assert all(product["name"] and product["price"] > 0 for product in products)
+        assert not any(product["in_cart"] for product in products)
+        assert all(product["data_test"].startswith("add-to-cart-") for product in products)
@@ -1,44 +1,57 @@
 '''
 Example 105: Add Visual Regression Testing
 
+What it does:
 
+Compares screenshots with the baselines in visual-baselines/ (utils/visual_diff.py)
+Identical screenshots are matched by hash; others get a perceptual diff that
+ignores anti-aliasing, and a diff image in test-results/visual/ when they fail
+Dynamic content listed in the page object's VISUAL_MASKS is covered
+
+Run it:
+pytest tests/test_visual_regression.py                   # first run records the baselines
+pytest tests/test_visual_regression.py --visual-update   # after an intended UI change
 '''
 
 import pytest
-from playwright.sync_api import expect
 from pages.login_page import LoginPage
+from pages.products_page import ProductsPage
 
 class TestVisualRegression:
     """Visual regression testing with screenshots"""
-    
+
     @pytest.mark.visual
-    def test_login_page_visual(self, page):
+    def test_login_page_visual(self, page, visual_check):
         """Visual test for login page"""
-        page.goto("https://www.saucedemo.com/")
-        
+        login_page = LoginPage(page)
+        login_page.navigate()
+
         # Take screenshot and compare with baseline
-        expect(page).to_have_screenshot("login-page-baseline.png", max_diff_pixels=50)
-        
+        result = visual_check.check("login-page", page, login_page, max_diff_pixels=50)
+        print(f"✅ Login page matches baseline ({result.diff_pixels} pixels differ)")
+
     @pytest.mark.visual
-    def test_products_page_visual(self, page):
+    def test_products_page_visual(self, page, visual_check):
         """Visual test for products page"""
         login_page = LoginPage(page)
         login_page.navigate()
         login_page.login("standard_user", "secret_sauce")
-        
+
         # Wait for page to load
         page.wait_for_selector(".inventory_item")
-        
+
         # Visual comparison
-        expect(page).to_have_screenshot("products-page-baseline.png", max_diff_pixels=100)
-        
+        result = visual_check.check("products-page", page, ProductsPage(page), max_diff_pixels=100)
+        print(f"✅ Products page matches baseline ({result.diff_pixels} pixels differ)")
+
     @pytest.mark.visual
-    def test_cart_icon_visual(self, page):
+    def test_cart_icon_visual(self, page, visual_check):
         """Visual test for specific element - cart icon"""
         login_page = LoginPage(page)
         login_page.navigate()
         login_page.login("standard_user", "secret_sauce")
-        
+
         # Screenshot of cart icon only
         cart_icon = page.locator(".shopping_cart_link")
-        expect(cart_icon).to_have_screenshot("cart-icon-baseline.png")
\ No newline at end of file
+        visual_check.check("cart-icon", cart_icon)
+        print("✅ Cart icon matches baseline")
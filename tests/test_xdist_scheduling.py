@@ -0,0 +1,73 @@
+'''
+Work units of the fixture-shape scheduler
+
+What it does:
+
+Checks plan_work_units() of utils/xdist_scheduling.py on made-up node ids, no
+browser and no xdist run needed: every test lands in exactly one unit, shapes
+stay together when they fit, big shapes are split and unknown tests get the
+median known duration
+
+Run it:
+pytest tests/test_xdist_scheduling.py -v
+'''
+
+from utils.xdist_scheduling import plan_work_units
+
+def nodeid(name, shape=None):
+    return f"tests/test_shapes.py::{name}" + (f"@{shape}" if shape else "")
+
+def assigned(units):
+    return [nodeid for members in units.values() for nodeid in members]
+
+class TestXdistScheduling:
+    """plan_work_units packing"""
+
+    def test_every_test_assigned_exactly_once(self):
+        """Test mixed shapes, unshaped ids and unknown durations are all scheduled once"""
+        nodeids = (
+            [nodeid(f"test_login_{index}", "login:standard_user") for index in range(7)]
+            + [nodeid(f"test_page_{index}", "page") for index in range(5)]
+            + [nodeid(f"test_plain_{index}") for index in range(3)]
+        )
+        durations = {nodeid(f"test_login_{index}"): index + 1 for index in range(4)}
+
+        units = plan_work_units(nodeids, durations, node_count=3)
+
+        assert sorted(assigned(units)) == sorted(nodeids)
+        assert len(assigned(units)) == len(set(assigned(units)))
+        assert any(name.startswith("no-shape#") for name in units)
+        print(f"✅ {len(nodeids)} tests in {len(units)} units")
+
+    def test_shapes_stay_together_when_they_fit(self):
+        """Test a shape that fits in one worker's share is one unit in collection order"""
+        nodeids = [nodeid(f"test_a{index}", "login:standard_user") for index in range(3)]
+        nodeids += [nodeid(f"test_b{index}", "mobile") for index in range(3)]
+
+        units = plan_work_units(nodeids, {}, node_count=2)
+
+        assert units == {"login:standard_user#0": nodeids[:3], "mobile#0": nodeids[3:]}
+        print("✅ One unit per shape")
+
+    def test_group_larger_than_target_is_split(self):
+        """Test 8 one-second tests of one shape on 4 workers become 4 units of 2 tests"""
+        nodeids = [nodeid(f"test_{index}", "page") for index in range(8)]
+
+        units = plan_work_units(nodeids, {}, node_count=4)
+
+        assert len(units) == 4
+        assert all(name.startswith("page#") and len(members) == 2 for name, members in units.items())
+        for members in units.values():
+            assert members == sorted(members, key=nodeids.index)
+        print("✅ Big shape split into balanced units")
+
+    def test_longest_unit_first_with_median_fallback(self):
+        """Test unknown tests count as the median known duration when ordering units"""
+        nodeids = [nodeid("test_fast", "contexts"), nodeid("test_slow_1", "mobile"),
+                   nodeid("test_slow_2", "mobile"), nodeid("test_unknown", "page")]
+        durations = {nodeid("test_fast"): 1.0, nodeid("test_slow_1"): 5.0, nodeid("test_slow_2"): 5.0}
+
+        units = plan_work_units(nodeids, durations, node_count=1)
+
+        assert list(units) == ["mobile#0", "page#0", "contexts#0"]
+        print("✅ Units ordered longest first")
@@ -0,0 +1,315 @@
+'''
+In-page accessibility audit
+
+What it does:
+
+Installs one audit script in the page and runs a whole rule set in a single
+pass over the DOM: one evaluate per audit, instead of a round trip per element
+The first audit of a page sends the script and the call together; later audits
+of the same document only send the rule names. A page that is audited again
+after a navigation gets the script as an init script, so its later documents
+already have it
+
+Rules:
+label              form controls without an accessible name
+button-name        buttons without text, aria-label or title
+link-name          links without text, aria-label or title
+image-alt          images without an alt attribute
+page-has-heading   no h1-h6 / role="heading" at all
+heading-order      a heading more than one level below the previous one
+focus-order        positive tabindex, which breaks the natural tab order
+color-contrast     text below 4.5:1 (3:1 for large text) against its background
+aria-roles         role values that are not ARIA roles
+aria-hidden-focus  focusable elements inside aria-hidden="true"
+
+Besides the violations, an audit returns the tab order (selectors of the
+focusable elements, in order) and the heading outline.
+
+Page-object baselines: check(page_object) fails only on violations that are not
+in accessibility-baselines/<PageObject>.json; a missing baseline is recorded
+(the test is skipped), --a11y-update re-records the accepted violations.
+'''
+
+import json
+import time
+import weakref
+from pathlib import Path
+
+import pytest
+
+BASELINE_DIR = Path("accessibility-baselines")
+
+RULES = (
+    "label", "button-name", "link-name", "image-alt", "page-has-heading", "heading-order",
+    "focus-order", "color-contrast", "aria-roles", "aria-hidden-focus",
+)
+
+AUDIT_SOURCE = r"""
+(() => {
+    if (window.__a11yAudit) return;
+    const ROLES = new Set(("alert alertdialog application article banner blockquote button caption cell checkbox " +
+        "code columnheader combobox complementary contentinfo definition deletion dialog directory document " +
+        "emphasis feed figure form generic grid gridcell group heading img insertion link list listbox " +
+        "listitem log main marquee math menu menubar menuitem menuitemcheckbox menuitemradio meter navigation " +
+        "none note option paragraph presentation progressbar radio radiogroup region row rowgroup rowheader " +
+        "scrollbar search searchbox separator slider spinbutton status strong subscript superscript switch " +
+        "tab table tablist tabpanel term textbox time timer toolbar tooltip tree treegrid treeitem").split(" "));
+    const FOCUSABLE = "a[href], button, input, select, textarea, summary, [tabindex], [contenteditable=''], [contenteditable='true']";
+
+    const selectorOf = element => {
+        if (element.id) return `#${CSS.escape(element.id)}`;
+        const dataTest = element.getAttribute("data-test");
+        if (dataTest) return `[data-test="${dataTest}"]`;
+        const parts = [];
+        for (let node = element; node && node.nodeType === 1 && parts.length < 3; node = node.parentElement) {
+            let part = node.tagName.toLowerCase();
+            const siblings = node.parentElement
+                ? [...node.parentElement.children].filter(child => child.tagName === node.tagName) : [];
+            if (siblings.length > 1) part += `:nth-of-type(${siblings.indexOf(node) + 1})`;
+            parts.unshift(part);
+            if (node.id) { parts[0] = `#${CSS.escape(node.id)}`; break; }
+        }
+        return parts.join(" > ");
+    };
+    const visible = element => {
+        const style = getComputedStyle(element);
+        if (style.visibility === "hidden" || style.display === "none") return false;
+        return element.getClientRects().length > 0;
+    };
+    const text = element => (element.innerText || element.textContent || "").trim();
+    const labelledBy = element => (element.getAttribute("aria-labelledby") || "").split(/\s+/)
+        .map(id => id && document.getElementById(id)).filter(Boolean).map(text).join(" ").trim();
+    const accessibleName = element => {
+        const name = labelledBy(element) || (element.getAttribute("aria-label") || "").trim();
+        if (name) return name;
+        if (element.labels && element.labels.length) {
+            const label = [...element.labels].map(text).join(" ").trim();
+            if (label) return label;
+        }
+        if (["submit", "reset", "button"].includes(element.type) && element.value) return element.value.trim();
+        if (element.tagName === "IMG") return (element.getAttribute("alt") || "").trim();
+        const own = element.matches("button, a, [role=button], [role=link]") ? text(element) : "";
+        if (!own && element.matches("button, a")) {
+            const image = element.querySelector("img[alt]");
+            if (image && image.alt.trim()) return image.alt.trim();
+        }
+        return own || (element.getAttribute("title") || "").trim() || (element.getAttribute("placeholder") || "").trim();
+    };
+
+    const parseColor = value => {
+        const match = value.match(/rgba?\(([^)]+)\)/);
+        if (!match) return null;
+        const [r, g, b, a = 1] = match[1].split(/[,\s/]+/).filter(Boolean).map(Number);
+        return {r, g, b, a};
+    };
+    const luminance = ({r, g, b}) => {
+        const channel = value => {
+            value /= 255;
+            return value <= 0.03928 ? value / 12.92 : Math.pow((value + 0.055) / 1.055, 2.4);
+        };
+        return 0.2126 * channel(r) + 0.7152 * channel(g) + 0.0722 * channel(b);
+    };
+    const background = element => {
+        for (let node = element; node && node.nodeType === 1; node = node.parentElement) {
+            const style = getComputedStyle(node);
+            // Text over an image cannot be judged from colours alone
+            if (style.backgroundImage && style.backgroundImage !== "none") return null;
+            const color = parseColor(style.backgroundColor);
+            if (color && color.a > 0) return color;
+        }
+        return {r: 255, g: 255, b: 255, a: 1};
+    };
+    const blend = (top, bottom) => ({
+        r: top.r * top.a + bottom.r * (1 - top.a),
+        g: top.g * top.a + bottom.g * (1 - top.a),
+        b: top.b * top.a + bottom.b * (1 - top.a),
+    });
+
+    const rules = {
+        "label": (report, all) => all.filter(element => element.matches("input, select, textarea")
+                && !["hidden", "submit", "reset", "button", "image"].includes(element.type)
+                && visible(element) && !accessibleName(element))
+            .forEach(element => report(element, "form control has no accessible name", "critical")),
+        "button-name": (report, all) => all.filter(element => element.matches("button, [role=button], input[type=submit], input[type=button]")
+                && visible(element) && !accessibleName(element))
+            .forEach(element => report(element, "button has no accessible name", "critical")),
+        "link-name": (report, all) => all.filter(element => element.matches("a[href], [role=link]")
+                && visible(element) && !accessibleName(element))
+            .forEach(element => report(element, "link has no accessible name", "serious")),
+        "image-alt": (report, all) => all.filter(element => element.tagName === "IMG"
+                && !element.hasAttribute("alt") && !["none", "presentation"].includes(element.getAttribute("role")))
+            .forEach(element => report(element, "image has no alt attribute", "critical")),
+        "page-has-heading": (report, all, result) => {
+            if (!result.headings.length) report(document.documentElement, "page has no headings", "moderate");
+        },
+        "heading-order": (report, all, result) => {
+            result.headingElements.forEach((element, index) => {
+                const previous = result.headings[index - 1];
+                const level = result.headings[index].level;
+                if (previous && level > previous.level + 1) {
+                    report(element, `h${level} follows h${previous.level}`, "moderate");
+                }
+            });
+        },
+        "focus-order": (report, all) => all.filter(element => element.tabIndex > 0 && element.hasAttribute("tabindex"))
+            .forEach(element => report(element, `tabindex=${element.getAttribute("tabindex")} changes the tab order`, "serious")),
+        "color-contrast": (report, all) => all.forEach(element => {
+            const ownText = [...element.childNodes].some(node => node.nodeType === 3 && node.textContent.trim());
+            if (!ownText || !visible(element)) return;
+            const style = getComputedStyle(element);
+            const foreground = parseColor(style.color);
+            const behind = background(element);
+            if (!foreground || !behind) return;
+            const ratio = (first, second) => (Math.max(first, second) + 0.05) / (Math.min(first, second) + 0.05);
+            const contrast = ratio(luminance(blend(foreground, behind)), luminance(behind));
+            const size = parseFloat(style.fontSize);
+            const large = size >= 24 || (size >= 18.66 && Number(style.fontWeight) >= 700);
+            const required = large ? 3 : 4.5;
+            if (contrast < required) {
+                report(element, `contrast ${contrast.toFixed(2)}:1 is below ${required}:1`, "serious");
+            }
+        }),
+        "aria-roles": (report, all) => all.filter(element => element.hasAttribute("role"))
+            .forEach(element => {
+                const invalid = element.getAttribute("role").trim().split(/\s+/).filter(role => !ROLES.has(role));
+                if (invalid.length) report(element, `invalid role ${invalid.join(" ")}`, "critical");
+            }),
+        "aria-hidden-focus": (report, all) => all.filter(element => element.matches(FOCUSABLE)
+                && element.tabIndex >= 0 && element.closest("[aria-hidden=true]") && !element.disabled)
+            .forEach(element => report(element, "focusable element inside aria-hidden content", "serious")),
+    };
+
+    window.__a11yAudit = selected => {
+        const started = performance.now();
+        const all = [...document.querySelectorAll("body *")];
+        const headingElements = all.filter(element => /^H[1-6]$/.test(element.tagName) || element.getAttribute("role") === "heading");
+        const result = {
+            violations: [],
+            headings: headingElements.map(element => ({
+                level: /^H[1-6]$/.test(element.tagName)
+                    ? Number(element.tagName[1]) : Number(element.getAttribute("aria-level") || 2),
+                text: text(element).slice(0, 80),
+            })),
+            headingElements,
+        };
+        const focusable = all.filter(element => element.matches(FOCUSABLE) && element.tabIndex >= 0
+            && !element.disabled && visible(element));
+        // Positive tabindex first (ascending), then document order
+        result.focus_order = focusable
+            .map((element, index) => ({element, index}))
+            .sort((a, b) => ((a.element.tabIndex || Infinity) - (b.element.tabIndex || Infinity)) || (a.index - b.index))
+            .map(({element}) => selectorOf(element));
+        for (const name of selected) {
+            rules[name]((element, message, impact) => result.violations.push({
+                rule: name, selector: selectorOf(element), message, impact,
+            }), all, result);
+        }
+        delete result.headingElements;
+        result.elapsed_ms = performance.now() - started;
+        return result;
+    };
+})();
+"""
+
+RUN_SCRIPT = "rules => window.__a11yAudit ? window.__a11yAudit(rules) : null"
+
+INSTALL_AND_RUN_SCRIPT = "rules => {\n" + AUDIT_SOURCE + "\nreturn window.__a11yAudit(rules);\n}"
+
+
+def fingerprint(violation):
+    """Stable identity of a violation for baselines (the message may carry measured values)"""
+    return f"{violation['rule']} {violation['selector']}"
+
+
+class AuditResult:
+    """Violations, tab order and heading outline of one audit"""
+
+    def __init__(self, data, rules):
+        self.rules = tuple(rules)
+        self.violations = data["violations"]
+        self.focus_order = data["focus_order"]
+        self.headings = data["headings"]
+        self.elapsed_ms = data["elapsed_ms"]
+
+    def by_rule(self, rule):
+        return [violation for violation in self.violations if violation["rule"] == rule]
+
+    def new_violations(self, accepted):
+        accepted = set(accepted)
+        return [violation for violation in self.violations if fingerprint(violation) not in accepted]
+
+    def format(self, violations=None):
+        return "\n".join(
+            f"  [{violation['impact']}] {violation['rule']}: {violation['selector']} - {violation['message']}"
+            for violation in (self.violations if violations is None else violations)
+        )
+
+
+class AccessibilityAuditor:
+    """Runs the in-page rule set and compares it with per-page-object baselines"""
+
+    def __init__(self, rules=RULES, baseline_dir=BASELINE_DIR, update=False):
+        unknown = set(rules) - set(RULES)
+        if unknown:
+            raise ValueError(f"Unknown accessibility rules {sorted(unknown)}, expected {RULES}")
+        self.rules = tuple(rules)
+        self.baseline_dir = Path(baseline_dir)
+        self.update = update
+        self.audits = 0
+        self.installs = 0
+        self.audit_ms = 0.0
+        self._audited = weakref.WeakSet()
+        self._init_scripts = weakref.WeakSet()
+
+    def audit(self, page, rules=None):
+        """One evaluate: every selected rule over the current document"""
+        rules = tuple(rules or self.rules)
+        data = page.evaluate(RUN_SCRIPT, list(rules)) if page in self._audited else None
+        if data is None:
+            if page in self._audited and page not in self._init_scripts:
+                # The page navigated since its last audit: give its later documents the script up front
+                page.add_init_script(AUDIT_SOURCE)
+                self._init_scripts.add(page)
+            data = page.evaluate(INSTALL_AND_RUN_SCRIPT, list(rules))
+            self.installs += 1
+            self._audited.add(page)
+        self.audits += 1
+        self.audit_ms += data["elapsed_ms"]
+        return AuditResult(data, rules)
+
+    def _baseline_path(self, page_object):
+        return self.baseline_dir / f"{type(page_object).__name__}.json"
+
+    def accepted(self, page_object):
+        """Fingerprints of the accepted violations of this page object, or None without a baseline"""
+        try:
+            return json.loads(self._baseline_path(page_object).read_text())["accepted"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def check(self, page_object, rules=None):
+        """Fail on violations the page object's baseline does not accept"""
+        result = self.audit(page_object.page, rules)
+        accepted = self.accepted(page_object)
+        if self.update or accepted is None:
+            self._save(page_object, result, accepted or [])
+            if accepted is None and not self.update:
+                pytest.skip(f"Recorded accessibility baseline for {type(page_object).__name__} "
+                            f"({len(result.violations)} accepted violations)")
+            return result
+        new = result.new_violations(accepted)
+        assert not new, (
+            f"{type(page_object).__name__}: {len(new)} new accessibility violation(s)\n" + result.format(new)
+        )
+        return result
+
+    def _save(self, page_object, result, previous):
+        # Keep accepted violations of the rules this audit did not run
+        kept = [item for item in previous if item.split(" ", 1)[0] not in result.rules]
+        accepted = sorted(set(kept) | {fingerprint(violation) for violation in result.violations})
+        path = self._baseline_path(page_object)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({"recorded": time.time(), "accepted": accepted}, indent=1))
+
+    def stats(self):
+        return {"audits": self.audits, "script installs": self.installs, "audit ms": self.audit_ms}
@@ -0,0 +1,243 @@
+'''
+Pooled API client with concurrent batches
+
+What it does:
+
+One APIRequestContext per test session (the api_client fixture), so the
+connections to the API stay open between tests instead of a new context per test
+Every request is timed; summary() gives count, errors and p50/p95/p99 per
+endpoint ("GET /posts/{id}")
+batch() sends many requests at the same time through the async API: the sync
+Playwright owns the test thread, so a helper thread runs one event loop with
+its own async request context, kept for the whole session as well
+Optional schema validation of JSON bodies with a small JSON Schema subset:
+type, properties, required, additionalProperties (False), items, enum, minimum, maximum
+With record=True every request/response pair is kept in traffic, ready for
+utils.mock_engine.MockEngine.learn_traffic()
+
+Example:
+
+results = api_client.batch([("GET", f"/posts/{i}") for i in range(1, 51)], schema=POST_SCHEMA)
+assert all(result.ok for result in results)
+'''
+
+import asyncio
+import re
+import threading
+import time
+from urllib.parse import urlsplit
+
+from playwright.async_api import async_playwright
+
+from utils.load import LatencyStats
+
+# Numeric path segments, grouped into one endpoint in the stats
+ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+JSON_TYPES = {
+    "object": dict, "array": list, "string": str, "boolean": bool,
+    "integer": int, "number": (int, float), "null": type(None),
+}
+
+
+def schema_errors(value, schema, path="$"):
+    """List of "path: problem" strings; empty when value matches the schema"""
+    errors = []
+    expected = schema.get("type")
+    if expected is not None:
+        types = expected if isinstance(expected, list) else [expected]
+        # bool is an int in Python but not in JSON
+        if isinstance(value, bool) and not {"boolean"} & set(types):
+            return [f"{path}: expected {expected}, got boolean"]
+        if not any(isinstance(value, JSON_TYPES[name]) for name in types):
+            return [f"{path}: expected {expected}, got {type(value).__name__}"]
+    if "enum" in schema and value not in schema["enum"]:
+        errors.append(f"{path}: {value!r} not in {schema['enum']}")
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        if "minimum" in schema and value < schema["minimum"]:
+            errors.append(f"{path}: {value} < minimum {schema['minimum']}")
+        if "maximum" in schema and value > schema["maximum"]:
+            errors.append(f"{path}: {value} > maximum {schema['maximum']}")
+    if isinstance(value, dict):
+        properties = schema.get("properties", {})
+        for name in schema.get("required", ()):
+            if name not in value:
+                errors.append(f"{path}.{name}: missing")
+        for name, item in value.items():
+            if name in properties:
+                errors.extend(schema_errors(item, properties[name], f"{path}.{name}"))
+            elif schema.get("additionalProperties") is False:
+                errors.append(f"{path}.{name}: not allowed")
+    if isinstance(value, list) and "items" in schema:
+        for index, item in enumerate(value):
+            errors.extend(schema_errors(item, schema["items"], f"{path}[{index}]"))
+    return errors
+
+
+def endpoint_name(method, url):
+    """"GET /posts/1?userId=2" -> "GET /posts/{id}" (groups the latency stats)"""
+    path = urlsplit(url).path or "/"
+    return f"{method.upper()} {ID_SEGMENT.sub('/{id}', path)}"
+
+
+class ApiResult:
+    """One request of a batch"""
+
+    def __init__(self, method, url, status=None, body=None, elapsed_ms=0.0, error=None, schema_errors=()):
+        self.method = method
+        self.url = url
+        self.status = status
+        self.body = body
+        self.elapsed_ms = elapsed_ms
+        self.error = error
+        self.schema_errors = list(schema_errors)
+
+    @property
+    def ok(self):
+        return self.error is None and self.status is not None and self.status < 400 and not self.schema_errors
+
+    def __repr__(self):
+        state = f"error={self.error!r}" if self.error else f"{self.status}"
+        return f"<ApiResult {self.method} {self.url} {state} {self.elapsed_ms:.1f}ms>"
+
+
+def _request_spec(request):
+    """("GET", "/posts/1"), ("POST", "/posts", {"data": ...}) or a dict -> (method, url, options)"""
+    if isinstance(request, dict):
+        options = dict(request)
+        return options.pop("method", "GET").upper(), options.pop("url"), options
+    method, url, *rest = request
+    return method.upper(), url, dict(rest[0]) if rest else {}
+
+
+class ApiClient:
+    """Session-long API request context with timing, batches and schema checks"""
+
+    def __init__(self, playwright, base_url, extra_http_headers=None, timeout=30000, record=False):
+        self.base_url = base_url
+        self.record = record
+        self.traffic = []
+        self._context_options = {
+            "base_url": base_url,
+            "extra_http_headers": extra_http_headers or {},
+            "timeout": timeout,
+        }
+        self.request_context = playwright.request.new_context(**self._context_options)
+        self.stats = LatencyStats()
+        self._loop = None
+        self._thread = None
+        self._async_playwright = None
+        self._async_request = None
+
+    def request(self, method, url, schema=None, **options):
+        """Send one request (fetch options: data, params, headers, ...); checks the JSON body against schema"""
+        started = time.perf_counter()
+        response = None
+        try:
+            response = self.request_context.fetch(url, method=method.upper(), **options)
+            if self.record:
+                self._remember(method, url, options, response.status, response.headers, response.body(),
+                               time.perf_counter() - started)
+            return response
+        finally:
+            ok = response is not None and response.status < 400
+            self.stats.record("request", endpoint_name(method, url), time.perf_counter() - started, ok)
+            if response is not None and schema is not None:
+                errors = schema_errors(response.json(), schema)
+                assert not errors, f"{method.upper()} {url} does not match the schema: " + "; ".join(errors)
+
+    def get(self, url, **options):
+        return self.request("GET", url, **options)
+
+    def post(self, url, **options):
+        return self.request("POST", url, **options)
+
+    def put(self, url, **options):
+        return self.request("PUT", url, **options)
+
+    def patch(self, url, **options):
+        return self.request("PATCH", url, **options)
+
+    def delete(self, url, **options):
+        return self.request("DELETE", url, **options)
+
+    def batch(self, requests, concurrency=10, schema=None, timeout=120):
+        """Send all requests concurrently (at most concurrency in flight); ApiResults in request order
+
+        A request may carry its own "schema" option, which wins over the batch-wide schema.
+        """
+        specs = [_request_spec(request) for request in requests]
+        return self._run(self._batch(specs, concurrency, schema), timeout)
+
+    async def _batch(self, specs, concurrency, schema):
+        context = await self._async_context()
+        limit = asyncio.Semaphore(concurrency)
+
+        async def one(method, url, options):
+            request_schema = options.pop("schema", schema)
+            async with limit:
+                started = time.perf_counter()
+                result = ApiResult(method, url)
+                try:
+                    response = await context.fetch(url, method=method, **options)
+                    result.status = response.status
+                    body = await response.body()
+                    if body:
+                        result.body = await response.json()
+                    if self.record:
+                        self._remember(method, url, options, response.status, response.headers, body,
+                                       time.perf_counter() - started)
+                except Exception as error:
+                    result.error = str(error).splitlines()[0]
+                result.elapsed_ms = (time.perf_counter() - started) * 1000
+            if request_schema is not None and result.error is None:
+                result.schema_errors = schema_errors(result.body, request_schema)
+            self.stats.record("request", endpoint_name(method, url), result.elapsed_ms / 1000, result.ok)
+            return result
+
+        return await asyncio.gather(*(one(*spec) for spec in specs))
+
+    def _remember(self, method, url, options, status, headers, body, seconds):
+        self.traffic.append({
+            "method": method.upper(),
+            "url": url,
+            "request_body": options.get("data"),
+            "status": status,
+            "headers": dict(headers),
+            "body": body.decode("utf-8", errors="replace"),
+            "elapsed_ms": round(seconds * 1000, 1),
+        })
+
+    async def _async_context(self):
+        if self._async_request is None:
+            self._async_playwright = await async_playwright().start()
+            self._async_request = await self._async_playwright.request.new_context(**self._context_options)
+        return self._async_request
+
+    def _run(self, coroutine, timeout):
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self._loop.run_forever, name="api-client", daemon=True)
+            self._thread.start()
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result(timeout)
+
+    def summary(self):
+        """endpoint -> count, errors and latency percentiles in ms"""
+        return self.stats.summary().get("request", {})
+
+    def close(self):
+        self.request_context.dispose()
+        if self._loop is None:
+            return
+        if self._async_request is not None:
+            self._run(self._close_async(), timeout=30)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(10)
+        self._loop.close()
+        self._loop = None
+
+    async def _close_async(self):
+        await self._async_request.dispose()
+        await self._async_playwright.stop()
+        self._async_request = None
+        self._async_playwright = None
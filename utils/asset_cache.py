@@ -0,0 +1,234 @@
+'''
+Shared on-disk cache for static assets
+
+What it does:
+
+Answers script, stylesheet, image, font and media GET requests of a context
+from .asset-cache/, so a new context (or another xdist worker) does not download
+the same bundle, CSS and images again; documents, XHR and fetch calls always
+go to the origin
+Bodies are stored once per content hash (blobs/<sha256>); index.json maps
+URL -> hash, headers and freshness and is only changed under a lock file,
+so all workers share one directory
+Cache-Control is respected: no-store is never cached, max-age / immutable are
+served without asking the origin, anything else is revalidated with
+If-None-Match / If-Modified-Since (a 304 reuses the stored body)
+Least recently used entries are evicted beyond max_bytes (default 200 MB)
+
+Turn it on with --asset-cache (or PlaywrightConfig.ASSET_CACHE = True).
+'''
+
+import hashlib
+import json
+import os
+import re
+import time
+from pathlib import Path
+
+CACHE_DIR = Path(".asset-cache")
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+CACHEABLE_TYPES = ("script", "stylesheet", "image", "font", "media")
+
+# The stored body is decoded, so these would no longer match it
+DROPPED_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+
+
+class FileLock:
+    """Cross-process lock with an exclusively created file (works on every OS)"""
+
+    def __init__(self, path, timeout=30, stale_after=60):
+        self.path = Path(path)
+        self.timeout = timeout
+        self.stale_after = stale_after
+
+    def __enter__(self):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                os.close(os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                return self
+            except FileExistsError:
+                try:
+                    # A crashed worker must not block everyone forever
+                    if time.time() - self.path.stat().st_mtime > self.stale_after:
+                        self.path.unlink(missing_ok=True)
+                        continue
+                except FileNotFoundError:
+                    continue
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Could not lock {self.path}")
+                time.sleep(0.01)
+
+    def __exit__(self, *exc_info):
+        self.path.unlink(missing_ok=True)
+
+
+def freshness(headers):
+    """(store, max_age) from the Cache-Control header; max_age None means revalidate"""
+    cache_control = headers.get("cache-control", "").lower()
+    if "no-store" in cache_control or "private" in cache_control:
+        return False, None
+    if "no-cache" in cache_control:
+        return True, None
+    if "immutable" in cache_control:
+        return True, 365 * 24 * 3600
+    match = re.search(r"max-age=(\d+)", cache_control)
+    return True, int(match.group(1)) if match else None
+
+
+class AssetCache:
+    """Content-addressed asset cache shared by contexts and workers"""
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.blobs = self.directory / "blobs"
+        self.blobs.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.directory / "index.json"
+        self.lock = FileLock(self.directory / "lock")
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.stored = 0
+        self.evicted = 0
+        self._index = {}
+        self._index_mtime = None
+        self._used = {}
+
+    def attach(self, context):
+        context.route("**/*", self._handle)
+        return context
+
+    def _handle(self, route):
+        request = route.request
+        if request.method != "GET" or request.resource_type not in CACHEABLE_TYPES:
+            route.fallback()
+            return
+        entry = self._lookup(request.url)
+        if entry is not None and self._is_fresh(entry):
+            self.hits += 1
+            self._serve(route, entry)
+            return
+
+        headers = dict(request.headers)
+        if entry is not None:
+            if entry.get("etag"):
+                headers["if-none-match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["if-modified-since"] = entry["last_modified"]
+        response = route.fetch(headers=headers)
+        if response.status == 304 and entry is not None:
+            self.revalidated += 1
+            entry["stored_at"] = time.time()
+            self._store_entry(request.url, entry)
+            self._serve(route, entry)
+            return
+        self.misses += 1
+        self._store_response(request.url, response)
+        route.fulfill(response=response)
+
+    def _is_fresh(self, entry):
+        return entry["max_age"] is not None and time.time() - entry["stored_at"] < entry["max_age"]
+
+    def _serve(self, route, entry):
+        blob = self.blobs / entry["sha256"]
+        try:
+            body = blob.read_bytes()
+        except FileNotFoundError:
+            # Evicted by another worker in the meantime
+            route.fallback()
+            return
+        self._used[route.request.url] = time.time()
+        route.fulfill(status=entry["status"], headers=entry["headers"], body=body)
+
+    def _store_response(self, url, response):
+        store, max_age = freshness(response.headers)
+        if not store or response.status != 200:
+            return
+        body = response.body()
+        digest = hashlib.sha256(body).hexdigest()
+        blob = self.blobs / digest
+        if not blob.exists():
+            tmp_path = blob.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_bytes(body)
+            os.replace(tmp_path, blob)
+        headers = {name: value for name, value in response.headers.items() if name not in DROPPED_HEADERS}
+        self.stored += 1
+        self._store_entry(url, {
+            "sha256": digest,
+            "size": len(body),
+            "status": response.status,
+            "headers": headers,
+            "etag": response.headers.get("etag"),
+            "last_modified": response.headers.get("last-modified"),
+            "max_age": max_age,
+            "stored_at": time.time(),
+            "last_used": time.time(),
+        })
+
+    def _lookup(self, url):
+        try:
+            mtime = self.index_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+        if mtime != self._index_mtime:
+            self._index = self._read_index()
+            self._index_mtime = mtime
+        return self._index.get(url)
+
+    def _read_index(self):
+        try:
+            return json.loads(self.index_path.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def _store_entry(self, url, entry):
+        with self.lock:
+            index = self._read_index()
+            index[url] = entry
+            self._write_index(index)
+
+    def _write_index(self, index):
+        self._apply_usage(index)
+        self._evict(index)
+        tmp_path = self.index_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(index))
+        os.replace(tmp_path, self.index_path)
+        self._index = index
+        self._index_mtime = self.index_path.stat().st_mtime_ns
+
+    def _apply_usage(self, index):
+        for url, used in self._used.items():
+            if url in index:
+                index[url]["last_used"] = max(index[url]["last_used"], used)
+        self._used = {}
+
+    def _evict(self, index):
+        """Drop least recently used entries until the unique blobs fit in max_bytes"""
+        sizes = {entry["sha256"]: entry["size"] for entry in index.values()}
+        total = sum(sizes.values())
+        for url in sorted(index, key=lambda url: index[url]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            digest = index.pop(url)["sha256"]
+            self.evicted += 1
+            if all(entry["sha256"] != digest for entry in index.values()):
+                total -= sizes[digest]
+                (self.blobs / digest).unlink(missing_ok=True)
+
+    def close(self):
+        """Write the last-used times of this process so LRU eviction sees them"""
+        if not self._used:
+            return
+        with self.lock:
+            self._write_index(self._read_index())
+
+    def stats(self):
+        """Counters for session_stats (the summary derives the hit rate from hits and misses)"""
+        return {
+            "hits": self.hits + self.revalidated,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+            "stored": self.stored,
+            "evicted": self.evicted,
+        }
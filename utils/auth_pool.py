@@ -0,0 +1,118 @@
+'''
+Authenticated storage-state pool
+
+What it does:
+
+Logs in once per user type (per worker) with the same steps as save_auth.py,
+but in-process on the already running browser instead of a headed one
+Keeps the resulting storage_state in memory and in .auth/<host>/ on disk
+Entries expire after a TTL, when a session cookie runs out, or on invalidate()
+Hands out pre-authenticated contexts, or authenticates an existing one
+'''
+
+import json
+import os
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from save_auth import capture_authentication_state
+
+DEFAULT_PASSWORD = "secret_sauce"
+
+
+class AuthStatePool:
+    """Cache of logged-in storage states keyed by username"""
+
+    def __init__(self, browser, base_url="https://www.saucedemo.com", cache_dir=".auth", ttl=300):
+        self.browser = browser
+        self.base_url = base_url
+        self.cache_dir = Path(cache_dir) / urlsplit(base_url).netloc.replace(":", "_")
+        self.ttl = ttl
+        self._states = {}
+        self.logins = 0
+
+    def get_state(self, username, password=DEFAULT_PASSWORD):
+        """Return a storage_state dict for the user, logging in only when needed"""
+        entry = self._states.get(username)
+        if entry is None or not self._is_fresh(entry):
+            entry = self._load_from_disk(username)
+        if entry is None or not self._is_fresh(entry):
+            entry = self._login(username, password)
+        self._states[username] = entry
+        return entry["state"]
+
+    def new_context(self, username="standard_user", password=DEFAULT_PASSWORD, **context_options):
+        """Create a browser context that starts logged in"""
+        return self.browser.new_context(
+            storage_state=self.get_state(username, password), **context_options
+        )
+
+    def authenticate(self, context, username="standard_user", password=DEFAULT_PASSWORD):
+        """Load the cached login into an existing context
+
+        localStorage goes in through init scripts, which a ContextPool cannot undo: pooled
+        contexts should get the state at creation instead (storage_state=get_state(username))
+        """
+        state = self.get_state(username, password)
+        if state["cookies"]:
+            context.add_cookies(state["cookies"])
+        for origin in state.get("origins", []):
+            context.add_init_script(_local_storage_script(origin))
+
+    def invalidate(self, username=None):
+        """Drop one cached login (or all of them) from memory and disk"""
+        usernames = [username] if username else list(self._states)
+        if username is None and self.cache_dir.exists():
+            usernames += [path.stem for path in self.cache_dir.glob("*.json")]
+        for name in set(usernames):
+            self._states.pop(name, None)
+            self._path(name).unlink(missing_ok=True)
+
+    def _login(self, username, password):
+        state = capture_authentication_state(self.browser, username, password, base_url=self.base_url)
+        self.logins += 1
+        entry = {"created": time.time(), "state": state}
+        self._save_to_disk(username, entry)
+        return entry
+
+    def _is_fresh(self, entry):
+        now = time.time()
+        if now - entry["created"] > self.ttl:
+            return False
+        # Session cookies report expires == -1
+        return all(
+            cookie.get("expires", -1) < 0 or cookie["expires"] > now + 5
+            for cookie in entry["state"].get("cookies", [])
+        )
+
+    def _path(self, username):
+        return self.cache_dir / f"{username}.json"
+
+    def _load_from_disk(self, username):
+        try:
+            return json.loads(self._path(username).read_text())
+        except (OSError, ValueError):
+            return None
+
+    def _save_to_disk(self, username, entry):
+        # Write to a temp file and swap it in so parallel workers never read half a file
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._path(username).with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(entry))
+        os.replace(tmp_path, self._path(username))
+
+
+def _local_storage_script(origin):
+    """Init script that restores localStorage entries without clobbering later writes"""
+    items = {item["name"]: item["value"] for item in origin.get("localStorage", [])}
+    return f"""
+        if (window.location.origin === {json.dumps(origin["origin"])}) {{
+            const items = {json.dumps(items)};
+            for (const [name, value] of Object.entries(items)) {{
+                if (window.localStorage.getItem(name) === null) {{
+                    window.localStorage.setItem(name, value);
+                }}
+            }}
+        }}
+    """
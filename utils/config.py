@@ -0,0 +1,20 @@
+'''
+Loads PlaywrightConfig from playwright.config.py
+
+The file keeps the TypeScript-style name, which is not importable with a
+plain import statement, so it is loaded once here by path.
+
+Use it anywhere:
+from utils.config import PlaywrightConfig
+'''
+
+import importlib.util
+from pathlib import Path
+
+CONFIG_PATH = Path(__file__).resolve().parent.parent / "playwright.config.py"
+
+_spec = importlib.util.spec_from_file_location("playwright_config", CONFIG_PATH)
+_module = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_module)
+
+PlaywrightConfig = _module.PlaywrightConfig
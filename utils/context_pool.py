@@ -0,0 +1,190 @@
+'''
+Browser context recycling pool
+
+What it does:
+
+Keeps idle BrowserContexts keyed by the options they were created with
+(PlaywrightConfig.get_browser_context_options(), device descriptors, storage_state)
+Resets a returned context: closes pages, clears cookies, storage, permissions and routes
+Verifies the reset and falls back to closing and recreating the context
+Strict isolation turns pooling off (a new context for every acquire)
+Counts hits, misses and recreations so the saved churn can be measured
+'''
+
+import json
+
+# Options that bind a context to one test's artifacts, so it is never reused
+UNPOOLABLE_OPTIONS = ("record_video_dir", "record_har_path")
+
+# Context methods whose effects cannot be undone; calling one marks the context dirty
+TAINTING_METHODS = (
+    "add_init_script", "expose_binding", "expose_function", "on", "once", "route_from_har",
+)
+
+BLANK_PAGE = "<!doctype html><html><head></head><body></body></html>"
+
+CLEAR_STORAGE_SCRIPT = """async () => {
+    localStorage.clear();
+    sessionStorage.clear();
+    if (indexedDB.databases) {
+        for (const db of await indexedDB.databases()) {
+            indexedDB.deleteDatabase(db.name);
+        }
+    }
+}"""
+
+
+class ContextPool:
+    """Hands out reusable browser contexts keyed by their options"""
+
+    def __init__(self, browser, strict_isolation=False, max_idle_per_key=2):
+        self.browser = browser
+        self.strict_isolation = strict_isolation
+        self.max_idle_per_key = max_idle_per_key
+        self.hits = 0
+        self.misses = 0
+        self.recreated = 0
+        self._idle = {}
+        self._leased = {}
+
+    def acquire(self, fresh=False, **options):
+        """Return a clean context for these options, reusing an idle one when possible"""
+        key = self._key(options)
+        idle = self._idle.get(key)
+        if idle and not (fresh or self.strict_isolation):
+            context = idle.pop()
+            self.hits += 1
+        else:
+            context = self.browser.new_context(**options)
+            context.on("page", lambda page: self._on_page(context, page))
+            self.misses += 1
+        self._leased[id(context)] = _Lease(context, key, options)
+        self._watch(context)
+        return context
+
+    def release(self, context):
+        """Give a context back; it is reset for the next test or closed"""
+        lease = self._leased.pop(id(context))
+        if lease.key is None or self.strict_isolation or lease.tainted:
+            context.close()
+            return
+        if len(self._idle.get(lease.key, [])) >= self.max_idle_per_key:
+            context.close()
+            return
+        try:
+            verified = self._reset(lease)
+        except Exception:
+            verified = False
+        if not verified:
+            self.recreated += 1
+            context.close()
+            return
+        self._idle.setdefault(lease.key, []).append(context)
+
+    def close(self):
+        """Close every idle context"""
+        for contexts in self._idle.values():
+            for context in contexts:
+                context.close()
+        self._idle.clear()
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "recreated": self.recreated}
+
+    def _key(self, options):
+        if any(options.get(name) for name in UNPOOLABLE_OPTIONS):
+            return None
+        return json.dumps(options, sort_keys=True, default=str)
+
+    def _on_page(self, context, page):
+        """Record the origins a leased context visits so the reset can clear their storage"""
+        lease = self._leased.get(id(context))
+        if lease is not None:
+            page.on("framenavigated", lambda frame: lease.visit(frame.url))
+
+    def _watch(self, context):
+        """Flag calls whose effects a reset cannot undo"""
+        lease = self._leased[id(context)]
+        for name in TAINTING_METHODS:
+            original = getattr(type(context), name)
+
+            def tainting(*args, _original=original, **kwargs):
+                lease.tainted = True
+                return _original(context, *args, **kwargs)
+
+            setattr(context, name, tainting)
+
+    def _reset(self, lease):
+        context = lease.context
+        for page in context.pages:
+            page.close()
+        context.unroute_all(behavior="ignoreErrors")
+        context.clear_cookies()
+        context.clear_permissions()
+        context.set_extra_http_headers(lease.options.get("extra_http_headers", {}))
+        context.set_offline(lease.options.get("offline", False))
+        if lease.options.get("permissions"):
+            context.grant_permissions(lease.options["permissions"])
+        if lease.options.get("geolocation"):
+            context.set_geolocation(lease.options["geolocation"])
+
+        initial_state = _initial_storage_state(lease.options.get("storage_state"))
+        if initial_state.get("cookies"):
+            context.add_cookies(initial_state["cookies"])
+        initial_storage = {
+            origin["origin"]: origin.get("localStorage", [])
+            for origin in initial_state.get("origins", [])
+        }
+        if not self._clear_origins(context, lease.origins | set(initial_storage), initial_storage):
+            return False
+
+        for name in TAINTING_METHODS:
+            delattr(context, name)
+        return len(context.cookies()) == len(initial_state.get("cookies", []))
+
+    def _clear_origins(self, context, origins, initial_storage):
+        """Wipe storage on every visited origin, restore the initial state and verify it"""
+        if not origins:
+            return True
+        page = context.new_page()
+        # Serve a blank document for each origin instead of hitting the network
+        page.route("**/*", lambda route: route.fulfill(body=BLANK_PAGE, content_type="text/html"))
+        try:
+            for origin in origins:
+                page.goto(origin)
+                page.evaluate(CLEAR_STORAGE_SCRIPT)
+                items = initial_storage.get(origin, [])
+                for item in items:
+                    page.evaluate("([name, value]) => localStorage.setItem(name, value)",
+                                  [item["name"], item["value"]])
+                remaining = page.evaluate("localStorage.length + sessionStorage.length")
+                if remaining != len(items):
+                    return False
+        finally:
+            page.close()
+        return True
+
+
+class _Lease:
+    """Book-keeping for a context while a test holds it"""
+
+    def __init__(self, context, key, options):
+        self.context = context
+        self.key = key
+        self.options = options
+        self.origins = set()
+        self.tainted = False
+
+    def visit(self, url):
+        if url.startswith(("http://", "https://")):
+            scheme, _, rest = url.partition("://")
+            self.origins.add(f"{scheme}://{rest.split('/', 1)[0]}")
+
+
+def _initial_storage_state(storage_state):
+    if not storage_state:
+        return {}
+    if isinstance(storage_state, dict):
+        return storage_state
+    with open(storage_state) as state_file:
+        return json.load(state_file)
@@ -0,0 +1,109 @@
+'''
+Device matrix for the mobile tests
+
+What it does:
+
+device_matrix() turns device names and browser engines into test parameters:
+"iPhone 12", "Pixel 5" x ("chromium", "webkit"), or each device on its own
+default engine (WebKit for iPhones and iPads, Chromium for Android) when no
+engines are given
+DeviceBrowsers launches at most ONE browser per engine per worker and hands out
+pooled contexts built from the Playwright device descriptor, so 20 devices on
+one engine cost one launch per worker, not 20
+The tests are parametrized over "device" (the pytest-playwright name), so the
+shape scheduler (utils/xdist_scheduling.py) sends each device to a worker of its own
+
+Use it in a test:
+
+@pytest.mark.devices("iPhone 12", "Pixel 5", engines=("chromium", "webkit"))
+def test_login(self, device_page, device):
+    ...
+
+Without the marker the tests run on PlaywrightConfig.DEVICES / DEVICE_ENGINES.
+'''
+
+from utils.context_pool import ContextPool
+
+BROWSER_ENGINES = ("chromium", "firefox", "webkit")
+DEFAULT_ENGINE = "default"
+
+# Firefox cannot emulate a mobile viewport (is_mobile is Chromium / WebKit only)
+FIREFOX_UNSUPPORTED = ("is_mobile",)
+
+
+def _names(value):
+    if isinstance(value, str):
+        return [part.strip() for part in value.split(",") if part.strip()]
+    return list(value or ())
+
+
+def device_matrix(devices, engines=None):
+    """[(device, engine), ...]; engine "default" means the device's own browser"""
+    engines = _names(engines) or [DEFAULT_ENGINE]
+    unknown = set(engines) - set(BROWSER_ENGINES) - {DEFAULT_ENGINE}
+    if unknown:
+        raise ValueError(f"Unknown browser engines {sorted(unknown)}, expected {BROWSER_ENGINES}")
+    return [(device, engine) for device in _names(devices) for engine in engines]
+
+
+def matrix_id(device, engine):
+    return device if engine == DEFAULT_ENGINE else f"{device}-{engine}"
+
+
+class DeviceBrowsers:
+    """One lazily launched browser and context pool per engine"""
+
+    def __init__(self, playwright, launch_options=None):
+        self.playwright = playwright
+        self.launch_options = launch_options or {}
+        self.launches = 0
+        self._browsers = {}
+        self._pools = {}
+
+    def descriptor(self, device):
+        try:
+            return dict(self.playwright.devices[device])
+        except KeyError:
+            raise ValueError(f"Unknown device {device!r}; see playwright.devices") from None
+
+    def engine_for(self, device, engine=DEFAULT_ENGINE):
+        if engine == DEFAULT_ENGINE:
+            return self.descriptor(device)["default_browser_type"]
+        return engine
+
+    def pool(self, engine):
+        if engine not in self._pools:
+            browser = getattr(self.playwright, engine).launch(**self.launch_options)
+            self.launches += 1
+            self._browsers[engine] = browser
+            self._pools[engine] = ContextPool(browser)
+        return self._pools[engine]
+
+    def acquire(self, device, engine=DEFAULT_ENGINE, **context_options):
+        """(context, engine) for the device from the engine's shared browser; the descriptor wins over context_options"""
+        engine = self.engine_for(device, engine)
+        options = self.descriptor(device)
+        options.pop("default_browser_type", None)
+        if engine == "firefox":
+            for name in FIREFOX_UNSUPPORTED:
+                options.pop(name, None)
+        context = self.pool(engine).acquire(**{**context_options, **options})
+        return context, engine
+
+    def release(self, context, engine):
+        self._pools[engine].release(context)
+
+    def close(self):
+        for pool in self._pools.values():
+            pool.close()
+        for browser in self._browsers.values():
+            browser.close()
+        self._pools.clear()
+        self._browsers.clear()
+
+    def stats(self):
+        counters = {"browser launches": self.launches}
+        for pool in self._pools.values():
+            for name, value in pool.stats().items():
+                counters[f"context {name}"] = counters.get(f"context {name}", 0) + value
+        return counters
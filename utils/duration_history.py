@@ -0,0 +1,308 @@
+'''
+Persistent duration history
+
+What it does:
+
+Times setup, call and teardown of every test, and the setup/teardown of every
+fixture it triggers (login, context creation, tracing, ...)
+Appends the numbers to a local SQLite file (.test-history/durations.sqlite),
+one run per pytest session, shared safely by xdist workers
+Prints the slowest tests with their fixture breakdown and every test or fixture
+that got slower than its rolling median of the previous runs
+
+Options:
+--history-db PATH         where the SQLite file lives
+--no-history              do not record or report
+--history-window N        how many previous runs the median covers (default 10)
+--history-threshold X     report when slower than median * (1 + X) (default 0.5)
+--history-slowest N       how many slow tests to list (default 5)
+
+The same data feeds the --dist-by-shape scheduler (DurationStore.median_durations).
+'''
+
+import sqlite3
+import statistics
+import time
+import uuid
+from pathlib import Path
+
+import pytest
+
+from utils.nodeids import base_nodeid
+
+DEFAULT_DB_PATH = ".test-history/durations.sqlite"
+
+# Ignore differences too small to matter, whatever the ratio
+MIN_REGRESSION_SECONDS = 0.05
+
+# Fixture uses cheaper than this are not stored (pytestconfig, page object factories, ...)
+MIN_FIXTURE_SECONDS = 0.001
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_uid TEXT PRIMARY KEY,
+    started REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tests (
+    run_uid TEXT NOT NULL,
+    nodeid TEXT NOT NULL,
+    setup REAL NOT NULL,
+    call REAL NOT NULL,
+    teardown REAL NOT NULL,
+    outcome TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS fixtures (
+    run_uid TEXT NOT NULL,
+    nodeid TEXT NOT NULL,
+    fixture TEXT NOT NULL,
+    setup REAL NOT NULL,
+    teardown REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tests_by_nodeid ON tests (nodeid, run_uid);
+CREATE INDEX IF NOT EXISTS fixtures_by_run ON fixtures (run_uid);
+"""
+
+
+class DurationStore:
+    """SQLite file with one row per test and per fixture use, grouped by run"""
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(self.path, timeout=30)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def start_run(self, run_uid):
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR IGNORE INTO runs (run_uid, started) VALUES (?, ?)", (run_uid, time.time())
+            )
+
+    def add_tests(self, run_uid, rows):
+        """rows: (nodeid, setup, call, teardown, outcome)"""
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO tests VALUES (?, ?, ?, ?, ?, ?)", [(run_uid, *row) for row in rows]
+            )
+
+    def add_fixtures(self, run_uid, rows):
+        """rows: (nodeid, fixture, setup, teardown)"""
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO fixtures VALUES (?, ?, ?, ?, ?)", [(run_uid, *row) for row in rows]
+            )
+
+    def previous_runs(self, run_uid, window):
+        """Latest run ids, newest first, leaving out run_uid"""
+        rows = self.connection.execute(
+            "SELECT run_uid FROM runs WHERE run_uid IS NOT ? ORDER BY started DESC LIMIT ?", (run_uid, window)
+        )
+        return [row[0] for row in rows]
+
+    def test_totals(self, run_uids):
+        """nodeid -> list of setup + call + teardown, one per run"""
+        totals = {}
+        if not run_uids:
+            return totals
+        rows = self.connection.execute(
+            f"SELECT nodeid, setup + call + teardown FROM tests "
+            f"WHERE run_uid IN ({','.join('?' * len(run_uids))})", run_uids
+        )
+        for nodeid, total in rows:
+            totals.setdefault(nodeid, []).append(total)
+        return totals
+
+    def fixture_totals(self, run_uids):
+        """fixture name -> list of summed setup + teardown, one per run"""
+        totals = {}
+        if not run_uids:
+            return totals
+        rows = self.connection.execute(
+            f"SELECT run_uid, fixture, SUM(setup + teardown) FROM fixtures "
+            f"WHERE run_uid IN ({','.join('?' * len(run_uids))}) GROUP BY run_uid, fixture", run_uids
+        )
+        for _, fixture, total in rows:
+            totals.setdefault(fixture, []).append(total)
+        return totals
+
+    def median_durations(self, window=10):
+        """nodeid -> median total duration over the latest runs (used for scheduling)"""
+        return {
+            nodeid: statistics.median(values)
+            for nodeid, values in self.test_totals(self.previous_runs(None, window)).items()
+        }
+
+    def slowest(self, run_uid, limit):
+        """Slowest tests of a run with their three phases and most expensive fixtures"""
+        tests = self.connection.execute(
+            "SELECT nodeid, setup, call, teardown FROM tests WHERE run_uid = ? "
+            "ORDER BY setup + call + teardown DESC LIMIT ?", (run_uid, limit)
+        ).fetchall()
+        result = []
+        for nodeid, setup, call, teardown in tests:
+            fixtures = self.connection.execute(
+                "SELECT fixture, setup + teardown FROM fixtures WHERE run_uid = ? AND nodeid = ? "
+                "ORDER BY setup + teardown DESC LIMIT 3", (run_uid, nodeid)
+            ).fetchall()
+            result.append((nodeid, setup, call, teardown, fixtures))
+        return result
+
+    def regressions(self, run_uid, window=10, threshold=0.5):
+        """Tests and fixtures slower than median * (1 + threshold) of the previous runs"""
+        history = self.previous_runs(run_uid, window)
+        found = []
+        for kind, current, previous in (
+            ("test", self.test_totals([run_uid]), self.test_totals(history)),
+            ("fixture", self.fixture_totals([run_uid]), self.fixture_totals(history)),
+        ):
+            for name, values in current.items():
+                if not previous.get(name):
+                    continue
+                median = statistics.median(previous[name])
+                latest = values[0] if kind == "fixture" else max(values)
+                if latest > median * (1 + threshold) and latest - median > MIN_REGRESSION_SECONDS:
+                    found.append((kind, name, latest, median))
+        return sorted(found, key=lambda entry: entry[2] - entry[3], reverse=True)
+
+
+class DurationRecorder:
+    """Collects timings in the process that runs the tests and flushes them at the end"""
+
+    def __init__(self, config, run_uid):
+        self.config = config
+        self.run_uid = run_uid
+        self.tests = []
+        self.fixtures = {}
+        self._phases = {}
+        self._current = None
+        self._teardown_started = {}
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item):
+        self._current = base_nodeid(item.nodeid)
+        self._phases = {"setup": 0.0, "call": 0.0, "teardown": 0.0, "outcome": "passed"}
+        yield
+        phases = self._phases
+        self.tests.append((self._current, phases["setup"], phases["call"], phases["teardown"], phases["outcome"]))
+        self._current = None
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        report = outcome.get_result()
+        self._phases[report.when] = report.duration
+        if report.failed:
+            self._phases["outcome"] = "failed"
+        elif report.skipped and self._phases["outcome"] == "passed":
+            self._phases["outcome"] = "skipped"
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_fixture_setup(self, fixturedef, request):
+        started = time.perf_counter()
+        yield
+        if self._current is None:
+            return
+        self._add_fixture(fixturedef.argname, setup=time.perf_counter() - started)
+        # Finalizers run last-in first-out, so this one fires right before the fixture's own teardown
+        key = id(fixturedef)
+        fixturedef.addfinalizer(lambda: self._teardown_started.__setitem__(key, time.perf_counter()))
+
+    @pytest.hookimpl
+    def pytest_fixture_post_finalizer(self, fixturedef, request):
+        started = self._teardown_started.pop(id(fixturedef), None)
+        if started is not None and self._current is not None:
+            self._add_fixture(fixturedef.argname, teardown=time.perf_counter() - started)
+
+    def _add_fixture(self, name, setup=0.0, teardown=0.0):
+        totals = self.fixtures.setdefault((self._current, name), [0.0, 0.0])
+        totals[0] += setup
+        totals[1] += teardown
+
+    @pytest.hookimpl
+    def pytest_sessionfinish(self, session):
+        store = DurationStore(self.config.getoption("history_db"))
+        try:
+            store.start_run(self.run_uid)
+            store.add_tests(self.run_uid, self.tests)
+            store.add_fixtures(self.run_uid, [
+                (nodeid, fixture, setup, teardown)
+                for (nodeid, fixture), (setup, teardown) in self.fixtures.items()
+                if setup + teardown >= MIN_FIXTURE_SECONDS
+            ])
+        finally:
+            store.close()
+
+
+class HistoryReporter:
+    """Prints slowest tests and regressions once all results are in the store"""
+
+    def __init__(self, config, run_uid):
+        self.config = config
+        self.run_uid = run_uid
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_configure_node(self, node):
+        # Every xdist worker writes its rows under the controller's run id
+        node.workerinput["history_run_uid"] = self.run_uid
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_terminal_summary(self, terminalreporter):
+        path = Path(self.config.getoption("history_db"))
+        if not path.exists():
+            return
+        store = DurationStore(path)
+        try:
+            slowest = store.slowest(self.run_uid, self.config.getoption("history_slowest"))
+            regressions = store.regressions(
+                self.run_uid,
+                window=self.config.getoption("history_window"),
+                threshold=self.config.getoption("history_threshold"),
+            )
+        finally:
+            store.close()
+        if not slowest:
+            return
+        terminalreporter.section("duration history")
+        terminalreporter.write_line("Slowest tests (setup / call / teardown, top fixtures):")
+        for nodeid, setup, call, teardown, fixtures in slowest:
+            breakdown = "".join(f"; {name} {seconds:.2f}s" for name, seconds in fixtures)
+            terminalreporter.write_line(
+                f"  {setup + call + teardown:6.2f}s  {nodeid}  "
+                f"({setup:.2f} / {call:.2f} / {teardown:.2f}{breakdown})"
+            )
+        if regressions:
+            terminalreporter.write_line("Slower than the rolling median:")
+            for kind, name, latest, median in regressions:
+                terminalreporter.write_line(
+                    f"  {kind} {name}: {latest:.2f}s vs median {median:.2f}s (+{(latest / median - 1) * 100:.0f}%)"
+                )
+        else:
+            terminalreporter.write_line("No regressions against the rolling median.")
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("history", "Duration history")
+    group.addoption("--history-db", default=DEFAULT_DB_PATH, help="SQLite file with test durations")
+    group.addoption("--no-history", action="store_true", help="Do not record or report test durations")
+    group.addoption("--history-window", type=int, default=10, help="Previous runs the median covers")
+    group.addoption("--history-threshold", type=float, default=0.5,
+                    help="Report tests slower than median * (1 + threshold)")
+    group.addoption("--history-slowest", type=int, default=5, help="Number of slowest tests to list")
+
+
+def pytest_configure(config):
+    if config.getoption("no_history") or config.getoption("collectonly"):
+        return
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput is not None:
+        run_uid = workerinput.get("history_run_uid") or uuid.uuid4().hex
+        config.pluginmanager.register(DurationRecorder(config, run_uid))
+        return
+    run_uid = uuid.uuid4().hex
+    config.pluginmanager.register(HistoryReporter(config, run_uid))
+    if not config.getoption("numprocesses", None):
+        config.pluginmanager.register(DurationRecorder(config, run_uid))
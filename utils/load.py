@@ -0,0 +1,267 @@
+'''
+Load generation with the page objects as virtual-user scripts
+
+What it does:
+
+Starts the local saucedemo stand-in (or uses --base-url) and runs a journey
+(default: the test_full_shopping_flow steps) for many virtual users at once
+Users start spread over the ramp-up time, repeat the journey --iterations times
+and pause a random think time (0.5x - 1.5x --think-time) between steps
+Every step and every async page-object action is timed; the report lists
+p50 / p95 / p99 / max latency per step and per action, plus throughput
+(journeys per second) and error rate
+
+Run it:
+python -m utils.load --users 50 --ramp-up 10 --iterations 3 --think-time 0.5
+python -m utils.load --users 5 --json load-report.json --headed
+'''
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import sys
+import time
+from contextlib import asynccontextmanager
+
+from pages.async_pages import AsyncCartPage, AsyncLoginPage, AsyncProductsPage
+from utils.local_app import LocalAppServer
+from utils.local_app.catalog import PASSWORD
+from utils.virtual_users import VirtualUsers
+
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list"""
+    if not values:
+        raise ValueError("percentile of an empty series")
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class LatencyStats:
+    """Latency samples and error counts per (kind, name), e.g. ("step", "login")"""
+
+    def __init__(self):
+        self.samples = {}
+        self.errors = {}
+        self.journeys = 0
+        self.failed_journeys = 0
+
+    def record(self, kind, name, seconds, ok=True):
+        self.samples.setdefault((kind, name), []).append(seconds)
+        if not ok:
+            self.errors[(kind, name)] = self.errors.get((kind, name), 0) + 1
+
+    def summary(self):
+        """kind -> name -> count, errors and latency percentiles in ms"""
+        result = {}
+        for (kind, name), values in self.samples.items():
+            row = {"count": len(values), "errors": self.errors.get((kind, name), 0)}
+            for pct in PERCENTILES:
+                row[f"p{pct}_ms"] = round(percentile(values, pct) * 1000, 1)
+            row["max_ms"] = round(max(values) * 1000, 1)
+            result.setdefault(kind, {})[name] = row
+        return result
+
+
+class _TimedPageObject:
+    """Wraps an async page object so every awaited method is recorded as an action"""
+
+    def __init__(self, page_object, stats):
+        self._page_object = page_object
+        self._stats = stats
+
+    def __getattr__(self, name):
+        attribute = getattr(self._page_object, name)
+        if not asyncio.iscoroutinefunction(attribute):
+            return attribute
+        action = f"{type(self._page_object).__name__}.{name}"
+
+        async def timed(*args, **kwargs):
+            started = time.perf_counter()
+            ok = False
+            try:
+                result = await attribute(*args, **kwargs)
+                ok = True
+                return result
+            finally:
+                self._stats.record("action", action, time.perf_counter() - started, ok)
+
+        return timed
+
+
+class VirtualUser:
+    """What a journey gets: the page, timed page objects, steps and think time"""
+
+    def __init__(self, page, index, stats, think_time=0.0, username="standard_user"):
+        self.page = page
+        self.index = index
+        self.stats = stats
+        self.think_time = think_time
+        self.username = username
+        self.login_page = _TimedPageObject(AsyncLoginPage(page), stats)
+        self.products_page = _TimedPageObject(AsyncProductsPage(page), stats)
+        self.cart_page = _TimedPageObject(AsyncCartPage(page), stats)
+
+    @asynccontextmanager
+    async def step(self, name):
+        """Time one journey step, then pause for the think time"""
+        started = time.perf_counter()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self.stats.record("step", name, time.perf_counter() - started, ok)
+        await self.think()
+
+    async def think(self):
+        if self.think_time:
+            await asyncio.sleep(random.uniform(0.5, 1.5) * self.think_time)
+
+    async def reset(self):
+        """Log out and empty the cart before the next iteration"""
+        await self.page.context.clear_cookies()
+        try:
+            await self.page.evaluate("window.localStorage.clear()")
+        except Exception:
+            # A failed journey may have left the page mid-navigation; the login page resets it anyway
+            pass
+
+
+async def shopping_journey(user):
+    """Browse -> Add -> View Cart -> Remove -> Checkout (test_full_shopping_flow)"""
+    async with user.step("login"):
+        await user.login_page.navigate()
+        await user.login_page.login(user.username, PASSWORD)
+    async with user.step("add to cart"):
+        await user.products_page.add_product_to_cart("Sauce Labs Backpack")
+        await user.products_page.add_product_to_cart("Sauce Labs Bike Light")
+        await user.products_page.add_product_to_cart("Sauce Labs Bolt T-Shirt")
+    async with user.step("view cart"):
+        await user.products_page.go_to_cart()
+        await user.cart_page.get_cart_items()
+    async with user.step("remove item"):
+        await user.cart_page.remove_item("Sauce Labs Bike Light")
+    async with user.step("checkout"):
+        await user.cart_page.proceed_to_checkout()
+        await user.page.wait_for_url("**/checkout-step-one.html")
+
+
+class LoadTest:
+    """Runs one journey for many virtual users and collects the latencies"""
+
+    def __init__(self, base_url, users=10, ramp_up=0.0, iterations=1, think_time=0.0,
+                 journey=shopping_journey, username="standard_user", browser_name="chromium",
+                 launch_options=None):
+        self.users = users
+        self.ramp_up = ramp_up
+        self.iterations = iterations
+        self.think_time = think_time
+        self.journey = journey
+        self.username = username
+        self.stats = LatencyStats()
+        self.runner = VirtualUsers(
+            browser_name=browser_name,
+            launch_options={"headless": True, **(launch_options or {})},
+            context_options={"base_url": base_url},
+        )
+        self.elapsed = 0.0
+
+    async def _user_loop(self, page, index):
+        # Spread the start of the users evenly over the ramp-up time
+        await asyncio.sleep(self.ramp_up * index / self.users)
+        user = VirtualUser(page, index, self.stats, self.think_time, self.username)
+        for _ in range(self.iterations):
+            started = time.perf_counter()
+            ok = False
+            try:
+                await self.journey(user)
+                ok = True
+            except Exception:
+                self.stats.failed_journeys += 1
+            finally:
+                self.stats.journeys += 1
+                self.stats.record("journey", self.journey.__name__, time.perf_counter() - started, ok)
+                await user.reset()
+
+    def run(self):
+        started = time.perf_counter()
+        self.runner.run(self._user_loop, users=self.users)
+        self.elapsed = time.perf_counter() - started
+        return self.report()
+
+    def report(self):
+        journeys = self.stats.journeys
+        return {
+            "users": self.users,
+            "ramp_up_s": self.ramp_up,
+            "iterations": self.iterations,
+            "think_time_s": self.think_time,
+            "elapsed_s": round(self.elapsed, 2),
+            "journeys": journeys,
+            "throughput_per_s": round(journeys / self.elapsed, 2) if self.elapsed else 0.0,
+            "error_rate": round(self.stats.failed_journeys / journeys, 4) if journeys else 0.0,
+            "latency": self.stats.summary(),
+        }
+
+
+def format_report(report):
+    lines = [
+        f"{report['users']} users, {report['journeys']} journeys in {report['elapsed_s']}s - "
+        f"{report['throughput_per_s']} journeys/s, error rate {report['error_rate']:.1%}",
+    ]
+    for kind in ("journey", "step", "action"):
+        rows = report["latency"].get(kind, {})
+        if not rows:
+            continue
+        lines.append("")
+        lines.append(f"{kind:<44} {'count':>6} {'errors':>6} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+        for name, row in rows.items():
+            lines.append(
+                f"{name:<44} {row['count']:>6} {row['errors']:>6} {row['p50_ms']:>8} "
+                f"{row['p95_ms']:>8} {row['p99_ms']:>8} {row['max_ms']:>8}"
+            )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m utils.load", description="Run page-object journeys as virtual users")
+    parser.add_argument("--users", type=int, default=10, help="concurrent virtual users")
+    parser.add_argument("--ramp-up", type=float, default=0.0, help="seconds over which the users start")
+    parser.add_argument("--iterations", type=int, default=1, help="journeys per user")
+    parser.add_argument("--think-time", type=float, default=0.0, help="mean pause between steps in seconds")
+    parser.add_argument("--base-url", help="target site (default: start the local stand-in)")
+    parser.add_argument("--username", default="standard_user")
+    parser.add_argument("--browser", default="chromium", choices=("chromium", "firefox", "webkit"))
+    parser.add_argument("--headed", action="store_true")
+    parser.add_argument("--json", metavar="PATH", help="also write the report as JSON")
+    args = parser.parse_args(argv)
+
+    server = None
+    base_url = args.base_url
+    if base_url is None:
+        server = LocalAppServer().start()
+        base_url = server.url
+    try:
+        report = LoadTest(
+            base_url, users=args.users, ramp_up=args.ramp_up, iterations=args.iterations,
+            think_time=args.think_time, username=args.username, browser_name=args.browser,
+            launch_options={"headless": not args.headed},
+        ).run()
+    finally:
+        if server:
+            server.stop()
+    print(format_report(report))
+    if args.json:
+        with open(args.json, "w") as report_file:
+            json.dump(report, report_file, indent=2)
+    return 1 if report["error_rate"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,7 @@
+'''
+Local stand-in for www.saucedemo.com (login, inventory, cart and checkout)
+and for the jsonplaceholder API (utils/local_app/api.py)
+'''
+
+from utils.local_app.api import LocalApiServer
+from utils.local_app.server import LocalAppServer
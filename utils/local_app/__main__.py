@@ -0,0 +1,22 @@
+'''
+Serve the saucedemo stand-in until Ctrl+C:
+python -m utils.local_app --port 8000
+'''
+
+import argparse
+import time
+
+from utils.local_app import LocalAppServer
+
+parser = argparse.ArgumentParser(description="Serve the saucedemo stand-in")
+parser.add_argument("--host", default="127.0.0.1")
+parser.add_argument("--port", type=int, default=8000)
+args = parser.parse_args()
+
+with LocalAppServer(args.host, args.port) as server:
+    print(f"✅ Swag Labs stand-in running at {server.url}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,181 @@
+'''
+Local stand-in for jsonplaceholder.typicode.com
+
+What it does:
+
+Answers the jsonplaceholder endpoints the API tests use, from generated data:
+GET    /users, /users/<id>, /users/<id>/posts, /posts, /posts/<id>, /posts?userId=1
+POST   /posts           -> 201, the JSON body with id 101
+PUT    /posts/<id>      -> 200, the JSON body with the id of the URL
+PATCH  /posts/<id>      -> 200, the post merged with the JSON body
+DELETE /posts/<id>      -> 200, {}
+Like the real service, writes are faked and nothing changes between requests.
+Speaks HTTP/1.1 with Content-Length, so clients keep their connections open.
+
+Run it by hand:
+python -m utils.local_app.api --port 8001
+'''
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+USER_NAMES = [
+    ("Leanne Graham", "Bret"), ("Ervin Howell", "Antonette"), ("Clementine Bauch", "Samantha"),
+    ("Patricia Lebsack", "Karianne"), ("Chelsey Dietrich", "Kamren"), ("Mrs. Dennis Schulist", "Leopoldo_Corkery"),
+    ("Kurtis Weissnat", "Elwyn.Skiles"), ("Nicholas Runolfsdottir V", "Maxime_Nienow"),
+    ("Glenna Reichert", "Delphine"), ("Clementina DuBuque", "Moriah.Stanton"),
+]
+
+USERS = [
+    {
+        "id": index,
+        "name": name,
+        "username": username,
+        "email": f"{username.lower()}@example.com",
+        "phone": f"1-770-736-{8030 + index:04d}",
+        "website": f"{username.lower()}.example.org",
+        "address": {"street": "Kulas Light", "suite": f"Apt. {index}", "city": "Gwenborough", "zipcode": "92998-3874"},
+        "company": {"name": f"Company {index}", "catchPhrase": "Multi-layered client-server neural-net"},
+    }
+    for index, (name, username) in enumerate(USER_NAMES, start=1)
+]
+
+POSTS = [
+    {
+        "userId": (index - 1) // 10 + 1,
+        "id": index,
+        "title": f"post {index} title",
+        "body": f"body of post {index}\nwritten by user {(index - 1) // 10 + 1}",
+    }
+    for index in range(1, 101)
+]
+
+RESOURCES = {"users": USERS, "posts": POSTS}
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    """jsonplaceholder routes over the in-memory RESOURCES"""
+
+    protocol_version = "HTTP/1.1"
+    # Seconds added to every response (simulates a remote API)
+    delay = 0.0
+
+    def do_GET(self):
+        parts, query = self._route()
+        if len(parts) == 1 and parts[0] in RESOURCES:
+            items = RESOURCES[parts[0]]
+            items = [item for item in items if all(str(item.get(name)) == value for name, value in query)]
+            self._send(200, items)
+        elif len(parts) == 2 and parts[0] in RESOURCES:
+            item = self._find(parts[0], parts[1])
+            self._send(200 if item else 404, item or {})
+        elif len(parts) == 3 and parts[0] == "users" and parts[2] == "posts":
+            self._send(200, [post for post in POSTS if str(post["userId"]) == parts[1]])
+        else:
+            self._send(404, {})
+
+    def do_POST(self):
+        parts, _ = self._route()
+        if len(parts) == 1 and parts[0] in RESOURCES:
+            self._send(201, {**self._body(), "id": len(RESOURCES[parts[0]]) + 1})
+        else:
+            self._send(404, {})
+
+    def do_PUT(self):
+        parts, _ = self._route()
+        if len(parts) == 2 and self._find(*parts):
+            self._send(200, {**self._body(), "id": int(parts[1])})
+        else:
+            # jsonplaceholder answers 500 for unknown ids
+            self._send(500, {})
+
+    def do_PATCH(self):
+        parts, _ = self._route()
+        item = self._find(*parts) if len(parts) == 2 else None
+        self._send(200 if item else 404, {**item, **self._body()} if item else {})
+
+    def do_DELETE(self):
+        parts, _ = self._route()
+        self._send(200 if len(parts) == 2 and parts[0] in RESOURCES else 404, {})
+
+    def _route(self):
+        url = urlsplit(self.path)
+        return [part for part in url.path.split("/") if part], parse_qsl(url.query)
+
+    def _find(self, resource, item_id):
+        return next((item for item in RESOURCES.get(resource, ()) if str(item["id"]) == item_id), None)
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        try:
+            body = json.loads(self.rfile.read(length))
+        except ValueError:
+            return {}
+        return body if isinstance(body, dict) else {}
+
+    def _send(self, status, data):
+        if self.delay:
+            time.sleep(self.delay)
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class LocalApiServer:
+    """The jsonplaceholder stand-in running in a background thread"""
+
+    def __init__(self, host="127.0.0.1", port=0, delay=0.0):
+        self.host = host
+        self.port = port
+        self.delay = delay
+        self._server = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        handler = type("DelayedApiHandler", (ApiHandler,), {"delay": self.delay})
+        self._server = ThreadingHTTPServer((self.host, self.port), handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the jsonplaceholder stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds added to every response")
+    args = parser.parse_args()
+    with LocalApiServer(args.host, args.port, args.delay) as server:
+        print(f"✅ jsonplaceholder stand-in running at {server.url}")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
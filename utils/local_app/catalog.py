@@ -0,0 +1,83 @@
+'''
+Product catalog and users of the saucedemo stand-in
+
+Same ids, names, prices and descriptions as www.saucedemo.com, so the
+data-test ids ("add-to-cart-sauce-labs-backpack") and the cart storage
+("cart-contents" = "[4,0]") line up with the real site.
+'''
+
+PRODUCTS = [
+    {
+        "id": 4,
+        "name": "Sauce Labs Backpack",
+        "price": 29.99,
+        "image": "sauce-backpack",
+        "description": "carry.allTheThings() with the sleek, streamlined Sly Pack that melds "
+                       "uncompromising style with unequaled laptop and tablet protection.",
+    },
+    {
+        "id": 0,
+        "name": "Sauce Labs Bike Light",
+        "price": 9.99,
+        "image": "bike-light",
+        "description": "A red light isn't the desired state in testing but it sure helps when riding "
+                       "your bike at night. Water-resistant with 3 lighting modes, 1 AAA battery included.",
+    },
+    {
+        "id": 1,
+        "name": "Sauce Labs Bolt T-Shirt",
+        "price": 15.99,
+        "image": "bolt-shirt",
+        "description": "Get your testing superhero on with the Sauce Labs bolt T-shirt. From American "
+                       "Apparel, 100% ringspun combed cotton, heather gray with red bolt.",
+    },
+    {
+        "id": 5,
+        "name": "Sauce Labs Fleece Jacket",
+        "price": 49.99,
+        "image": "sauce-pullover",
+        "description": "It's not every day that you come across a midweight quarter-zip fleece jacket "
+                       "capable of handling everything from a relaxing day outdoors to a busy day at the office.",
+    },
+    {
+        "id": 2,
+        "name": "Sauce Labs Onesie",
+        "price": 7.99,
+        "image": "red-onesie",
+        "description": "Rib snap infant onesie for the junior automation engineer in development. "
+                       "Reinforced 3-snap bottom closure, two-needle hemmed sleeved and bottom won't unravel.",
+    },
+    {
+        "id": 3,
+        "name": "Test.allTheThings() T-Shirt (Red)",
+        "price": 15.99,
+        "image": "red-tatt",
+        "description": "This classic Sauce Labs t-shirt is perfect to wear when cozying up to your "
+                       "keyboard to automate a few tests. Super-soft and comfy ringspun combed cotton.",
+    },
+]
+
+USERS = [
+    "standard_user",
+    "locked_out_user",
+    "problem_user",
+    "performance_glitch_user",
+    "error_user",
+    "visual_user",
+]
+
+LOCKED_OUT_USERS = ["locked_out_user"]
+
+PASSWORD = "secret_sauce"
+
+
+def product_slug(name):
+    """data-test suffix the site derives from a product name"""
+    return name.lower().replace(" ", "-")
+
+
+def product_by_name(name):
+    for product in PRODUCTS:
+        if product["name"] == name:
+            return product
+    raise KeyError(f"No product named {name!r}")
@@ -0,0 +1,116 @@
+'''
+Local HTTP server for the saucedemo stand-in
+
+What it does:
+
+Serves the single page app in static/ on 127.0.0.1 (random free port by default)
+Every site page (/, /inventory.html, /cart.html, /checkout-*.html) gets the same
+index.html, which renders the page client-side like the real site
+/catalog.js is generated from catalog.py so Python and the browser share one catalog
+Runs in a daemon thread; start() / stop() or use it as a context manager
+
+Run it by hand:
+python -m utils.local_app --port 8000
+'''
+
+import json
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from utils.local_app import catalog
+
+STATIC_DIR = Path(__file__).resolve().parent / "static"
+
+SITE_PAGES = (
+    "/",
+    "/index.html",
+    "/inventory.html",
+    "/inventory-item.html",
+    "/cart.html",
+    "/checkout-step-one.html",
+    "/checkout-step-two.html",
+    "/checkout-complete.html",
+)
+
+
+def catalog_script():
+    data = {
+        "PRODUCTS": catalog.PRODUCTS,
+        "USERS": catalog.USERS,
+        "LOCKED_OUT_USERS": catalog.LOCKED_OUT_USERS,
+        "PASSWORD": catalog.PASSWORD,
+    }
+    return f"window.CATALOG = {json.dumps(data)};\n".encode()
+
+
+class LocalAppHandler(SimpleHTTPRequestHandler):
+    """Maps site pages to index.html and serves everything else from static/"""
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        if path in SITE_PAGES:
+            self.path = "/index.html"
+        elif path == "/catalog.js":
+            self._send_bytes(catalog_script(), "application/javascript")
+            return
+        elif path.startswith("/static/"):
+            self.path = path[len("/static"):]
+        else:
+            self.send_error(404)
+            return
+        super().do_GET()
+
+    def end_headers(self):
+        # Hashed-style assets may be cached, pages and the catalog must be revalidated
+        if self.path.startswith(("/css/", "/js/", "/media/")):
+            self.send_header("Cache-Control", "public, max-age=3600")
+        else:
+            self.send_header("Cache-Control", "no-cache")
+        super().end_headers()
+
+    def _send_bytes(self, body, content_type):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class LocalAppServer:
+    """The stand-in site running in a background thread"""
+
+    def __init__(self, host="127.0.0.1", port=0):
+        self.host = host
+        self.port = port
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        handler = partial(LocalAppHandler, directory=str(STATIC_DIR))
+        self._server = ThreadingHTTPServer((self.host, self.port), handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,534 @@
+/*
+ * Swag Labs stand-in: a small client-side copy of www.saucedemo.com.
+ * Session lives in the "session-username" cookie and the cart in
+ * localStorage["cart-contents"], exactly like the real site.
+ * Users, products and prices come from /catalog.js (utils/local_app/catalog.py).
+ */
+(function () {
+    "use strict";
+
+    const { PRODUCTS, USERS, LOCKED_OUT_USERS, PASSWORD } = window.CATALOG;
+    const SESSION_COOKIE = "session-username";
+    const CART_KEY = "cart-contents";
+    const SESSION_SECONDS = 600;
+    const PROTECTED_PAGES = [
+        "/inventory.html",
+        "/inventory-item.html",
+        "/cart.html",
+        "/checkout-step-one.html",
+        "/checkout-step-two.html",
+        "/checkout-complete.html",
+    ];
+    const SORT_OPTIONS = [
+        ["az", "Name (A to Z)"],
+        ["za", "Name (Z to A)"],
+        ["lohi", "Price (low to high)"],
+        ["hilo", "Price (high to low)"],
+    ];
+
+    const root = document.getElementById("root");
+
+    function esc(text) {
+        return String(text)
+            .replace(/&/g, "&amp;")
+            .replace(/</g, "&lt;")
+            .replace(/>/g, "&gt;")
+            .replace(/"/g, "&quot;")
+            .replace(/'/g, "&#39;");
+    }
+
+    function slug(name) {
+        return name.toLowerCase().replace(/ /g, "-");
+    }
+
+    function money(value) {
+        return "$" + value.toFixed(2);
+    }
+
+    function productById(id) {
+        return PRODUCTS.find((product) => product.id === id);
+    }
+
+    // Session
+
+    function currentUser() {
+        const match = document.cookie.match(/(?:^|; )session-username=([^;]*)/);
+        return match ? decodeURIComponent(match[1]) : null;
+    }
+
+    function startSession(username) {
+        const expires = new Date(Date.now() + SESSION_SECONDS * 1000).toUTCString();
+        document.cookie = `${SESSION_COOKIE}=${encodeURIComponent(username)}; expires=${expires}; path=/`;
+    }
+
+    function endSession() {
+        document.cookie = `${SESSION_COOKIE}=; expires=Thu, 01 Jan 1970 00:00:00 GMT; path=/`;
+    }
+
+    // Cart
+
+    function cartIds() {
+        try {
+            return JSON.parse(localStorage.getItem(CART_KEY)) || [];
+        } catch (error) {
+            return [];
+        }
+    }
+
+    function saveCart(ids) {
+        if (ids.length) {
+            localStorage.setItem(CART_KEY, JSON.stringify(ids));
+        } else {
+            localStorage.removeItem(CART_KEY);
+        }
+    }
+
+    function addToCart(id) {
+        const ids = cartIds();
+        if (!ids.includes(id)) {
+            ids.push(id);
+            saveCart(ids);
+        }
+    }
+
+    function removeFromCart(id) {
+        saveCart(cartIds().filter((cartId) => cartId !== id));
+    }
+
+    // Shared layout
+
+    function header(title, right) {
+        const count = cartIds().length;
+        const badge = count
+            ? `<span class="shopping_cart_badge" data-test="shopping-cart-badge">${count}</span>`
+            : "";
+        return `
+            <div class="bm-menu-wrap" id="menu" aria-hidden="true">
+                <nav class="bm-item-list">
+                    <a id="inventory_sidebar_link" class="bm-item menu-item" href="/inventory.html" data-test="inventory-sidebar-link">All Items</a>
+                    <a id="about_sidebar_link" class="bm-item menu-item" href="https://saucelabs.com/" data-test="about-sidebar-link">About</a>
+                    <a id="logout_sidebar_link" class="bm-item menu-item" href="#" data-test="logout-sidebar-link">Logout</a>
+                    <a id="reset_sidebar_link" class="bm-item menu-item" href="#" data-test="reset-sidebar-link">Reset App State</a>
+                </nav>
+                <button type="button" id="react-burger-cross-btn" data-test="close-menu">Close Menu</button>
+            </div>
+            <div class="primary_header" data-test="primary-header">
+                <div id="menu_button_container">
+                    <button type="button" id="react-burger-menu-btn" data-test="open-menu">Open Menu</button>
+                </div>
+                <div class="header_label"><div class="app_logo">Swag Labs</div></div>
+                <div id="shopping_cart_container" class="shopping_cart_container">
+                    <a class="shopping_cart_link" href="/cart.html" data-test="shopping-cart-link">${badge}</a>
+                </div>
+            </div>
+            <div class="header_secondary_container" data-test="secondary-header">
+                <span class="title" data-test="title">${esc(title)}</span>
+                ${right || ""}
+            </div>`;
+    }
+
+    function footer() {
+        return `
+            <footer class="footer" data-test="footer">
+                <div class="footer_copy" data-test="footer-copy">© Sauce Labs. All Rights Reserved. Terms of Service | Privacy Policy</div>
+            </footer>`;
+    }
+
+    function renderShell(title, body, right) {
+        root.innerHTML = `
+            <div id="page_wrapper" class="page_wrapper">
+                <div id="contents_wrapper">
+                    ${header(title, right)}
+                    ${body}
+                </div>
+                ${footer()}
+            </div>`;
+        bindMenu();
+    }
+
+    function bindMenu() {
+        const menu = document.getElementById("menu");
+        document.getElementById("react-burger-menu-btn").addEventListener("click", () => {
+            menu.classList.add("open");
+            menu.setAttribute("aria-hidden", "false");
+        });
+        document.getElementById("react-burger-cross-btn").addEventListener("click", () => {
+            menu.classList.remove("open");
+            menu.setAttribute("aria-hidden", "true");
+        });
+        document.getElementById("logout_sidebar_link").addEventListener("click", (event) => {
+            event.preventDefault();
+            endSession();
+            window.location.href = "/";
+        });
+        document.getElementById("reset_sidebar_link").addEventListener("click", (event) => {
+            event.preventDefault();
+            saveCart([]);
+            route();
+        });
+    }
+
+    function refreshBadge() {
+        const link = document.querySelector(".shopping_cart_link");
+        const count = cartIds().length;
+        link.innerHTML = count
+            ? `<span class="shopping_cart_badge" data-test="shopping-cart-badge">${count}</span>`
+            : "";
+    }
+
+    function cartButton(product, inCart, extraClass) {
+        const action = inCart ? "remove" : "add-to-cart";
+        const label = inCart ? "Remove" : "Add to cart";
+        const style = inCart ? "btn_secondary" : "btn_primary";
+        const id = `${action}-${slug(product.name)}`;
+        return `<button class="btn ${style} btn_small ${extraClass}" data-test="${esc(id)}" id="${esc(id)}" name="${esc(id)}" data-product-id="${product.id}">${label}</button>`;
+    }
+
+    function bindCartButtons(container, extraClass, onChange) {
+        container.addEventListener("click", (event) => {
+            const button = event.target.closest("button[data-product-id]");
+            if (!button) {
+                return;
+            }
+            const product = productById(Number(button.dataset.productId));
+            const inCart = cartIds().includes(product.id);
+            if (inCart) {
+                removeFromCart(product.id);
+            } else {
+                addToCart(product.id);
+            }
+            if (onChange) {
+                onChange(product, button);
+            } else {
+                button.outerHTML = cartButton(product, !inCart, extraClass);
+                refreshBadge();
+            }
+        });
+    }
+
+    // Pages
+
+    function renderLogin(errorText) {
+        root.innerHTML = `
+            <div class="login_container">
+                <div class="login_logo">Swag Labs</div>
+                <div class="login_wrapper" data-test="login-container">
+                    <div class="login_wrapper-inner">
+                        <div id="login_button_container" class="form_column">
+                            <div class="login-box">
+                                <form novalidate>
+                                    <div class="form_group">
+                                        <input class="input_error form_input" placeholder="Username" type="text" data-test="username" id="user-name" name="user-name" autocorrect="off" autocapitalize="none" value="">
+                                    </div>
+                                    <div class="form_group">
+                                        <input class="input_error form_input" placeholder="Password" type="password" data-test="password" id="password" name="password" autocorrect="off" autocapitalize="none" value="">
+                                    </div>
+                                    <div class="error-message-container"></div>
+                                    <input type="submit" class="submit-button btn_action" data-test="login-button" id="login-button" name="login-button" value="Login">
+                                </form>
+                            </div>
+                        </div>
+                    </div>
+                    <div class="login_credentials_wrap">
+                        <div class="login_credentials_wrap-inner">
+                            <div id="login_credentials" class="login_credentials" data-test="login-credentials">
+                                <h4>Accepted usernames are:</h4>${USERS.map(esc).join("<br>")}
+                            </div>
+                            <div class="login_password" data-test="login-password">
+                                <h4>Password for all users:</h4>${esc(PASSWORD)}
+                            </div>
+                        </div>
+                    </div>
+                </div>
+            </div>`;
+
+        const form = root.querySelector("form");
+        const showError = (text) => {
+            const container = form.querySelector(".error-message-container");
+            container.classList.add("error");
+            container.innerHTML = `<h3 data-test="error"><button type="button" class="error-button" data-test="error-button">x</button>${esc(text)}</h3>`;
+            form.querySelectorAll(".form_input").forEach((input) => input.classList.add("error"));
+            container.querySelector(".error-button").addEventListener("click", () => {
+                container.classList.remove("error");
+                container.innerHTML = "";
+                form.querySelectorAll(".form_input").forEach((input) => input.classList.remove("error"));
+            });
+        };
+        if (errorText) {
+            showError(errorText);
+        }
+
+        form.addEventListener("submit", (event) => {
+            event.preventDefault();
+            const username = form.querySelector("#user-name").value;
+            const password = form.querySelector("#password").value;
+            if (!username) {
+                showError("Epic sadface: Username is required");
+            } else if (!password) {
+                showError("Epic sadface: Password is required");
+            } else if (!USERS.includes(username) || password !== PASSWORD) {
+                showError("Epic sadface: Username and password do not match any user in this service");
+            } else if (LOCKED_OUT_USERS.includes(username)) {
+                showError("Epic sadface: Sorry, this user has been locked out.");
+            } else {
+                startSession(username);
+                window.location.href = "/inventory.html";
+            }
+        });
+    }
+
+    function sortedProducts(option) {
+        const products = PRODUCTS.slice();
+        const byName = (a, b) => a.name.localeCompare(b.name);
+        const sorters = {
+            az: byName,
+            za: (a, b) => byName(b, a),
+            lohi: (a, b) => a.price - b.price || byName(a, b),
+            hilo: (a, b) => b.price - a.price || byName(a, b),
+        };
+        return products.sort(sorters[option] || byName);
+    }
+
+    function inventoryItem(product, ids) {
+        return `
+            <div class="inventory_item" data-test="inventory-item">
+                <div class="inventory_item_img">
+                    <a id="item_${product.id}_img_link" href="/inventory-item.html?id=${product.id}" data-test="item-${product.id}-img-link">
+                        <img alt="${esc(product.name)}" class="inventory_item_img" src="/static/media/${product.image}.svg" data-test="inventory-item-${esc(slug(product.name))}-img">
+                    </a>
+                </div>
+                <div class="inventory_item_description" data-test="inventory-item-description">
+                    <div class="inventory_item_label">
+                        <a id="item_${product.id}_title_link" href="/inventory-item.html?id=${product.id}" data-test="item-${product.id}-title-link">
+                            <div class="inventory_item_name" data-test="inventory-item-name">${esc(product.name)}</div>
+                        </a>
+                        <div class="inventory_item_desc" data-test="inventory-item-desc">${esc(product.description)}</div>
+                    </div>
+                    <div class="pricebar">
+                        <div class="inventory_item_price" data-test="inventory-item-price">${money(product.price)}</div>
+                        ${cartButton(product, ids.includes(product.id), "btn_inventory")}
+                    </div>
+                </div>
+            </div>`;
+    }
+
+    function renderInventory() {
+        let sortOption = "az";
+        const sortControl = `
+            <div class="right_component">
+                <span class="select_container">
+                    <span class="active_option" data-test="active-option">${SORT_OPTIONS[0][1]}</span>
+                    <select class="product_sort_container" data-test="product-sort-container">
+                        ${SORT_OPTIONS.map(([value, label]) => `<option value="${value}">${label}</option>`).join("")}
+                    </select>
+                </span>
+            </div>`;
+        renderShell("Products", `
+            <div id="inventory_container" class="inventory_container">
+                <div data-test="inventory-container">
+                    <div class="inventory_list" data-test="inventory-list"></div>
+                </div>
+            </div>`, sortControl);
+
+        const list = root.querySelector(".inventory_list");
+        const draw = () => {
+            const ids = cartIds();
+            list.innerHTML = sortedProducts(sortOption).map((product) => inventoryItem(product, ids)).join("");
+        };
+        draw();
+        bindCartButtons(list, "btn_inventory");
+
+        const select = root.querySelector(".product_sort_container");
+        select.addEventListener("change", () => {
+            sortOption = select.value;
+            root.querySelector(".active_option").textContent =
+                SORT_OPTIONS.find(([value]) => value === sortOption)[1];
+            draw();
+        });
+    }
+
+    function renderInventoryItem() {
+        const id = Number(new URLSearchParams(window.location.search).get("id"));
+        const product = productById(id);
+        if (!product) {
+            renderShell("", `<div class="inventory_details" data-test="inventory-container">ITEM NOT FOUND</div>`);
+            return;
+        }
+        const button = () => {
+            const inCart = cartIds().includes(product.id);
+            const action = inCart ? "remove" : "add-to-cart";
+            const style = inCart ? "btn_secondary" : "btn_primary";
+            return `<button class="btn ${style} btn_small btn_inventory" data-test="${action}" id="${action}" name="${action}" data-product-id="${product.id}">${inCart ? "Remove" : "Add to cart"}</button>`;
+        };
+        renderShell("", `
+            <div class="inventory_details" data-test="inventory-container">
+                <button type="button" class="btn btn_secondary back btn_large inventory_details_back_button" data-test="back-to-products" id="back-to-products" name="back-to-products">Back to products</button>
+                <div class="inventory_details_container">
+                    <img alt="${esc(product.name)}" class="inventory_details_img" src="/static/media/${product.image}.svg" data-test="item-${esc(slug(product.name))}-img">
+                    <div class="inventory_details_desc_container">
+                        <div class="inventory_details_name large_size" data-test="inventory-item-name">${esc(product.name)}</div>
+                        <div class="inventory_details_desc large_size" data-test="inventory-item-desc">${esc(product.description)}</div>
+                        <div class="inventory_details_price" data-test="inventory-item-price">${money(product.price)}</div>
+                        <div class="cart_button_container">${button()}</div>
+                    </div>
+                </div>
+            </div>`);
+        root.querySelector("#back-to-products").addEventListener("click", () => {
+            window.location.href = "/inventory.html";
+        });
+        const container = root.querySelector(".cart_button_container");
+        bindCartButtons(container, "btn_inventory", () => {
+            container.innerHTML = button();
+            refreshBadge();
+        });
+    }
+
+    function cartItem(product, withButton) {
+        return `
+            <div class="cart_item" data-test="inventory-item">
+                <div class="cart_quantity" data-test="item-quantity">1</div>
+                <div class="cart_item_label">
+                    <a href="/inventory-item.html?id=${product.id}" id="item_${product.id}_title_link" data-test="item-${product.id}-title-link">
+                        <div class="inventory_item_name" data-test="inventory-item-name">${esc(product.name)}</div>
+                    </a>
+                    <div class="inventory_item_desc" data-test="inventory-item-desc">${esc(product.description)}</div>
+                    <div class="item_pricebar" data-test="item-pricebar">
+                        <div class="inventory_item_price" data-test="inventory-item-price">${money(product.price)}</div>
+                        ${withButton ? cartButton(product, true, "cart_button") : ""}
+                    </div>
+                </div>
+            </div>`;
+    }
+
+    function cartList(withButtons) {
+        return `
+            <div class="cart_list" data-test="cart-list">
+                <div class="cart_quantity_label" data-test="cart-quantity-label">QTY</div>
+                <div class="cart_desc_label" data-test="cart-desc-label">Description</div>
+                ${cartIds().map(productById).filter(Boolean).map((product) => cartItem(product, withButtons)).join("")}
+            </div>`;
+    }
+
+    function renderCart() {
+        renderShell("Your Cart", `
+            <div id="cart_contents_container" class="cart_contents_container" data-test="cart-contents-container">
+                ${cartList(true)}
+                <div class="cart_footer">
+                    <button class="btn btn_secondary back btn_medium" data-test="continue-shopping" id="continue-shopping" name="continue-shopping">Continue Shopping</button>
+                    <button class="btn btn_action btn_medium checkout_button" data-test="checkout" id="checkout" name="checkout">Checkout</button>
+                </div>
+            </div>`);
+        bindCartButtons(root.querySelector(".cart_list"), "cart_button", (product, button) => {
+            button.closest(".cart_item").remove();
+            refreshBadge();
+        });
+        root.querySelector("#continue-shopping").addEventListener("click", () => {
+            window.location.href = "/inventory.html";
+        });
+        root.querySelector("#checkout").addEventListener("click", () => {
+            window.location.href = "/checkout-step-one.html";
+        });
+    }
+
+    function renderCheckoutStepOne() {
+        renderShell("Checkout: Your Information", `
+            <div id="checkout_info_container" class="checkout_info_container" data-test="checkout-info-container">
+                <form novalidate>
+                    <div class="checkout_info">
+                        <div class="form_group"><input class="input_error form_input" placeholder="First Name" type="text" data-test="firstName" id="first-name" name="firstName" value=""></div>
+                        <div class="form_group"><input class="input_error form_input" placeholder="Last Name" type="text" data-test="lastName" id="last-name" name="lastName" value=""></div>
+                        <div class="form_group"><input class="input_error form_input" placeholder="Zip/Postal Code" type="text" data-test="postalCode" id="postal-code" name="postalCode" value=""></div>
+                        <div class="error-message-container"></div>
+                    </div>
+                    <div class="checkout_buttons">
+                        <button type="button" class="btn btn_secondary back btn_medium cart_cancel_link" data-test="cancel" id="cancel" name="cancel">Cancel</button>
+                        <input type="submit" class="submit-button btn btn_primary cart_button btn_action" data-test="continue" id="continue" name="continue" value="Continue">
+                    </div>
+                </form>
+            </div>`);
+        const form = root.querySelector("form");
+        root.querySelector("#cancel").addEventListener("click", () => {
+            window.location.href = "/cart.html";
+        });
+        form.addEventListener("submit", (event) => {
+            event.preventDefault();
+            const required = [
+                ["#first-name", "Error: First Name is required"],
+                ["#last-name", "Error: Last Name is required"],
+                ["#postal-code", "Error: Postal Code is required"],
+            ];
+            const missing = required.find(([selector]) => !form.querySelector(selector).value);
+            if (missing) {
+                const container = form.querySelector(".error-message-container");
+                container.classList.add("error");
+                container.innerHTML = `<h3 data-test="error"><button type="button" class="error-button" data-test="error-button">x</button>${esc(missing[1])}</h3>`;
+                return;
+            }
+            window.location.href = "/checkout-step-two.html";
+        });
+    }
+
+    function renderCheckoutStepTwo() {
+        const itemTotal = cartIds().map(productById).filter(Boolean)
+            .reduce((total, product) => total + product.price, 0);
+        const tax = Math.round(itemTotal * 8) / 100;
+        renderShell("Checkout: Overview", `
+            <div id="checkout_summary_container" class="checkout_summary_container" data-test="checkout-summary-container">
+                ${cartList(false)}
+                <div class="summary_info">
+                    <div class="summary_info_label" data-test="payment-info-label">Payment Information:</div>
+                    <div class="summary_value_label" data-test="payment-info-value">SauceCard #31337</div>
+                    <div class="summary_info_label" data-test="shipping-info-label">Shipping Information:</div>
+                    <div class="summary_value_label" data-test="shipping-info-value">Free Pony Express Delivery!</div>
+                    <div class="summary_info_label" data-test="total-info-label">Price Total</div>
+                    <div class="summary_subtotal_label" data-test="subtotal-label">Item total: ${money(itemTotal)}</div>
+                    <div class="summary_tax_label" data-test="tax-label">Tax: ${money(tax)}</div>
+                    <div class="summary_info_label summary_total_label" data-test="total-label">Total: ${money(itemTotal + tax)}</div>
+                    <div class="cart_footer">
+                        <button class="btn btn_secondary back btn_medium cart_cancel_link" data-test="cancel" id="cancel" name="cancel">Cancel</button>
+                        <button class="btn btn_action btn_medium cart_button" data-test="finish" id="finish" name="finish">Finish</button>
+                    </div>
+                </div>
+            </div>`);
+        root.querySelector("#cancel").addEventListener("click", () => {
+            window.location.href = "/inventory.html";
+        });
+        root.querySelector("#finish").addEventListener("click", () => {
+            saveCart([]);
+            window.location.href = "/checkout-complete.html";
+        });
+    }
+
+    function renderCheckoutComplete() {
+        renderShell("Checkout: Complete!", `
+            <div id="checkout_complete_container" class="checkout_complete_container" data-test="checkout-complete-container">
+                <h2 class="complete-header" data-test="complete-header">Thank you for your order!</h2>
+                <div class="complete-text" data-test="complete-text">Your order has been dispatched, and will arrive just as fast as the pony can get there!</div>
+                <button class="btn btn_primary btn_small" data-test="back-to-products" id="back-to-products" name="back-to-products">Back Home</button>
+            </div>`);
+        root.querySelector("#back-to-products").addEventListener("click", () => {
+            window.location.href = "/inventory.html";
+        });
+    }
+
+    const PAGES = {
+        "/inventory.html": renderInventory,
+        "/inventory-item.html": renderInventoryItem,
+        "/cart.html": renderCart,
+        "/checkout-step-one.html": renderCheckoutStepOne,
+        "/checkout-step-two.html": renderCheckoutStepTwo,
+        "/checkout-complete.html": renderCheckoutComplete,
+    };
+
+    function route() {
+        const path = window.location.pathname;
+        if (PROTECTED_PAGES.includes(path) && !currentUser()) {
+            window.history.replaceState(null, "", "/");
+            renderLogin(`Epic sadface: You can only access '${path}' when you are logged in.`);
+            return;
+        }
+        (PAGES[path] || (() => renderLogin()))();
+    }
+
+    route();
+})();
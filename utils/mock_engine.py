@@ -0,0 +1,360 @@
+'''
+Contract-aware API mocks learned from recorded traffic
+
+What it does:
+
+learn() takes recorded request/response pairs (from an ApiClient with
+record=True, a HAR file of utils/network_cache.py or by hand) and indexes them
+in memory by method, path template and request body shape:
+"GET /posts/{id}", "POST /posts" with a {"body", "title", "userId"} body
+While learning, responses are turned into templates: a field that echoes the
+request body becomes {{body.<field>}}, an "id" equal to the last number of the
+URL becomes {{path.id}}, so one recorded GET /posts/1 also answers GET /posts/7 with id 7
+Templates can also be written by hand: {{path.id}}, {{body.title}}, {{query.userId}}, {{now}}
+A placeholder the request cannot fill (e.g. a POST without "userId") keeps the
+recorded value, so the response always has the recorded shape
+A request is answered by the entry with the same path if there is one, else by
+the last learned entry of its template
+
+Latency is injected on purpose: a number of ms, a (low, high) range, "recorded"
+(the time measured while recording) or per endpoint with set_latency()
+
+Serve the mocks:
+engine.attach(page)                     # page.route / context.route handler, misses fall through
+with engine.serve() as server:          # local HTTP server, e.g. for APIRequestContext
+    playwright.request.new_context(base_url=server.url)
+'''
+
+import base64
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qsl, urlsplit
+
+from playwright.sync_api import Error
+
+from utils.api_client import ID_SEGMENT, endpoint_name
+
+PLACEHOLDER = re.compile(r"\{\{\s*([\w.]+)\s*\}\}")
+
+# Describe the original transfer, not the mocked one
+DROPPED_HEADERS = ("content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive", "date")
+
+
+def _json_or_text(value):
+    """Parsed JSON when value is a JSON string or bytes, else the value itself"""
+    if isinstance(value, bytes):
+        value = value.decode("utf-8", errors="replace")
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value
+    return value
+
+
+def body_shape(body):
+    """Sorted top-level keys of a JSON object body ("" for anything else)"""
+    body = _json_or_text(body)
+    return ",".join(sorted(body)) if isinstance(body, dict) else ""
+
+
+def path_params(path):
+    """Numeric segments of the path: /users/3/posts/7 -> {"id": 3, "id2": 7}"""
+    values = [int(segment) for segment in re.findall(r"/(\d+)(?=/|$)", path)]
+    return {("id" if index == 0 else f"id{index + 1}"): value for index, value in enumerate(values)}
+
+
+def _template_response(body, params, request_body):
+    """Replace top-level fields that echo the request with placeholders"""
+    if not isinstance(body, dict):
+        return body
+    request_body = request_body if isinstance(request_body, dict) else {}
+    templated = {}
+    for name, value in body.items():
+        if name in request_body and request_body[name] == value and not isinstance(value, (dict, list)):
+            templated[name] = f"{{{{body.{name}}}}}"
+        elif name == "id" and params and value == list(params.values())[-1]:
+            # The resource's own id is the last number in its URL
+            templated[name] = f"{{{{path.{list(params)[-1]}}}}}"
+        else:
+            templated[name] = value
+    return templated
+
+
+def render(value, context, recorded=None):
+    """Fill the {{...}} placeholders of a response body; a lone placeholder keeps the value's type
+    recorded is the body as it was recorded, used where the context has no value
+    """
+    if isinstance(value, dict):
+        recorded = recorded if isinstance(recorded, dict) else {}
+        return {name: render(item, context, recorded.get(name)) for name, item in value.items()}
+    if isinstance(value, list):
+        recorded = recorded if isinstance(recorded, list) and len(recorded) == len(value) else [None] * len(value)
+        return [render(item, context, default) for item, default in zip(value, recorded)]
+    if not isinstance(value, str) or "{{" not in value:
+        return value
+
+    def lookup(dotted):
+        current = context
+        for part in dotted.split("."):
+            if not isinstance(current, dict) or part not in current:
+                return None
+            current = current[part]
+        return current
+
+    whole = PLACEHOLDER.fullmatch(value)
+    if whole:
+        found = lookup(whole.group(1))
+        if found is None:
+            return value if recorded is None else recorded
+        return found
+    if recorded is not None and any(lookup(name) is None for name in PLACEHOLDER.findall(value)):
+        return recorded
+    return PLACEHOLDER.sub(
+        lambda match: match.group(0) if lookup(match.group(1)) is None else str(lookup(match.group(1))), value
+    )
+
+
+class MockEngine:
+    """In-memory index of learned request/response pairs"""
+
+    def __init__(self, latency=None, strict=False):
+        self.latency = latency
+        self.strict = strict
+        self.entries = []
+        self.hits = 0
+        self.misses = []
+        self._latency_overrides = {}
+        self._index = {}
+
+    # Learning
+
+    def learn(self, method, url, status=200, body=None, request_body=None, headers=None,
+              elapsed_ms=0.0, template=True):
+        """Add one recorded pair; JSON bodies may be given parsed or as text"""
+        method = method.upper()
+        path = urlsplit(url).path or "/"
+        request_body = _json_or_text(request_body)
+        recorded = body = _json_or_text(body)
+        if template:
+            body = _template_response(body, path_params(path), request_body)
+        entry = {
+            "method": method,
+            "path": path,
+            "template": ID_SEGMENT.sub("/{id}", path),
+            "shape": body_shape(request_body),
+            "status": status,
+            "headers": {
+                name: value for name, value in (headers or {}).items() if name.lower() not in DROPPED_HEADERS
+            },
+            "body": body,
+            "recorded": recorded,
+            "elapsed_ms": elapsed_ms,
+        }
+        self.entries.append(entry)
+        self._add_to_index(entry)
+        return entry
+
+    def learn_traffic(self, traffic):
+        """Pairs recorded by ApiClient(record=True)"""
+        for record in traffic:
+            self.learn(**record)
+        return self
+
+    def learn_har(self, path, json_only=True):
+        """Pairs of a HAR file (e.g. network-cache/<test>.har); by default only JSON responses"""
+        har = json.loads(Path(path).read_text())
+        for item in har["log"]["entries"]:
+            request, response = item["request"], item["response"]
+            content = response.get("content", {})
+            if json_only and "json" not in content.get("mimeType", ""):
+                continue
+            text = content.get("text", "")
+            if content.get("encoding") == "base64":
+                text = base64.b64decode(text)
+            self.learn(
+                request["method"], request["url"], response["status"], text,
+                request_body=request.get("postData", {}).get("text"),
+                headers={header["name"]: header["value"] for header in response["headers"]},
+                elapsed_ms=item.get("time", 0),
+            )
+        return self
+
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({"entries": self.entries}, indent=1))
+
+    @classmethod
+    def from_file(cls, path, **options):
+        engine = cls(**options)
+        for entry in json.loads(Path(path).read_text())["entries"]:
+            engine.entries.append(entry)
+            engine._add_to_index(entry)
+        return engine
+
+    def _add_to_index(self, entry):
+        self._index.setdefault((entry["method"], entry["template"], entry["shape"]), []).append(entry)
+        self._index.setdefault((entry["method"], entry["template"], None), []).append(entry)
+
+    # Answering
+
+    def set_latency(self, endpoint, latency):
+        """Latency for one endpoint, e.g. set_latency("GET /posts/{id}", (80, 200))"""
+        self._latency_overrides[endpoint] = latency
+
+    def match(self, method, url, request_body=None):
+        """Learned entry for the request, or None"""
+        method = method.upper()
+        path = urlsplit(url).path or "/"
+        template = ID_SEGMENT.sub("/{id}", path)
+        candidates = (
+            self._index.get((method, template, body_shape(request_body)))
+            or self._index.get((method, template, None))
+        )
+        if not candidates:
+            return None
+        return next((entry for entry in reversed(candidates) if entry["path"] == path), candidates[-1])
+
+    def respond(self, method, url, request_body=None):
+        """(status, headers, body bytes, delay seconds) for the request, or None when nothing matches"""
+        entry = self.match(method, url, request_body)
+        if entry is None:
+            self.misses.append(f"{method.upper()} {url}")
+            return None
+        self.hits += 1
+        split = urlsplit(url)
+        context = {
+            "path": path_params(split.path),
+            "query": dict(parse_qsl(split.query)),
+            "body": _json_or_text(request_body) if request_body else {},
+            "now": datetime.now(timezone.utc).isoformat(),
+        }
+        body = render(entry["body"], context, entry.get("recorded"))
+        headers = dict(entry["headers"])
+        if isinstance(body, (dict, list)) or body is None:
+            body = json.dumps(body if body is not None else {}).encode()
+            headers.setdefault("content-type", "application/json; charset=utf-8")
+        elif isinstance(body, str):
+            body = body.encode()
+        return entry["status"], headers, body, self._delay(entry)
+
+    def _delay(self, entry):
+        latency = self._latency_overrides.get(endpoint_name(entry["method"], entry["template"]), self.latency)
+        if latency == "recorded":
+            return entry.get("elapsed_ms", 0) / 1000
+        if isinstance(latency, (tuple, list)):
+            return random.uniform(*latency) / 1000
+        return (latency or 0) / 1000
+
+    def attach(self, target, pattern="**/*"):
+        """Answer matching requests of a page or context; misses fall through (or abort when strict)
+        Latency is waited for with the page's wait_for_timeout, so concurrent requests are delayed side by side
+        """
+        target.route(pattern, self._handle)
+        return self
+
+    def _handle(self, route):
+        request = route.request
+        answer = self.respond(request.method, request.url, request.post_data)
+        if answer is None:
+            if self.strict:
+                route.abort("connectionrefused")
+            else:
+                route.fallback()
+            return
+        status, headers, body, delay = answer
+        if delay:
+            self._wait(route, delay)
+        route.fulfill(status=status, headers=headers, body=body)
+
+    @staticmethod
+    def _wait(route, delay):
+        # time.sleep would block the dispatcher: no other request, route or event of the page until it returns
+        try:
+            page = route.request.frame.page
+        except Error:
+            # Service worker requests have no frame
+            time.sleep(delay)
+            return
+        page.wait_for_timeout(delay * 1000)
+
+    def serve(self, host="127.0.0.1", port=0):
+        """Start a local HTTP server answering from this engine (use it as a context manager)"""
+        return MockServer(self, host, port).start()
+
+    def stats(self):
+        return {"hits": self.hits, "misses": len(self.misses)}
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    """Every method goes to the engine; unknown requests get a 404 naming the request"""
+
+    protocol_version = "HTTP/1.1"
+    engine = None
+
+    def _answer(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        request_body = self.rfile.read(length) if length else None
+        answer = self.engine.respond(self.command, self.path, request_body)
+        if answer is None:
+            status, headers, body, delay = 404, {}, json.dumps(
+                {"error": f"no mock for {self.command} {self.path}"}
+            ).encode(), 0
+        else:
+            status, headers, body, delay = answer
+        if delay:
+            time.sleep(delay)
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if not any(name.lower() == "content-type" for name in headers):
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_OPTIONS = _answer
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MockServer:
+    """A MockEngine behind a local HTTP server in a background thread"""
+
+    def __init__(self, engine, host="127.0.0.1", port=0):
+        self.engine = engine
+        self.host = host
+        self.port = port
+        self._server = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        handler = type("EngineMockHandler", (MockHandler,), {"engine": self.engine})
+        self._server = ThreadingHTTPServer((self.host, self.port), handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self if self._server else self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
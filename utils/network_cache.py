@@ -0,0 +1,180 @@
+'''
+HAR recording and replay through page.route
+
+What it does:
+
+record  - every request of the page goes to the network as usual; request and
+          response (headers, base64 body) are written to a HAR file per test,
+          replacing the matching entries of an existing file
+replay  - requests are answered from the HAR; nothing in it goes to the network
+          Misses (requests not in the HAR) are reported, fetched live and added
+          to the HAR, or aborted with strict=True for fully hermetic runs
+          Entries older than max_age seconds are stale: they are fetched again
+          and replaced (the old copy is served if the network is unreachable)
+live    - no routing (default)
+
+Files live in network-cache/<test name>.har; @pytest.mark.har("checkout-flow")
+shares one file between the tests of a page-object flow.
+
+Run it:
+pytest tests/ --network-mode record
+pytest tests/ --network-mode replay --network-strict
+'''
+
+import base64
+import json
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+NETWORK_MODES = ("live", "record", "replay")
+HAR_DIR = Path("network-cache")
+DEFAULT_MAX_AGE = 7 * 24 * 3600
+
+# The stored body is already decoded, so these would no longer match it
+DROPPED_REPLAY_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+
+
+def _entry_key(method, url, post_data):
+    return f"{method} {url} {post_data or ''}"
+
+
+class NetworkCache:
+    """Records a page's traffic into a HAR file or serves it back from there"""
+
+    def __init__(self, path, mode="replay", strict=False, max_age=DEFAULT_MAX_AGE):
+        if mode not in NETWORK_MODES:
+            raise ValueError(f"Unknown network mode {mode!r}, expected one of {NETWORK_MODES}")
+        self.path = Path(path)
+        self.mode = mode
+        self.strict = strict
+        self.max_age = max_age
+        self.entries = {}
+        self.hits = 0
+        self.misses = []
+        self.refreshed = 0
+        self._dirty = False
+        if mode != "live":
+            self._load()
+
+    def attach(self, page):
+        if self.mode != "live":
+            page.route("**/*", self._handle)
+        return self
+
+    def _load(self):
+        try:
+            har = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return
+        for entry in har["log"]["entries"]:
+            request = entry["request"]
+            post_data = request.get("postData", {}).get("text")
+            self.entries[_entry_key(request["method"], request["url"], post_data)] = entry
+
+    def _handle(self, route):
+        request = route.request
+        key = _entry_key(request.method, request.url, request.post_data)
+        entry = self.entries.get(key)
+        if self.mode == "replay":
+            if entry is not None and not self._is_stale(entry):
+                self.hits += 1
+                self._fulfill_from(route, entry)
+                return
+            if entry is None:
+                self.misses.append(key.strip())
+                if self.strict:
+                    route.abort("internetdisconnected")
+                    return
+        try:
+            # Redirects are recorded as they are; the browser follows them itself
+            response = route.fetch(max_redirects=0)
+        except Exception:
+            if entry is None:
+                raise
+            # Stale but better than nothing while offline
+            self.hits += 1
+            self._fulfill_from(route, entry)
+            return
+        if entry is not None:
+            self.refreshed += 1
+        self.entries[key] = self._to_entry(request, response)
+        self._dirty = True
+        route.fulfill(response=response)
+
+    def _is_stale(self, entry):
+        return time.time() - entry.get("_recordedAt", 0) > self.max_age
+
+    def _fulfill_from(self, route, entry):
+        response = entry["response"]
+        content = response["content"]
+        body = content.get("text", "")
+        body = base64.b64decode(body) if content.get("encoding") == "base64" else body.encode()
+        route.fulfill(
+            status=response["status"],
+            headers={
+                header["name"]: header["value"]
+                for header in response["headers"]
+                if header["name"].lower() not in DROPPED_REPLAY_HEADERS
+            },
+            body=body,
+        )
+
+    @staticmethod
+    def _to_entry(request, response):
+        body = response.body()
+        headers = response.headers
+        entry = {
+            "startedDateTime": datetime.now(timezone.utc).isoformat(),
+            "time": 0,
+            "request": {
+                "method": request.method,
+                "url": request.url,
+                "httpVersion": "HTTP/1.1",
+                "headers": [{"name": name, "value": value} for name, value in request.headers.items()],
+                "queryString": [],
+                "cookies": [],
+                "headersSize": -1,
+                "bodySize": len(request.post_data_buffer or b""),
+            },
+            "response": {
+                "status": response.status,
+                "statusText": response.status_text,
+                "httpVersion": "HTTP/1.1",
+                "headers": [{"name": name, "value": value} for name, value in headers.items()],
+                "cookies": [],
+                "content": {
+                    "size": len(body),
+                    "mimeType": headers.get("content-type", "application/octet-stream"),
+                    "text": base64.b64encode(body).decode(),
+                    "encoding": "base64",
+                },
+                "redirectURL": headers.get("location", ""),
+                "headersSize": -1,
+                "bodySize": len(body),
+            },
+            "cache": {},
+            "timings": {"send": 0, "wait": 0, "receive": 0},
+            "_recordedAt": time.time(),
+        }
+        if request.post_data is not None:
+            entry["request"]["postData"] = {
+                "mimeType": request.headers.get("content-type", ""), "text": request.post_data,
+            }
+        return entry
+
+    def save(self):
+        """Write the HAR if anything was recorded, refreshed or added"""
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        har = {"log": {
+            "version": "1.2",
+            "creator": {"name": "network_cache", "version": "1.0"},
+            "entries": list(self.entries.values()),
+        }}
+        self.path.write_text(json.dumps(har, indent=1))
+        self._dirty = False
+
+    def stats(self):
+        return {"hits": self.hits, "misses": len(self.misses), "refreshed": self.refreshed}
@@ -0,0 +1,17 @@
+'''
+Node id helpers
+
+What it does:
+
+Schedulers such as --dist-by-shape and --dist loadgroup append "@<group>" to the
+node ids on the workers ("...::test_x@login:standard_user"); base_nodeid()
+gives back the id pytest can collect, for history keys and re-runs.
+Kept out of the plugin modules, so conftest and tools can import it at any time.
+'''
+
+
+def base_nodeid(nodeid):
+    """Node id without a scheduling suffix such as "@login:standard_user" """
+    if nodeid.rfind("@") > nodeid.rfind("]"):
+        return nodeid.rsplit("@", 1)[0]
+    return nodeid
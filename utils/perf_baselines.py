@@ -0,0 +1,179 @@
+'''
+Performance baselines with statistical regression detection
+
+What it does:
+
+Measures a navigation N times (after a few warmup runs) with the Web Vitals
+collector and keeps every sample, per page and metric, in
+performance-baselines/<page>-<browser>[-<throttling profile>].json
+A later run measures again and fails only when a metric is significantly slower:
+one-sided Mann-Whitney U test (p < alpha) AND a median slowdown of at least
+min_effect, so noise does not turn the build red but a 10% regression does
+
+Use it through the perf_baseline fixture:
+
+def test_inventory_load(self, page, perf_baseline):
+    perf_baseline.check("inventory", lambda: ProductsPage(page).navigate())
+
+Update baselines (after an accepted change, on the machine type CI uses):
+python -m utils.perf_baselines update            # runs the performance tests with --perf-update-baselines
+python -m utils.perf_baselines show
+'''
+
+import json
+import math
+import statistics
+import sys
+from pathlib import Path
+
+import pytest
+
+BASELINE_DIR = Path("performance-baselines")
+DEFAULT_METRICS = ("ttfb", "dom_content_loaded", "load", "fcp", "lcp")
+
+
+def mann_whitney_greater(current, baseline):
+    """One-sided p-value for "current tends to be larger than baseline"
+
+    Normal approximation with tie correction and continuity correction,
+    fine from about 8 samples per side.
+    """
+    n1, n2 = len(current), len(baseline)
+    values = sorted([(value, 0) for value in current] + [(value, 1) for value in baseline])
+    n = n1 + n2
+    ranks = [0.0] * n
+    tie_term = 0.0
+    start = 0
+    while start < n:
+        end = start
+        while end + 1 < n and values[end + 1][0] == values[start][0]:
+            end += 1
+        for index in range(start, end + 1):
+            ranks[index] = (start + end) / 2 + 1
+        ties = end - start + 1
+        tie_term += ties ** 3 - ties
+        start = end + 1
+    rank_sum = sum(rank for rank, (_, group) in zip(ranks, values) if group == 0)
+    u = rank_sum - n1 * (n1 + 1) / 2
+    mean = n1 * n2 / 2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - mean - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def compare(current, baseline, alpha=0.01, min_effect=0.05):
+    """Per metric: medians, relative change, p-value and whether it is a regression"""
+    results = {}
+    for metric, samples in current.items():
+        reference = baseline.get(metric)
+        if not reference or not samples:
+            continue
+        median, reference_median = statistics.median(samples), statistics.median(reference)
+        change = (median - reference_median) / reference_median if reference_median else 0.0
+        p_value = mann_whitney_greater(samples, reference)
+        results[metric] = {
+            "median": round(median, 2),
+            "baseline_median": round(reference_median, 2),
+            "change": round(change, 4),
+            "p_value": round(p_value, 5),
+            "regression": p_value < alpha and change >= min_effect,
+        }
+    return results
+
+
+class BaselineStore:
+    """One JSON file of samples per page and browser"""
+
+    def __init__(self, directory=BASELINE_DIR):
+        self.directory = Path(directory)
+
+    def _path(self, key):
+        return self.directory / f"{key}.json"
+
+    def load(self, key):
+        try:
+            return json.loads(self._path(key).read_text())["samples"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def save(self, key, samples):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._path(key).write_text(json.dumps({"samples": samples}, indent=2))
+
+    def keys(self):
+        return sorted(path.stem for path in self.directory.glob("*.json"))
+
+
+class PerformanceBaseline:
+    """Measures a navigation repeatedly and compares it with (or records) the baseline"""
+
+    def __init__(self, web_vitals, browser_name, store=None, runs=15, warmup=2,
+                 alpha=0.01, min_effect=0.05, update=False):
+        self.web_vitals = web_vitals
+        self.browser_name = browser_name
+        self.store = store or BaselineStore()
+        self.runs = runs
+        self.warmup = warmup
+        self.alpha = alpha
+        self.min_effect = min_effect
+        self.update = update
+        self.results = {}
+
+    def measure(self, navigate, metrics=DEFAULT_METRICS):
+        """metric -> list of samples over the measured runs (warmup runs are dropped)"""
+        samples = {metric: [] for metric in metrics}
+        for run in range(self.warmup + self.runs):
+            navigate()
+            sample = self.web_vitals.collect()
+            if run < self.warmup:
+                continue
+            for metric in metrics:
+                if sample.get(metric) is not None:
+                    samples[metric].append(sample[metric])
+        return {metric: values for metric, values in samples.items() if values}
+
+    def check(self, name, navigate, metrics=DEFAULT_METRICS):
+        """Fail on a significant regression against the stored baseline (or store it in update mode)"""
+        key = f"{name}-{self.browser_name}"
+        if self.web_vitals.profile:
+            key += f"-{self.web_vitals.profile}"
+        samples = self.measure(navigate, metrics)
+        if self.update:
+            self.store.save(key, samples)
+            return {}
+        baseline = self.store.load(key)
+        if baseline is None:
+            pytest.skip(f"No performance baseline for {key}; record one with --perf-update-baselines")
+        results = compare(samples, baseline, alpha=self.alpha, min_effect=self.min_effect)
+        self.results[key] = results
+        regressions = {metric: result for metric, result in results.items() if result["regression"]}
+        assert not regressions, f"{key} slower than baseline: " + ", ".join(
+            f"{metric} {result['baseline_median']} -> {result['median']}ms "
+            f"(+{result['change']:.0%}, p={result['p_value']})"
+            for metric, result in regressions.items()
+        )
+        return results
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    command = argv.pop(0) if argv else "show"
+    if command == "update":
+        return pytest.main(["-m", "performance", "--perf-update-baselines", *argv])
+    if command == "show":
+        store = BaselineStore()
+        for key in store.keys():
+            samples = store.load(key) or {}
+            medians = ", ".join(
+                f"{metric} {statistics.median(values):.1f}" for metric, values in samples.items() if values
+            )
+            print(f"{key}: {medians}")
+        return 0
+    print("usage: python -m utils.perf_baselines [show | update [pytest args]]")
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+'''
+Resource-blocking policy for the test pages
+
+What it does:
+
+Aborts requests the tests do not need, by category:
+image, font, media  - by Playwright resource type
+analytics           - known tracking / telemetry hosts
+third-party         - any host outside the site under test (BASE_URL's domain)
+Everything else falls through to the other routes (HAR replay, asset cache) or the network.
+
+Categories come from PlaywrightConfig.BLOCK_RESOURCES (off by default, "image,font,analytics"
+in the ci and load profiles), per test from @pytest.mark.resource_policy("image,media") or
+@pytest.mark.resource_policy("none"); visual and accessibility tests are never blocked.
+Blocked requests are counted per category and test.
+
+A route turns off the browser HTTP cache and sends every request it matches
+through Python, so "analytics" alone only routes the analytics hosts; the
+other categories need to see every request.
+'''
+
+import re
+from urllib.parse import urlsplit
+
+BLOCK_CATEGORIES = ("image", "font", "media", "analytics", "third-party")
+
+# Markers whose tests must see the page exactly as users do
+OPT_OUT_MARKERS = ("visual", "accessibility")
+
+ANALYTICS_HOSTS = (
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net", "segment.io", "segment.com",
+    "optimizely.com", "hotjar.com", "backtrace.io", "newrelic.com", "nr-data.net", "facebook.net",
+    "mixpanel.com", "amplitude.com", "fullstory.com", "sentry.io",
+)
+
+# Requests to the analytics hosts (and their subdomains) only
+ANALYTICS_URLS = re.compile(
+    r"^[a-z]+://([^/?#]*\.)?(" + "|".join(re.escape(host) for host in ANALYTICS_HOSTS) + r")(:\d+)?([/?#]|$)"
+)
+
+
+def parse_categories(value):
+    """'image, font' -> ("image", "font"); 'none' or '' -> ()"""
+    if isinstance(value, (list, tuple)):
+        categories = tuple(value)
+    else:
+        categories = tuple(part.strip() for part in (value or "").split(",") if part.strip())
+    if categories in ((), ("none",)):
+        return ()
+    unknown = set(categories) - set(BLOCK_CATEGORIES)
+    if unknown:
+        raise ValueError(f"Unknown resource categories {sorted(unknown)}, expected {BLOCK_CATEGORIES}")
+    return categories
+
+
+def _matches(host, domains):
+    return any(host == domain or host.endswith("." + domain) for domain in domains)
+
+
+def site_domain(base_url):
+    """Domain whose subdomains count as first party (www.saucedemo.com -> saucedemo.com)"""
+    host = urlsplit(base_url).hostname or ""
+    labels = host.split(".")
+    if host.replace(".", "").isdigit() or len(labels) <= 2:
+        return host
+    return ".".join(labels[-2:])
+
+
+class ResourcePolicy:
+    """Blocks requests by category on a page and counts what it blocked"""
+
+    def __init__(self, categories, base_url):
+        self.categories = parse_categories(categories)
+        self.first_party = site_domain(base_url)
+        self.blocked = {}
+
+    def category_of(self, request):
+        """The first blocked category the request falls in, or None"""
+        host = urlsplit(request.url).hostname or ""
+        if not host:
+            return None
+        if "analytics" in self.categories and _matches(host, ANALYTICS_HOSTS):
+            return "analytics"
+        if "third-party" in self.categories and not _matches(host, (self.first_party,)):
+            return "third-party"
+        if request.resource_type in self.categories:
+            return request.resource_type
+        return None
+
+    def attach(self, page):
+        if self.categories == ("analytics",):
+            page.route(ANALYTICS_URLS, self._handle)
+        elif self.categories:
+            page.route("**/*", self._handle)
+        return self
+
+    def _handle(self, route):
+        category = self.category_of(route.request)
+        if category is None:
+            route.fallback()
+            return
+        self.blocked[category] = self.blocked.get(category, 0) + 1
+        route.abort("blockedbyclient")
+
+    @property
+    def blocked_count(self):
+        return sum(self.blocked.values())
@@ -0,0 +1,31 @@
+'''
+Session counters that survive pytest-xdist
+
+Fixtures add named counters with add(); on a worker they are also handed to
+the controller through config.workeroutput, where merge_worker() sums them
+so the terminal summary shows totals for the whole run.
+'''
+
+import pytest
+
+_STATS_KEY = pytest.StashKey[dict]()
+
+
+def add(config, section, counters):
+    """Add counters (name -> number) to a section of the session totals"""
+    totals = config.stash.setdefault(_STATS_KEY, {})
+    section_totals = totals.setdefault(section, {})
+    for name, value in counters.items():
+        section_totals[name] = section_totals.get(name, 0) + value
+    if hasattr(config, "workeroutput"):
+        config.workeroutput["session_stats"] = totals
+
+
+def merge_worker(config, node):
+    """Fold the counters of a finished xdist worker into the controller totals"""
+    for section, counters in getattr(node, "workeroutput", {}).get("session_stats", {}).items():
+        add(config, section, counters)
+
+
+def get(config):
+    return config.stash.get(_STATS_KEY, {})
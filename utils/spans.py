@@ -0,0 +1,208 @@
+'''
+Timing spans for page-object actions
+
+What it does:
+
+With --spans, every public method of every page object (BasePage subclasses)
+records a span: page object, method, arguments, duration and the Playwright
+locator actions it ran (selector + action, as child spans)
+Spans are written per test to test-results/spans/<test>.json and as a folded
+stack file (<test>.folded) that flamegraph.pl / speedscope read directly
+
+Without --spans nothing is wrapped or patched, so the page objects run their
+original functions and cost nothing extra.
+
+Run it:
+pytest tests/test_cart.py --spans
+flamegraph.pl test-results/spans/test_add_single_item_to_cart.folded > cart.svg
+'''
+
+import functools
+import inspect
+import json
+import time
+from pathlib import Path
+
+from playwright.sync_api import Locator, Page
+
+from pages.base_page import BasePage
+
+SPANS_DIR = Path("test-results") / "spans"
+
+# Locator and Page calls recorded as leaf spans under the page-object method
+LOCATOR_ACTIONS = (
+    "all_inner_texts", "all_text_contents", "check", "clear", "click", "count", "dblclick",
+    "evaluate", "evaluate_all", "fill", "get_attribute", "hover", "inner_text", "input_value",
+    "is_checked", "is_enabled", "is_visible", "press", "select_option", "text_content",
+    "type", "uncheck", "wait_for",
+)
+PAGE_ACTIONS = ("goto", "reload", "evaluate", "wait_for_load_state", "wait_for_url")
+
+# Set while a test is being recorded; None means spans are dropped
+_active = None
+_originals = {}
+
+
+class SpanRecorder:
+    """Collects the spans of one test as a tree"""
+
+    def __init__(self, name):
+        self.name = name
+        self.roots = []
+        self._stack = []
+
+    def open(self, name, detail):
+        span = {"name": name, "detail": detail, "start": time.perf_counter(), "duration": 0.0, "children": []}
+        (self._stack[-1]["children"] if self._stack else self.roots).append(span)
+        self._stack.append(span)
+        return span
+
+    def close(self, span, error=None):
+        span["duration"] = time.perf_counter() - span["start"]
+        if error is not None:
+            span["error"] = type(error).__name__
+        self._stack.pop()
+
+    def as_dicts(self):
+        """Spans with start offsets in ms relative to the first span"""
+        origin = self.roots[0]["start"] if self.roots else 0.0
+
+        def convert(span):
+            result = {
+                "name": span["name"],
+                "detail": span["detail"],
+                "start_ms": round((span["start"] - origin) * 1000, 3),
+                "duration_ms": round(span["duration"] * 1000, 3),
+            }
+            if "error" in span:
+                result["error"] = span["error"]
+            if span["children"]:
+                result["children"] = [convert(child) for child in span["children"]]
+            return result
+
+        return [convert(span) for span in self.roots]
+
+    def folded(self):
+        """Folded stacks ("test;Page.method;Locator.click 1234"), weight = self time in microseconds"""
+        weights = {}
+
+        def walk(span, prefix):
+            stack = f"{prefix};{span['name']}"
+            children_time = sum(child["duration"] for child in span["children"])
+            self_time = int(max(span["duration"] - children_time, 0.0) * 1_000_000)
+            weights[stack] = weights.get(stack, 0) + self_time
+            for child in span["children"]:
+                walk(child, stack)
+
+        for span in self.roots:
+            walk(span, self.name)
+        return "".join(f"{stack} {weight}\n" for stack, weight in weights.items() if weight)
+
+    def total(self):
+        return sum(span["duration"] for span in self.roots)
+
+    def dump(self, directory=SPANS_DIR):
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / f"{self.name}.json").write_text(json.dumps(self.as_dicts(), indent=2))
+        (directory / f"{self.name}.folded").write_text(self.folded())
+
+
+def start(name):
+    """Record spans for one test until stop()"""
+    global _active
+    _active = SpanRecorder(name)
+    return _active
+
+
+def stop():
+    global _active
+    recorder, _active = _active, None
+    return recorder
+
+
+def _span(name, detail, function, *args, **kwargs):
+    recorder = _active
+    span = recorder.open(name, detail)
+    try:
+        result = function(*args, **kwargs)
+    except BaseException as error:
+        recorder.close(span, error)
+        raise
+    recorder.close(span)
+    return result
+
+
+def _describe_args(args, kwargs, names=()):
+    """Readable call arguments; anything called *password* is masked"""
+    named = list(zip(names, args)) + list(kwargs.items())
+    parts = [repr(arg) for arg in args[len(names):]] + [
+        f"{key}={'***' if 'password' in key else repr(value)}" for key, value in named
+    ]
+    return ", ".join(parts)
+
+
+def _wrap_page_method(name, function):
+    code = function.__code__
+    names = code.co_varnames[1:code.co_argcount]
+
+    @functools.wraps(function)
+    def wrapper(self, *args, **kwargs):
+        if _active is None:
+            return function(self, *args, **kwargs)
+        return _span(
+            f"{type(self).__name__}.{name}", _describe_args(args, kwargs, names), function, self, *args, **kwargs
+        )
+
+    wrapper.__span_original__ = function
+    return wrapper
+
+
+def _wrap_playwright_method(owner, name, function, describe):
+    @functools.wraps(function)
+    def wrapper(self, *args, **kwargs):
+        if _active is None or not _active._stack:
+            return function(self, *args, **kwargs)
+        return _span(f"{owner}.{name}", describe(self, args), function, self, *args, **kwargs)
+
+    return wrapper
+
+
+def _selector(locator):
+    return getattr(getattr(locator, "_impl_obj", None), "_selector", repr(locator))
+
+
+def _page_objects(cls=BasePage):
+    yield cls
+    for subclass in cls.__subclasses__():
+        yield from _page_objects(subclass)
+
+
+def instrument():
+    """Wrap page-object methods and Playwright actions (safe to call again for new subclasses)"""
+    for cls in _page_objects():
+        for name, function in list(vars(cls).items()):
+            if name.startswith("_") or not inspect.isfunction(function) or hasattr(function, "__span_original__"):
+                continue
+            _originals[(cls, name)] = function
+            setattr(cls, name, _wrap_page_method(name, function))
+    if (Locator, None) in _originals:
+        return
+    _originals[(Locator, None)] = None
+    for name in LOCATOR_ACTIONS:
+        _originals[(Locator, name)] = getattr(Locator, name)
+        setattr(Locator, name, _wrap_playwright_method(
+            "Locator", name, getattr(Locator, name), lambda locator, args: _selector(locator)
+        ))
+    for name in PAGE_ACTIONS:
+        _originals[(Page, name)] = getattr(Page, name)
+        setattr(Page, name, _wrap_playwright_method(
+            "Page", name, getattr(Page, name), lambda page, args: _describe_args(args, {})
+        ))
+
+
+def uninstrument():
+    """Put every original function back"""
+    for (owner, name), function in _originals.items():
+        if name is not None:
+            setattr(owner, name, function)
+    _originals.clear()
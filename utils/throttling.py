@@ -0,0 +1,70 @@
+'''
+CPU and network throttling profiles (Chromium, through a CDP session)
+
+What it does:
+
+Named profiles modelled on the Chrome DevTools presets:
+slow-3g          2000 ms latency, 400 kbit/s down / up
+fast-3g          563 ms latency, 1.44 Mbit/s down, 675 kbit/s up
+fast-4g          165 ms latency, 8.1 Mbit/s down, 1.35 Mbit/s up
+cpu-4x           4x CPU slowdown, full network speed
+mid-range-phone  fast-4g + 4x CPU slowdown
+
+apply_throttling(page, "slow-3g") opens a CDP session on the page and sends
+Network.emulateNetworkConditions / Emulation.setCPUThrottlingRate; it lasts as
+long as the page. Firefox and WebKit have no CDP, so it returns None there.
+
+In tests: @pytest.mark.throttle("slow-3g") or --throttle slow-3g (the page
+fixture applies it; for device contexts call the throttle fixture on the page)
+'''
+
+THROTTLING_PROFILES = {
+    "slow-3g": {
+        "network": {"latency": 2000, "download_throughput": 50_000, "upload_throughput": 50_000},
+        "budget_factor": 8,
+    },
+    "fast-3g": {
+        "network": {"latency": 562.5, "download_throughput": 180_000, "upload_throughput": 84_375},
+        "budget_factor": 4,
+    },
+    "fast-4g": {
+        "network": {"latency": 165, "download_throughput": 1_012_500, "upload_throughput": 168_750},
+        "budget_factor": 1.5,
+    },
+    "cpu-4x": {
+        "cpu_rate": 4,
+        "budget_factor": 2,
+    },
+    "mid-range-phone": {
+        "network": {"latency": 165, "download_throughput": 1_012_500, "upload_throughput": 168_750},
+        "cpu_rate": 4,
+        "budget_factor": 3,
+    },
+}
+
+
+def budget_factor(profile):
+    """How much slower than the page budget a profile may be (1 without throttling)"""
+    return THROTTLING_PROFILES[profile]["budget_factor"] if profile else 1
+
+
+def apply_throttling(page, profile):
+    """Throttle the page with a named profile; returns the CDP session, or None if not Chromium"""
+    if profile not in THROTTLING_PROFILES:
+        raise ValueError(f"Unknown throttling profile {profile!r}, expected one of {sorted(THROTTLING_PROFILES)}")
+    if page.context.browser.browser_type.name != "chromium":
+        return None
+    settings = THROTTLING_PROFILES[profile]
+    session = page.context.new_cdp_session(page)
+    network = settings.get("network")
+    if network:
+        session.send("Network.enable")
+        session.send("Network.emulateNetworkConditions", {
+            "offline": False,
+            "latency": network["latency"],
+            "downloadThroughput": network["download_throughput"],
+            "uploadThroughput": network["upload_throughput"],
+        })
+    if settings.get("cpu_rate"):
+        session.send("Emulation.setCPUThrottlingRate", {"rate": settings["cpu_rate"]})
+    return session
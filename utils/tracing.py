@@ -0,0 +1,90 @@
+'''
+Trace policies for the trace_on_failure fixture
+
+Policies:
+
+off                - record nothing
+on-first-retry     - full Playwright trace, only when a test is re-run for the first time
+                     (pytest-rerunfailures sets item.execution_count)
+retain-on-failure  - keep a bounded ring of recent page events in memory and write it,
+                     plus one screenshot, only when the test fails (default, cheap)
+full               - Playwright trace with screenshots, snapshots and sources on every
+                     test, saved on failure (the original behavior)
+
+Pick one with --trace-policy or per test with @pytest.mark.trace_policy("full").
+'''
+
+import json
+import time
+from collections import deque
+from pathlib import Path
+
+TRACE_POLICIES = ("off", "on-first-retry", "retain-on-failure", "full")
+DEFAULT_TRACE_POLICY = "retain-on-failure"
+
+RESULTS_DIR = Path("test-results")
+
+
+class ActionRing:
+    """Bounded in-memory log of the latest page events"""
+
+    def __init__(self, size=200):
+        self.events = deque(maxlen=size)
+        self._started = time.perf_counter()
+
+    def record(self, kind, detail):
+        elapsed_ms = round((time.perf_counter() - self._started) * 1000, 1)
+        self.events.append({"t_ms": elapsed_ms, "kind": kind, "detail": detail})
+
+    def attach(self, page):
+        """Listen to the cheap page events (no snapshots, no screenshots)"""
+        page.on("framenavigated", lambda frame: frame == page.main_frame and self.record("navigate", frame.url))
+        page.on("request", lambda request: self.record("request", f"{request.method} {request.url}"))
+        page.on("requestfailed", lambda request: self.record("requestfailed", request.url))
+        page.on("console", lambda message: self.record(f"console.{message.type}", message.text))
+        page.on("pageerror", lambda error: self.record("pageerror", str(error)))
+        page.on("dialog", lambda dialog: self.record("dialog", dialog.message))
+
+    def dump(self, path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(list(self.events), indent=2))
+
+
+class TraceRecorder:
+    """Applies one trace policy to one test and times what it costs"""
+
+    def __init__(self, page, policy, name, execution_count=1, ring_size=200):
+        if policy not in TRACE_POLICIES:
+            raise ValueError(f"Unknown trace policy {policy!r}, expected one of {TRACE_POLICIES}")
+        self.page = page
+        self.policy = policy
+        self.name = name
+        self.execution_count = execution_count
+        self.ring = None
+        self.elapsed = 0.0
+        self._tracing = False
+        self._ring_size = ring_size
+
+    def start(self):
+        started = time.perf_counter()
+        if self.policy == "full" or (self.policy == "on-first-retry" and self.execution_count == 2):
+            self.page.context.tracing.start(screenshots=True, snapshots=True, sources=True)
+            self._tracing = True
+        elif self.policy == "retain-on-failure":
+            self.ring = ActionRing(self._ring_size)
+            self.ring.attach(self.page)
+        self.elapsed += time.perf_counter() - started
+
+    def stop(self, failed):
+        """Finish recording; artifacts are written only for failed tests"""
+        started = time.perf_counter()
+        if self._tracing:
+            if failed:
+                self.page.context.tracing.stop(path=RESULTS_DIR / f"trace-{self.name}.zip")
+            else:
+                self.page.context.tracing.stop()
+        elif self.ring is not None and failed:
+            self.ring.dump(RESULTS_DIR / f"actions-{self.name}.json")
+            if not self.page.is_closed():
+                self.page.screenshot(path=RESULTS_DIR / f"failure-{self.name}.png")
+        self.elapsed += time.perf_counter() - started
@@ -0,0 +1,104 @@
+'''
+Concurrent user journeys on one event loop
+
+What it does:
+
+Runs N async journeys (coroutines using the async page objects) at the same time,
+each in its own browser context, all on one asyncio loop and one browser
+The sync Playwright used by the tests already owns the test thread, so the loop
+runs in a helper thread with its own async Playwright and browser
+
+Example:
+
+async def login(page, index):
+    login_page = AsyncLoginPage(page)
+    await login_page.navigate()
+    await login_page.login("standard_user", "secret_sauce")
+    return await login_page.is_logged_in()
+
+results = VirtualUsers(context_options={"base_url": url}).run(login, users=20)
+assert all(result.ok and result.value for result in results)
+'''
+
+import asyncio
+import threading
+import time
+import traceback
+
+from playwright.async_api import async_playwright
+
+
+class JourneyResult:
+    """Outcome of one user's journey"""
+
+    def __init__(self, index, value=None, error=None, started=0.0, duration=0.0):
+        self.index = index
+        self.value = value
+        self.error = error
+        self.started = started
+        self.duration = duration
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        state = "ok" if self.ok else f"error={self.error!r}"
+        return f"<JourneyResult user={self.index} {state} {self.duration:.2f}s>"
+
+
+class VirtualUsers:
+    """Runs async page-object journeys concurrently, one browser context per user"""
+
+    def __init__(self, browser_name="chromium", launch_options=None, context_options=None):
+        self.browser_name = browser_name
+        self.launch_options = launch_options or {}
+        self.context_options = context_options or {}
+
+    def run(self, journey, users, concurrency=None, timeout=None):
+        """Run journey(page, index) for every user and return their JourneyResults in order"""
+        outcome = {}
+
+        def target():
+            try:
+                outcome["results"] = asyncio.run(self.run_async(journey, users, concurrency))
+            except BaseException as error:
+                outcome["error"] = error
+
+        thread = threading.Thread(target=target, name="virtual-users", daemon=True)
+        thread.start()
+        thread.join(timeout)
+        if thread.is_alive():
+            raise TimeoutError(f"{users} virtual users did not finish within {timeout}s")
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome["results"]
+
+    async def run_async(self, journey, users, concurrency=None):
+        """Same as run(), for callers that already have an event loop"""
+        async with async_playwright() as playwright:
+            browser = await getattr(playwright, self.browser_name).launch(**self.launch_options)
+            try:
+                return await self.run_on(browser, journey, users, concurrency)
+            finally:
+                await browser.close()
+
+    async def run_on(self, browser, journey, users, concurrency=None):
+        limit = asyncio.Semaphore(concurrency or users)
+
+        async def one_user(index):
+            async with limit:
+                context = await browser.new_context(**self.context_options)
+                started = time.perf_counter()
+                result = JourneyResult(index, started=started)
+                try:
+                    page = await context.new_page()
+                    result.value = await journey(page, index)
+                except Exception as error:
+                    result.error = "".join(traceback.format_exception_only(type(error), error)).strip()
+                finally:
+                    result.duration = time.perf_counter() - started
+                    await context.close()
+                return result
+
+        return await asyncio.gather(*(one_user(index) for index in range(users)))
@@ -0,0 +1,182 @@
+'''
+Visual baseline repository
+
+What it does:
+
+Keeps every screenshot baseline under one key per test, browser, viewport and
+device: "products-page/chromium/1280x720/desktop", "login-page/webkit/390x664/iPhone 12"
+visual-baselines/manifest.json  - index: key -> name, browser, viewport, device, sha256, size
+visual-baselines/blobs/<sha256>.png - the images, stored once per content, so
+                                     identical screenshots (e.g. the same login
+                                     page on two phones) share one file
+Writes happen under a lock file, so xdist workers can record at the same time.
+Blobs nobody references any more are deleted when an entry changes.
+
+Failing and missing checks are listed in test-results/visual/pending.json; the
+update command re-runs only those tests (in parallel) and re-records only the
+entries that really differ.
+
+Run it:
+python -m utils.visual_baselines show
+python -m utils.visual_baselines update -n 4      # failing / missing entries only
+python -m utils.visual_baselines update --all     # every visual test
+python -m utils.visual_baselines prune            # drop blobs outside the manifest
+'''
+
+import hashlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from utils.asset_cache import FileLock
+from utils.nodeids import base_nodeid
+
+BASELINE_DIR = Path("visual-baselines")
+PENDING_PATH = Path("test-results/visual/pending.json")
+DEFAULT_DEVICE = "desktop"
+
+
+def viewport_label(page):
+    size = page.viewport_size
+    return f"{size['width']}x{size['height']}" if size else "no-viewport"
+
+
+def baseline_key(name, browser_name, viewport, device=None):
+    return "/".join((name, browser_name, viewport, device or DEFAULT_DEVICE))
+
+
+def _write_json(path, data):
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(data, indent=1, sort_keys=True))
+    os.replace(tmp_path, path)
+
+
+def _read_json(path):
+    try:
+        return json.loads(Path(path).read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+class BaselineStore:
+    """Manifest of baseline keys over content-addressed PNG blobs"""
+
+    def __init__(self, directory=BASELINE_DIR):
+        self.directory = Path(directory)
+        self.blobs = self.directory / "blobs"
+        self.manifest_path = self.directory / "manifest.json"
+        self.lock = FileLock(self.directory / "lock")
+
+    def manifest(self):
+        return _read_json(self.manifest_path)
+
+    def entry(self, key):
+        return self.manifest().get(key)
+
+    def load(self, key):
+        """PNG bytes of the baseline, or None"""
+        entry = self.entry(key)
+        if entry is None:
+            return None
+        try:
+            return (self.blobs / f"{entry['sha256']}.png").read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def save(self, key, png, **metadata):
+        """Store the image (once per content) and point the key at it"""
+        digest = hashlib.sha256(png).hexdigest()
+        self.blobs.mkdir(parents=True, exist_ok=True)
+        blob = self.blobs / f"{digest}.png"
+        # Under the lock, so another worker cannot drop the blob before the manifest points at it
+        with self.lock:
+            if not blob.exists():
+                tmp_path = blob.with_suffix(f".{os.getpid()}.tmp")
+                tmp_path.write_bytes(png)
+                os.replace(tmp_path, blob)
+            manifest = self.manifest()
+            previous = manifest.get(key, {}).get("sha256")
+            manifest[key] = {**metadata, "sha256": digest, "bytes": len(png), "updated": time.time()}
+            _write_json(self.manifest_path, manifest)
+            if previous and previous != digest:
+                self._drop_unreferenced(manifest, (previous,))
+        return digest
+
+    def prune(self):
+        """Delete blobs the manifest does not reference; returns how many"""
+        self.blobs.mkdir(parents=True, exist_ok=True)
+        with self.lock:
+            manifest = self.manifest()
+            digests = [path.stem for path in self.blobs.glob("*.png")]
+            return self._drop_unreferenced(manifest, digests)
+
+    def _drop_unreferenced(self, manifest, digests):
+        referenced = {entry["sha256"] for entry in manifest.values()}
+        dropped = 0
+        for digest in set(digests) - referenced:
+            (self.blobs / f"{digest}.png").unlink(missing_ok=True)
+            dropped += 1
+        return dropped
+
+
+class PendingList:
+    """Keys of failing or missing checks and the tests that produce them"""
+
+    def __init__(self, path=PENDING_PATH):
+        self.path = Path(path)
+        self.lock = FileLock(self.path.with_suffix(".lock"))
+
+    def mark(self, key, nodeid, reason):
+        self._change(lambda pending: pending.__setitem__(key, {"nodeid": nodeid, "reason": reason}))
+
+    def clear(self, key):
+        if key in self.load():
+            self._change(lambda pending: pending.pop(key, None))
+
+    def load(self):
+        return _read_json(self.path)
+
+    def _change(self, update):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.lock:
+            pending = self.load()
+            update(pending)
+            _write_json(self.path, pending)
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    command = argv.pop(0) if argv else "show"
+    if command == "show":
+        manifest = BaselineStore().manifest()
+        for key, entry in sorted(manifest.items()):
+            print(f"{key}: {entry['sha256'][:12]} ({entry['bytes'] / 1024:.0f} KB)")
+        unique = {entry["sha256"]: entry["bytes"] for entry in manifest.values()}
+        print(f"{len(manifest)} baselines, {len(unique)} images, {sum(unique.values()) / 1024:.0f} KB")
+        for key, entry in sorted(PendingList().load().items()):
+            print(f"pending ({entry['reason']}): {key} <- {entry['nodeid']}")
+        return 0
+    if command == "update":
+        if "--all" in argv:
+            argv.remove("--all")
+            return pytest.main(["-m", "visual", "--visual-update", *argv])
+        nodeids = sorted({base_nodeid(entry["nodeid"]) for entry in PendingList().load().values()})
+        if not nodeids:
+            print("No failing or missing visual baselines")
+            return 0
+        if len(nodeids) > 1 and not any(arg.startswith("-n") for arg in argv):
+            argv = ["-n", "auto", *argv]
+        return pytest.main([*nodeids, "--visual-update", *argv])
+    if command == "prune":
+        print(f"Deleted {BaselineStore().prune()} unreferenced images")
+        return 0
+    print("usage: python -m utils.visual_baselines [show | update [--all] [pytest args] | prune]")
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
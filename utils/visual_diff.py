@@ -0,0 +1,255 @@
+'''
+Perceptual screenshot comparison with NumPy
+
+What it does:
+
+compare(actual_png, baseline_png) decides whether two screenshots match:
+1. Same SHA-256 of the PNG bytes -> identical, no decoding at all
+2. Otherwise both are decoded once and compared as whole arrays:
+   - colour distance in YIQ space (the pixelmatch metric), so changes the eye
+     barely sees stay under the threshold
+   - anti-aliasing tolerance: a pixel whose colour exists in the 3x3
+     neighbourhood of the other image (a 1px shift, a blended edge) is ignored
+   - mask rectangles (x, y, width, height) are left out
+3. A diff image (changes in red over a faded baseline) is built only on request,
+   i.e. when a check fails
+
+Page objects list selectors of dynamic content in VISUAL_MASKS; VisualCheck
+covers them when taking the screenshot, so hashes stay stable.
+Baselines are kept per test, browser, viewport and device (utils/visual_baselines.py);
+a missing one is recorded (the test is skipped), --visual-update re-records the
+ones that differ, and a failing check writes <key>-actual.png and <key>-diff.png
+to test-results/visual/
+
+Use it through the visual_check fixture:
+
+def test_products_page_visual(self, page, visual_check):
+    visual_check.check("products-page", page, ProductsPage(page), max_diff_pixels=100)
+'''
+
+import hashlib
+import io
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from utils.visual_baselines import DEFAULT_DEVICE, BaselineStore, PendingList, baseline_key, viewport_label
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+# Largest possible YIQ distance between two colours (black vs white)
+MAX_YIQ_DELTA = 35215.0
+
+OUTPUT_DIR = Path("test-results/visual")
+
+
+def sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def decode_png(data):
+    """PNG bytes -> height x width x 3 uint8 array"""
+    if Image is None:
+        raise RuntimeError("Visual comparison needs Pillow: pip install -r requirements.txt")
+    with Image.open(io.BytesIO(data)) as image:
+        return np.asarray(image.convert("RGB"))
+
+
+def encode_png(array):
+    buffer = io.BytesIO()
+    Image.fromarray(array).save(buffer, format="PNG", optimize=True)
+    return buffer.getvalue()
+
+
+def yiq_delta(first, second):
+    """Per-pixel perceptual colour distance (0 .. MAX_YIQ_DELTA) of two RGB arrays"""
+    first = first.astype(np.float32)
+    second = second.astype(np.float32)
+    r, g, b = (first[..., channel] - second[..., channel] for channel in range(3))
+    y = r * 0.29889531 + g * 0.58662247 + b * 0.11448223
+    i = r * 0.59597799 - g * 0.27417610 - b * 0.32180189
+    q = r * 0.21147017 - g * 0.52261711 + b * 0.31114694
+    return 0.5053 * y * y + 0.299 * i * i + 0.1957 * q * q
+
+
+def _neighbourhood_range(image):
+    """Per-channel min and max over each pixel's 3x3 neighbourhood"""
+    padded = np.pad(image, ((1, 1), (1, 1), (0, 0)), mode="edge")
+    height, width = image.shape[:2]
+    shifts = [padded[dy:dy + height, dx:dx + width] for dy in range(3) for dx in range(3)]
+    stacked = np.stack(shifts)
+    return stacked.min(axis=0), stacked.max(axis=0)
+
+
+def _within(image, low, high, tolerance):
+    return np.all((image.astype(np.int16) >= low.astype(np.int16) - tolerance)
+                  & (image.astype(np.int16) <= high.astype(np.int16) + tolerance), axis=-1)
+
+
+class DiffResult:
+    """Outcome of one comparison"""
+
+    def __init__(self, identical, diff_pixels=0, total_pixels=0, size_mismatch=False,
+                 elapsed_ms=0.0, mask=None, baseline=None):
+        self.identical = identical
+        self.diff_pixels = diff_pixels
+        self.total_pixels = total_pixels
+        self.size_mismatch = size_mismatch
+        self.elapsed_ms = elapsed_ms
+        self._mask = mask
+        self._baseline = baseline
+
+    @property
+    def diff_ratio(self):
+        return self.diff_pixels / self.total_pixels if self.total_pixels else 0.0
+
+    def passed(self, max_diff_pixels=0, max_diff_ratio=None):
+        if self.size_mismatch:
+            return False
+        if max_diff_ratio is not None:
+            return self.diff_ratio <= max_diff_ratio
+        return self.diff_pixels <= max_diff_pixels
+
+    def diff_image(self):
+        """PNG bytes: differing pixels in red over a faded grey baseline"""
+        if self._mask is None:
+            return None
+        grey = self._baseline.mean(axis=-1, keepdims=True).astype(np.float32)
+        image = np.repeat(255 - (255 - grey) * 0.25, 3, axis=-1).astype(np.uint8)
+        image[self._mask] = (255, 0, 0)
+        return encode_png(image)
+
+
+def compare(actual_png, baseline_png, threshold=0.1, anti_aliasing=True, masks=(), aa_tolerance=2):
+    """Compare two PNG screenshots; threshold is the pixelmatch colour threshold (0..1)"""
+    started = time.perf_counter()
+    if sha256(actual_png) == sha256(baseline_png):
+        return DiffResult(True, elapsed_ms=(time.perf_counter() - started) * 1000)
+    result = compare_arrays(
+        decode_png(actual_png), decode_png(baseline_png),
+        threshold=threshold, anti_aliasing=anti_aliasing, masks=masks, aa_tolerance=aa_tolerance,
+    )
+    result.elapsed_ms = (time.perf_counter() - started) * 1000
+    return result
+
+
+def compare_arrays(actual, baseline, threshold=0.1, anti_aliasing=True, masks=(), aa_tolerance=2):
+    """Compare two decoded RGB arrays (see compare())"""
+    started = time.perf_counter()
+    if actual.shape != baseline.shape:
+        return DiffResult(False, size_mismatch=True, total_pixels=actual.shape[0] * actual.shape[1],
+                          elapsed_ms=(time.perf_counter() - started) * 1000)
+
+    # The colour distance is only computed for pixels that changed at all
+    different = np.any(actual != baseline, axis=-1)
+    changed = np.nonzero(different)
+    different[changed] = yiq_delta(actual[changed], baseline[changed]) > MAX_YIQ_DELTA * threshold * threshold
+    for x, y, width, height in masks:
+        different[max(int(y), 0):int(y + height), max(int(x), 0):int(x + width)] = False
+    if anti_aliasing and different.any():
+        # Only the box around the changes needs the (9x more expensive) neighbourhood check
+        rows, columns = np.nonzero(different)
+        top, bottom = max(rows.min() - 1, 0), rows.max() + 2
+        left, right = max(columns.min() - 1, 0), columns.max() + 2
+        box_actual, box_baseline = actual[top:bottom, left:right], baseline[top:bottom, left:right]
+        low, high = _neighbourhood_range(box_baseline)
+        shifted_actual = _within(box_actual, low, high, aa_tolerance)
+        low, high = _neighbourhood_range(box_actual)
+        shifted_baseline = _within(box_baseline, low, high, aa_tolerance)
+        different[top:bottom, left:right] &= ~(shifted_actual & shifted_baseline)
+
+    diff_pixels = int(different.sum())
+    return DiffResult(
+        diff_pixels == 0,
+        diff_pixels=diff_pixels,
+        total_pixels=different.size,
+        elapsed_ms=(time.perf_counter() - started) * 1000,
+        mask=different if diff_pixels else None,
+        baseline=baseline if diff_pixels else None,
+    )
+
+
+class VisualCheck:
+    """Screenshots compared with (or recorded as) the stored baselines"""
+
+    def __init__(self, browser_name, store=None, pending=None, output_dir=OUTPUT_DIR,
+                 update=False, threshold=0.1, device=None, nodeid=None):
+        self.browser_name = browser_name
+        self.store = store or BaselineStore()
+        self.pending = pending or PendingList()
+        self.output_dir = Path(output_dir)
+        self.update = update
+        self.threshold = threshold
+        self.device = device
+        self.nodeid = nodeid
+        self.results = {}
+        self.recorded = []
+
+    def screenshot(self, target, page_object=None, **options):
+        """PNG of a page or locator with the page object's VISUAL_MASKS covered"""
+        page = getattr(target, "page", target)
+        selectors = getattr(page_object, "VISUAL_MASKS", ())
+        options.setdefault("animations", "disabled")
+        options.setdefault("caret", "hide")
+        return target.screenshot(mask=[page.locator(selector) for selector in selectors], **options)
+
+    def check(self, name, target, page_object=None, max_diff_pixels=0, max_diff_ratio=None,
+              regions=(), device=None, **options):
+        """Fail when the screenshot differs from the baseline by more than allowed
+
+        regions are extra (x, y, width, height) rectangles left out of the comparison.
+        In update mode only missing or differing baselines are re-recorded.
+        """
+        page = getattr(target, "page", target)
+        device = device or self.device
+        viewport = viewport_label(page)
+        key = baseline_key(name, self.browser_name, viewport, device)
+        actual = self.screenshot(target, page_object, **options)
+        baseline = self.store.load(key)
+        if baseline is None:
+            self._record(key, actual, name, viewport, device)
+            if not self.update:
+                self.pending.mark(key, self.nodeid, "missing")
+                pytest.skip(f"Recorded new visual baseline {key}")
+            return DiffResult(True)
+
+        result = compare(actual, baseline, threshold=self.threshold, masks=regions)
+        self.results[key] = result
+        if result.passed(max_diff_pixels, max_diff_ratio):
+            self.pending.clear(key)
+            return result
+        if self.update:
+            self._record(key, actual, name, viewport, device)
+            return result
+        self.pending.mark(key, self.nodeid, "failed")
+        file_name = key.replace("/", "-").replace(" ", "_")
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        (self.output_dir / f"{file_name}-actual.png").write_bytes(actual)
+        if result.size_mismatch:
+            raise AssertionError(f"{key}: screenshot size differs from the baseline")
+        (self.output_dir / f"{file_name}-diff.png").write_bytes(result.diff_image())
+        raise AssertionError(
+            f"{key}: {result.diff_pixels} pixels ({result.diff_ratio:.2%}) differ from the baseline, "
+            f"see {self.output_dir / (file_name + '-diff.png')}"
+        )
+
+    def _record(self, key, png, name, viewport, device):
+        self.store.save(key, png, name=name, browser=self.browser_name, viewport=viewport,
+                        device=device or DEFAULT_DEVICE)
+        self.pending.clear(key)
+        self.recorded.append(key)
+
+    def stats(self):
+        """Counters for session_stats"""
+        return {
+            "checks": len(self.results),
+            "hash matches": sum(1 for result in self.results.values() if result.identical and not result.total_pixels),
+            "with differences": sum(1 for result in self.results.values() if not result.identical),
+            "recorded": len(self.recorded),
+            "compare ms": sum(result.elapsed_ms for result in self.results.values()),
+        }
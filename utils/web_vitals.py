@@ -0,0 +1,115 @@
+'''
+Navigation, resource timing and Web Vitals collector
+
+What it does:
+
+An init script starts PerformanceObservers (paint, largest-contentful-paint,
+layout-shift, longtask) as soon as each document loads
+collect() waits for the load event and reads everything in ONE evaluate call:
+PerformanceNavigationTiming, resource timings, FCP, LCP, CLS and long tasks
+Page objects declare their budget (PERFORMANCE_BUDGET = {"lcp": 2500, ...});
+over_budget() / assert_within_budget() compare a sample against it
+Samples carry the throttling profile of the page (utils/throttling.py), if any
+
+Metrics (ms unless noted):
+ttfb, dom_content_loaded, load, fcp, lcp, cls (score), long_tasks (count),
+total_blocking_time, resource_count, transfer_kb (KB)
+LCP is Chromium only; missing metrics are None and are not checked.
+'''
+
+import json
+
+OBSERVER_SCRIPT = """
+(() => {
+    if (window.__webVitals) return;
+    const vitals = window.__webVitals = {lcp: null, cls: 0, longTasks: []};
+    const observe = (type, callback) => {
+        try {
+            new PerformanceObserver(list => list.getEntries().forEach(callback))
+                .observe({type, buffered: true});
+        } catch (error) {
+            // Entry type not supported by this browser
+        }
+    };
+    observe("largest-contentful-paint", entry => { vitals.lcp = entry.startTime; });
+    observe("layout-shift", entry => { if (!entry.hadRecentInput) vitals.cls += entry.value; });
+    observe("longtask", entry => { vitals.longTasks.push(entry.duration); });
+})();
+"""
+
+COLLECT_SCRIPT = """
+async () => {
+    // Two frames, so paint and LCP entries of the last render are delivered
+    await new Promise(resolve => requestAnimationFrame(() => requestAnimationFrame(resolve)));
+    const vitals = window.__webVitals || {lcp: null, cls: null, longTasks: []};
+    const navigation = performance.getEntriesByType("navigation")[0];
+    const paint = name => {
+        const entry = performance.getEntriesByName(name, "paint")[0];
+        return entry ? entry.startTime : null;
+    };
+    const resources = performance.getEntriesByType("resource");
+    return {
+        url: location.href,
+        ttfb: navigation ? navigation.responseStart - navigation.requestStart : null,
+        dom_content_loaded: navigation ? navigation.domContentLoadedEventEnd - navigation.startTime : null,
+        load: navigation ? navigation.loadEventEnd - navigation.startTime : null,
+        fcp: paint("first-contentful-paint"),
+        lcp: vitals.lcp,
+        cls: vitals.cls,
+        long_tasks: vitals.longTasks.length,
+        total_blocking_time: vitals.longTasks.reduce((sum, duration) => sum + Math.max(0, duration - 50), 0),
+        resource_count: resources.length,
+        transfer_kb: resources.reduce((sum, entry) => sum + (entry.transferSize || 0),
+                                      navigation ? navigation.transferSize || 0 : 0) / 1024,
+        slowest_resources: resources
+            .map(entry => ({name: entry.name, duration: entry.duration}))
+            .sort((a, b) => b.duration - a.duration)
+            .slice(0, 5),
+    };
+}
+"""
+
+
+def over_budget(metrics, budget, factor=1):
+    """List of (metric, value, limit) where the sample exceeds the budget (timings scaled by factor)"""
+    limits = {name: limit if name == "cls" else limit * factor for name, limit in budget.items()}
+    return [
+        (name, metrics[name], limit)
+        for name, limit in limits.items()
+        if metrics.get(name) is not None and metrics[name] > limit
+    ]
+
+
+def assert_within_budget(page_object, metrics, factor=1):
+    """Fail with every exceeded metric of the page object's PERFORMANCE_BUDGET
+
+    factor loosens the timing limits for throttled runs (utils.throttling.budget_factor).
+    """
+    violations = over_budget(metrics, page_object.PERFORMANCE_BUDGET, factor)
+    assert not violations, f"{type(page_object).__name__} over budget: " + ", ".join(
+        f"{name} {value:.1f} > {limit}" for name, value, limit in violations
+    )
+
+
+class WebVitals:
+    """Collects one metrics sample per navigation of a page"""
+
+    def __init__(self, page, profile=None):
+        self.page = page
+        self.profile = profile
+        self.samples = []
+        page.add_init_script(OBSERVER_SCRIPT)
+
+    def collect(self, label=None):
+        """Wait for the load event, read all metrics in one round trip and keep the sample"""
+        self.page.wait_for_load_state("load")
+        metrics = self.page.evaluate(COLLECT_SCRIPT)
+        metrics = {
+            name: round(value, 3) if isinstance(value, float) else value
+            for name, value in metrics.items()
+        }
+        self.samples.append({"label": label or metrics["url"], "profile": self.profile, "metrics": metrics})
+        return metrics
+
+    def as_json(self):
+        return json.dumps(self.samples)
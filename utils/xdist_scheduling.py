@@ -0,0 +1,223 @@
+'''
+Fixture-shape scheduling for pytest-xdist
+
+What it does:
+
+Groups tests by the expensive setup they need (which user is logged in, device or
+visual contexts, plain page, no browser at all) so each worker reuses its cached
+logins and pooled contexts instead of every worker building every shape
+Splits big groups into chunks sized from historical durations and hands the
+chunks out longest first, so the slowest worker ends close to the average
+
+Run it:
+pytest tests/ -n 4 --dist-by-shape
+
+Like --dist loadgroup, workers append the shape to the node id ("...::test_x@login:standard_user").
+Durations are the rolling medians from the duration history (utils/duration_history.py);
+the pytest cache this plugin updates after every run is the fallback.
+'''
+
+import math
+from collections import OrderedDict
+from pathlib import Path
+
+import pytest
+
+from utils.duration_history import DurationStore
+from utils.nodeids import base_nodeid
+
+try:
+    from xdist.scheduler import LoadScopeScheduling
+except ImportError:
+    LoadScopeScheduling = object
+
+DURATIONS_CACHE_KEY = "fixture_shape/durations"
+DEFAULT_DURATION = 1.0
+
+# Markers that imply their own kind of browser context
+SHAPE_MARKERS = ("mobile", "visual")
+
+LOGIN_FIXTURES = ("logged_in_user", "authenticated_context", "authenticated_page")
+
+
+def fixture_shape(item):
+    """Describe the expensive setup a test needs, e.g. 'login:standard_user' or 'mobile'"""
+    names = set(getattr(item, "fixturenames", ()))
+    parts = []
+    if names.intersection(LOGIN_FIXTURES):
+        marker = item.get_closest_marker("login_as")
+        parts.append("login:" + (marker.args[0] if marker else "standard_user"))
+    for name in SHAPE_MARKERS:
+        if item.get_closest_marker(name):
+            parts.append(name)
+    callspec = getattr(item, "callspec", None)
+    if callspec is not None and "device" in callspec.params:
+        parts.append(f"device:{callspec.params['device']}")
+    if not parts:
+        if "page" in names or "context" in names:
+            parts.append("page")
+        elif "context_pool" in names or "browser" in names:
+            parts.append("contexts")
+        else:
+            parts.append("no-browser")
+    return "+".join(parts)
+
+
+def load_durations(config):
+    """Per-test durations from the duration history, or from the pytest cache"""
+    history_db = config.getoption("history_db", None)
+    if history_db and Path(history_db).exists():
+        store = DurationStore(history_db)
+        try:
+            durations = store.median_durations(config.getoption("history_window", 10))
+        finally:
+            store.close()
+        if durations:
+            return durations
+    return _cached_durations(config)
+
+
+def _cached_durations(config):
+    # config.cache does not exist with -p no:cacheprovider
+    cache = getattr(config, "cache", None)
+    return cache.get(DURATIONS_CACHE_KEY, {}) if cache else {}
+
+
+def plan_work_units(nodeids, durations, node_count):
+    """Split shape groups into units of roughly equal duration, longest first
+
+    Returns an OrderedDict of unit name -> list of node ids.
+    """
+    known = [durations[base_nodeid(nodeid)] for nodeid in nodeids if base_nodeid(nodeid) in durations]
+    fallback = sorted(known)[len(known) // 2] if known else DEFAULT_DURATION
+
+    def duration(nodeid):
+        return durations.get(base_nodeid(nodeid), fallback)
+
+    groups = OrderedDict()
+    for nodeid in nodeids:
+        shape = nodeid.rsplit("@", 1)[1] if base_nodeid(nodeid) != nodeid else "no-shape"
+        groups.setdefault(shape, []).append(nodeid)
+
+    total = sum(duration(nodeid) for nodeid in nodeids)
+    target = max(total / max(node_count, 1), max(duration(nodeid) for nodeid in nodeids))
+
+    order = {nodeid: position for position, nodeid in enumerate(nodeids)}
+    units = []
+    for shape, members in groups.items():
+        group_total = sum(duration(nodeid) for nodeid in members)
+        chunk_count = max(1, math.ceil(group_total / target - 1e-9))
+        chunks = [[0.0, []] for _ in range(chunk_count)]
+        # Longest test into the lightest chunk
+        for nodeid in sorted(members, key=duration, reverse=True):
+            lightest = min(chunks, key=lambda chunk: chunk[0])
+            lightest[0] += duration(nodeid)
+            lightest[1].append(nodeid)
+        for index, (chunk_total, chunk_members) in enumerate(chunks):
+            if chunk_members:
+                # Keep collection order inside a unit so class/module fixtures stay warm
+                chunk_members.sort(key=order.get)
+                units.append((f"{shape}#{index}", chunk_total, chunk_members))
+
+    units.sort(key=lambda unit: unit[1], reverse=True)
+    return OrderedDict((name, members) for name, _, members in units)
+
+
+class FixtureShapeScheduling(LoadScopeScheduling):
+    """LoadScope scheduling where a work unit is a duration-balanced chunk of one fixture shape"""
+
+    def __init__(self, config, log=None):
+        super().__init__(config, log)
+        self.durations = load_durations(config)
+        self._unit_of = {}
+
+    def _split_scope(self, nodeid):
+        return self._unit_of.get(nodeid, nodeid)
+
+    def schedule(self):
+        assert self.collection_is_completed
+
+        # Initial distribution already happened, reschedule on all nodes
+        if self.collection is not None:
+            for node in self.nodes:
+                self._reschedule(node)
+            return
+
+        if not self._check_nodes_have_same_collection():
+            self.log("**Different tests collected, aborting run**")
+            return
+
+        self.collection = list(next(iter(self.registered_collections.values())))
+        if not self.collection:
+            return
+
+        for unit, nodeids in plan_work_units(self.collection, self.durations, len(self.nodes)).items():
+            self.workqueue[unit] = {nodeid: False for nodeid in nodeids}
+            for nodeid in nodeids:
+                self._unit_of[nodeid] = unit
+
+        # Avoid having more workers than work
+        for _ in range(len(self.nodes) - len(self.workqueue)):
+            unused_node, _ = self.assigned_work.popitem()
+            unused_node.shutdown()
+
+        for node in self.nodes:
+            self._assign_work_unit(node)
+        for node in self.nodes:
+            self._reschedule(node)
+
+        if not self.workqueue:
+            for node in self.nodes:
+                node.shutdown()
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--dist-by-shape", action="store_true",
+        help="With -n: group tests on workers by the fixtures and contexts they need"
+    )
+
+
+@pytest.hookimpl(optionalhook=True, tryfirst=True)
+def pytest_xdist_make_scheduler(config, log):
+    if config.getoption("dist_by_shape"):
+        return FixtureShapeScheduling(config, log)
+    return None
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(config, items):
+    """On xdist workers, tag every node id with its fixture shape"""
+    if not (config.getoption("dist_by_shape") and hasattr(config, "workerinput")):
+        return
+    for item in items:
+        item._nodeid = f"{item.nodeid}@{fixture_shape(item)}"
+
+
+class _DurationRecorder:
+    """Keeps a smoothed per-test duration in the pytest cache for the next plan"""
+
+    def __init__(self, config):
+        self.config = config
+        self.current = {}
+
+    @pytest.hookimpl
+    def pytest_runtest_logreport(self, report):
+        nodeid = base_nodeid(report.nodeid)
+        self.current[nodeid] = self.current.get(nodeid, 0.0) + report.duration
+
+    @pytest.hookimpl
+    def pytest_sessionfinish(self, session):
+        if not self.current or getattr(self.config, "cache", None) is None:
+            return
+        durations = _cached_durations(self.config)
+        for nodeid, seconds in self.current.items():
+            previous = durations.get(nodeid)
+            durations[nodeid] = seconds if previous is None else round(0.7 * previous + 0.3 * seconds, 4)
+        self.config.cache.set(DURATIONS_CACHE_KEY, durations)
+
+
+def pytest_configure(config):
+    # Only the process that sees every report (controller, or a plain run) records durations
+    if not hasattr(config, "workerinput"):
+        config.pluginmanager.register(_DurationRecorder(config), "fixture-shape-durations")